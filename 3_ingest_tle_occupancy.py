@@ -0,0 +1,14 @@
+# === Tract Occupancy Ingestion v10 ===
+# Purpose: Propagate a local TLE/OMM catalog over a time grid and store how many
+# objects occupy each tract at every epoch (dev.tract_occupancy).
+#
+# The ingestion itself lives in orbital_tracts; this script is kept for existing
+# workflows and is equivalent to
+#   python -m orbital_tracts ingest CATALOG... [--zone LEO] [--hours 24] [--step 10] [--db-url URL]
+
+import sys
+
+from orbital_tracts.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["ingest", *sys.argv[1:]]))
@@ -0,0 +1,15 @@
+# === Tract Density Refresh v10 ===
+# Purpose: Incrementally update the per-tract density aggregates (dev.tract_density,
+# dev.tract_satellite_buckets) from new rows in dev.tle_snapshots. Run after each
+# snapshot load or on a schedule; dashboards read the aggregates directly.
+#
+# The refresh itself lives in orbital_tracts; this script is kept for existing
+# workflows and is equivalent to
+#   python -m orbital_tracts density [--zone LEO] [--bucket hour] [--full] [--db-url URL]
+
+import sys
+
+from orbital_tracts.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["density", *sys.argv[1:]]))
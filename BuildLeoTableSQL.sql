@@ -1,20 +1,40 @@
 -- Table: dev.tract_geometries_leo
+-- Partitioned by altitude shell: one LIST partition per alt_min (see orbital_tracts/partitions.py)
 
 -- DROP TABLE IF EXISTS dev.tract_geometries_leo;
 
 CREATE TABLE IF NOT EXISTS dev.tract_geometries_leo
 (
     tract_id text COLLATE pg_catalog."default" NOT NULL,
-    geom geometry(PolygonZ,4326) NOT NULL,
+    tract_key bigint,
+    alt_min double precision NOT NULL,
+    alt_max double precision NOT NULL,
+    geom geometry(MultiPolygonZ,4326) NOT NULL,
+    content_hash text COLLATE pg_catalog."default",
     created_at timestamp with time zone DEFAULT now(),
-    CONSTRAINT tract_geometries_leo_pkey PRIMARY KEY (tract_id)
-)
+    CONSTRAINT tract_geometries_leo_pkey PRIMARY KEY (tract_id, alt_min)
+) PARTITION BY LIST (alt_min)
 
 TABLESPACE pg_default;
 
 ALTER TABLE IF EXISTS dev.tract_geometries_leo
     OWNER to postgres;
--- Index: idx_geom_tracts_leo
+
+-- Partitions: dev.tract_geometries_leo_a200 … _a2000, one per 50 km LEO shell
+
+DO $$
+BEGIN
+    FOR shell IN 200..2000 BY 50 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS dev.tract_geometries_leo_a%s '
+            'PARTITION OF dev.tract_geometries_leo FOR VALUES IN (%s)',
+            shell, shell
+        );
+    END LOOP;
+END
+$$;
+
+-- Index: idx_geom_tracts_leo (2D, used by ST_Contains / &&)
 
 -- DROP INDEX IF EXISTS dev.idx_geom_tracts_leo;
 
@@ -23,6 +43,20 @@ CREATE INDEX IF NOT EXISTS idx_geom_tracts_leo
     (geom)
     TABLESPACE pg_default;
 
+-- Index: idx_geom_tracts_leo_nd (n-D, used by &&& box tests over lon, lat and height)
+
+CREATE INDEX IF NOT EXISTS idx_geom_tracts_leo_nd
+    ON dev.tract_geometries_leo USING gist
+    (geom gist_geometry_ops_nd)
+    TABLESPACE pg_default;
+
+-- Index: idx_geom_tracts_leo_key (packed integer tract key, see orbital_tracts/keys.py)
+
+CREATE INDEX IF NOT EXISTS idx_geom_tracts_leo_key
+    ON dev.tract_geometries_leo USING btree
+    (tract_key)
+    TABLESPACE pg_default;
+
 -- Table: dev.tracts
 
 -- DROP TABLE IF EXISTS dev.tracts;
@@ -41,6 +75,9 @@ CREATE TABLE IF NOT EXISTS dev.tracts
     orbit_zone text COLLATE pg_catalog."default" DEFAULT 'LEO'::text,
     created_at timestamp with time zone DEFAULT now(),
     version text COLLATE pg_catalog."default",
+    content_hash text COLLATE pg_catalog."default",
+    tract_key bigint,
+    parent_key bigint,
     CONSTRAINT tracts_pkey PRIMARY KEY (tract_id)
 )
 
@@ -48,3 +85,65 @@ TABLESPACE pg_default;
 
 ALTER TABLE IF EXISTS dev.tracts
     OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS idx_tracts_tract_key
+    ON dev.tracts USING btree
+    (tract_key)
+    TABLESPACE pg_default;
+
+-- Index: idx_tracts_parent_key (containing tract one resolution level up, see orbital_tracts/levels.py)
+
+CREATE INDEX IF NOT EXISTS idx_tracts_parent_key
+    ON dev.tracts USING btree
+    (parent_key)
+    TABLESPACE pg_default;
+
+-- Table: dev.tract_occupancy
+-- Objects per tract per epoch, written by 3_ingest_tle_occupancy.py
+
+-- DROP TABLE IF EXISTS dev.tract_occupancy;
+
+CREATE TABLE IF NOT EXISTS dev.tract_occupancy
+(
+    tract_id text COLLATE pg_catalog."default" NOT NULL,
+    tract_key bigint,
+    orbit_zone text COLLATE pg_catalog."default" NOT NULL,
+    epoch timestamp with time zone NOT NULL,
+    object_count integer NOT NULL,
+    created_at timestamp with time zone DEFAULT now(),
+    CONSTRAINT tract_occupancy_pkey PRIMARY KEY (tract_id, epoch)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS dev.tract_occupancy
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS idx_tract_occupancy_key
+    ON dev.tract_occupancy USING btree
+    (tract_key, epoch)
+    TABLESPACE pg_default;
+
+-- Table: dev.tract_adjacency
+-- Neighbouring tracts (one row per directed edge), written on metadata generation
+
+-- DROP TABLE IF EXISTS dev.tract_adjacency;
+
+CREATE TABLE IF NOT EXISTS dev.tract_adjacency
+(
+    tract_key bigint NOT NULL,
+    neighbor_key bigint NOT NULL,
+    orbit_zone text COLLATE pg_catalog."default" NOT NULL,
+    dims smallint NOT NULL,
+    CONSTRAINT tract_adjacency_pkey PRIMARY KEY (tract_key, neighbor_key)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS dev.tract_adjacency
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS idx_tract_adjacency_zone
+    ON dev.tract_adjacency USING btree
+    (orbit_zone COLLATE pg_catalog."default")
+    TABLESPACE pg_default;
@@ -2,27 +2,41 @@ SELECT
   tract_id,
   ST_ZMax(geom),
   ST_ZMin(geom),
-  ST_AsText(ST_PointN(ST_ExteriorRing(geom), 1)) AS first_vertex
+  ST_AsText(ST_PointN(ST_ExteriorRing(ST_GeometryN(geom, 1)), 1)) AS first_vertex
 FROM dev.tract_geometries_leo
-WHERE tract_id LIKE 'LEO-A1900%';
+WHERE alt_min = 1900;
 
 SELECT * FROM dev.tracts
 WHERE orbit_zone ilike 'LEO%'
 LIMIT 100;
 
 --Search for Satellites within Tracts in LEO
-SELECT s.satellite_id, s.name, COUNT(DISTINCT t.tract_id) AS num_tracts
+SELECT s.satellite_id, s.name, COUNT(DISTINCT g.tract_key) AS num_tracts
 FROM dev.tle_snapshots s
 JOIN dev.tract_geometries_leo g
   ON ST_Contains(g.geom, s.position)
-JOIN dev.tracts t
-  ON t.tract_id = g.tract_id
 WHERE s.altitude BETWEEN 0 AND 2000
-  AND s.altitude >= t.alt_min
-  AND s.altitude <  t.alt_max
+  AND s.altitude >= g.alt_min
+  AND s.altitude <  g.alt_max
 GROUP BY s.satellite_id, s.name
 ORDER BY num_tracts DESC;
 
+-- Satellites within one LEO shell: the constant alt_min prunes the scan to the
+-- dev.tract_geometries_leo_a500 partition
+SELECT s.satellite_id, s.name, COUNT(DISTINCT g.tract_key) AS num_tracts
+FROM dev.tle_snapshots s
+JOIN dev.tract_geometries_leo g
+  ON g.alt_min = 500 AND ST_Contains(g.geom, s.position)
+WHERE s.altitude >= 500 AND s.altitude < 550
+GROUP BY s.satellite_id, s.name
+ORDER BY num_tracts DESC;
+
+-- Panels whose 3D box (lon, lat, height in km) overlaps a region, via the n-D index
+SELECT g.tract_id
+FROM dev.tract_geometries_leo g
+WHERE g.alt_min = 500
+  AND g.geom &&& ST_3DMakeBox(ST_MakePoint(-10, 40, 500), ST_MakePoint(10, 60, 550));
+
 -- Tract Density Check - LEO
 SELECT
   COUNT(*) AS orbit_points,
@@ -30,8 +44,58 @@ SELECT
   t.tract_id
 FROM dev.tle_snapshots s
 JOIN dev.tract_geometries_leo g ON ST_Contains(g.geom, s.position)
-JOIN dev.tracts t ON g.tract_id = t.tract_id
+JOIN dev.tracts t ON g.tract_key = t.tract_key
 WHERE s.altitude BETWEEN 0 AND 2000
-  AND s.altitude >= t.alt_min AND s.altitude < t.alt_max
-GROUP BY t.tract_id
-ORDER BY orbit_points DESC;
\ No newline at end of file
+  AND s.altitude >= g.alt_min AND s.altitude < g.alt_max
+GROUP BY t.tract_key, t.tract_id
+ORDER BY orbit_points DESC;
+-- Tract Density - LEO (from aggregates; refresh with 4_refresh_tract_density.py)
+-- Sums come from the per-satellite rows: joining dev.tract_density to them would
+-- repeat each density row once per satellite in its bucket.
+SELECT
+  SUM(b.orbit_points) AS orbit_points,
+  COUNT(DISTINCT b.satellite_id) AS distinct_sats,
+  b.tract_id
+FROM dev.tract_satellite_buckets b
+WHERE b.orbit_zone = 'LEO'
+GROUP BY b.tract_key, b.tract_id
+ORDER BY orbit_points DESC;
+
+-- Tract Density - LEO, latest bucket only
+SELECT tract_id, orbit_points, distinct_sats
+FROM dev.tract_density
+WHERE orbit_zone = 'LEO'
+  AND epoch_bucket = (SELECT max(epoch_bucket) FROM dev.tract_density WHERE orbit_zone = 'LEO')
+ORDER BY orbit_points DESC;
+
+-- Satellites within Tracts - LEO (from aggregates)
+SELECT satellite_id, max(name) AS name, COUNT(DISTINCT tract_key) AS num_tracts
+FROM dev.tract_satellite_buckets
+WHERE orbit_zone = 'LEO'
+GROUP BY satellite_id
+ORDER BY num_tracts DESC;
+
+-- Neighbouring tracts of one LEO tract (from dev.tract_adjacency, no ST_Touches)
+SELECT n.tract_id, a.dims
+FROM dev.tracts t
+JOIN dev.tract_adjacency a ON a.tract_key = t.tract_key
+JOIN dev.tracts n ON n.tract_key = a.neighbor_key
+WHERE t.tract_id = 'LEO-A550-I50-RAAN0_5'
+ORDER BY n.tract_id;
+
+-- Drill down: busiest coarse LEO tracts in the latest epoch, then their 1° RAAN
+-- children (needs levels = [{ raan = 5 }] on LEO in zones.toml)
+SELECT tract_id, object_count
+FROM dev.tract_occupancy
+WHERE orbit_zone = 'LEO'
+  AND epoch = (SELECT max(epoch) FROM dev.tract_occupancy WHERE orbit_zone = 'LEO')
+ORDER BY object_count DESC
+LIMIT 20;
+
+SELECT c.tract_id, o.object_count
+FROM dev.tracts p
+JOIN dev.tracts c ON c.parent_key = p.tract_key
+JOIN dev.tract_occupancy o ON o.tract_key = c.tract_key
+WHERE p.tract_id = 'LEO-A550-I50-RAAN0_5'
+  AND o.epoch = (SELECT max(epoch) FROM dev.tract_occupancy WHERE orbit_zone = 'LEO_L1')
+ORDER BY o.object_count DESC;
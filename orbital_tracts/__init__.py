@@ -0,0 +1,2 @@
+# === Orbital Tract Framework: shared library ===
+# Helpers imported by the numbered generator and export scripts.
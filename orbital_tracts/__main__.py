@@ -0,0 +1,6 @@
+import sys
+
+from orbital_tracts.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# === 🕸️ Tract Adjacency Graph ===
+# Which tracts border which follows from the grid alone: neighbouring altitude and
+# inclination bins whose edges meet, and RAAN bins whose arc segments are
+# consecutive (theta_end_idx of one is theta_start_idx of the next), wrapping at
+# 360°. TractGraph holds that structure in CSR form over TractIndex's flat tract
+# numbers: tract i's neighbours are indices[indptr[i]:indptr[i + 1]]. No geometric
+# predicate is evaluated, so there is no ST_Touches scan behind a neighbourhood query.
+#
+# The graph is written to dev.tract_adjacency as one (tract_key, neighbor_key) row
+# per directed edge whenever a zone's metadata is generated, and can be saved as a
+# compact .npz file for in-memory use. Adjacency is per zone; tracts in different
+# zones are never linked.
+
+import json
+
+import numpy as np
+
+from orbital_tracts.index import TractIndex
+from orbital_tracts.loader import DEFAULT_BATCH_SIZE, copy_rows
+
+# Which bins may differ between neighbours: "face" links tracts that differ by one
+# bin in exactly one dimension, "full" also links diagonal neighbours.
+CONNECTIVITY = ("face", "full")
+
+# Edge dimension bits: the dimensions in which the two tracts' bins differ.
+ALT, INC, RAAN = 1, 2, 4
+
+ADJACENCY_COLUMNS = ("tract_key", "neighbor_key", "orbit_zone", "dims")
+
+ADJACENCY_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS dev.tract_adjacency
+    (
+        tract_key bigint NOT NULL,
+        neighbor_key bigint NOT NULL,
+        orbit_zone text NOT NULL,
+        dims smallint NOT NULL,
+        CONSTRAINT tract_adjacency_pkey PRIMARY KEY (tract_key, neighbor_key)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tract_adjacency_zone
+        ON dev.tract_adjacency (orbit_zone)
+    """,
+)
+
+
+def _steps(lo, hi):
+    # next_ok[i]: bin i + 1 starts where bin i ends.
+    return np.append(hi[:-1] == lo[1:], False)
+
+
+class TractGraph:
+    """
+    CSR adjacency of one zone's tracts. ``indptr`` (n + 1) and ``indices`` use
+    TractIndex flat numbering; ``dims`` holds each edge's ``ALT | INC | RAAN``
+    bits. Edges come in both directions, so the graph is symmetric.
+    """
+
+    def __init__(self, zone, indptr, indices, dims, keys, connectivity="face"):
+        self.zone = zone
+        self.indptr = indptr
+        self.indices = indices
+        self.dims = dims
+        self.keys = keys
+        self.connectivity = connectivity
+        self._slot_table = None
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def edges(self):
+        return len(self.indices)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbors(self, i):
+        """Flat tract numbers of tract ``i``'s neighbours."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def _gather(self, nodes):
+        # Concatenated neighbour lists of ``nodes``, without a Python loop.
+        starts, stops = self.indptr[nodes], self.indptr[nodes + 1]
+        counts = stops - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return self.indices[offsets + np.arange(counts.sum())]
+
+    def k_hop(self, sources, k=1):
+        """
+        Tracts within ``k`` hops of ``sources`` (flat numbers) → ``(nodes,
+        hops)``, sorted by hop count; the sources themselves have hop 0.
+        """
+        hops = np.full(len(self), -1, dtype=np.int32)
+        frontier = np.unique(np.atleast_1d(np.asarray(sources, dtype=np.int64)))
+        hops[frontier] = 0
+        for hop in range(1, k + 1):
+            if not len(frontier):
+                break
+            reached = np.unique(self._gather(frontier))
+            frontier = reached[hops[reached] < 0]
+            hops[frontier] = hop
+        nodes = np.flatnonzero(hops >= 0)
+        order = np.argsort(hops[nodes], kind="stable")
+        return nodes[order], hops[nodes][order]
+
+    def propagate(self, values, steps=1, spread=0.5, decay=1.0):
+        """
+        Diffuse per-tract ``values`` (tracts on the last axis, e.g. an
+        ``(n_epochs, n_tracts)`` occupancy array) over the graph.
+
+        Each step a tract keeps ``1 - spread`` of its value and shares ``spread``
+        equally among its neighbours (isolated tracts keep everything), then the
+        result is scaled by ``decay``. With ``decay=1`` the total is conserved.
+        """
+        values = np.asarray(values, dtype=float)
+        # Work tracts-first, so each neighbour lookup gathers one contiguous row.
+        x = np.moveaxis(values, -1, 0).reshape(len(self), -1)
+        degree = self.degree[:, None]
+        share = spread / np.maximum(degree, 1)
+        keep = np.where(degree > 0, 1 - spread, 1.0)
+        slots = self._slots()
+        # Row len(self) stays zero: padded slots point at it.
+        shared = np.zeros((len(self) + 1, x.shape[1]))
+        for _ in range(steps):
+            np.multiply(x, share, out=shared[:-1])
+            # Symmetric graph: what a tract receives is the sum over its own neighbour list.
+            received = shared[slots[:, 0]]
+            for k in range(1, slots.shape[1]):
+                received += shared[slots[:, k]]
+            x = decay * (keep * x + received)
+        return np.moveaxis(x.reshape(values.shape[-1:] + values.shape[:-1]), 0, -1)
+
+    def _slots(self):
+        # The CSR rows padded to the maximum degree (ELLPACK layout), padding
+        # pointing at row len(self). Summing slot by slot beats reduceat.
+        if self._slot_table is None:
+            degree = self.degree
+            slots = np.full((len(self), max(int(degree.max(initial=0)), 1)), len(self), dtype=np.int64)
+            rows = np.repeat(np.arange(len(self)), degree)
+            slots[rows, np.arange(self.edges) - self.indptr[rows]] = self.indices
+            self._slot_table = slots
+        return self._slot_table
+
+    def rows(self):
+        """Yield ``ADJACENCY_COLUMNS`` rows for every directed edge."""
+        sources = np.repeat(np.arange(len(self)), self.degree)
+        for src, dst, dims in zip(
+            self.keys[sources].tolist(), self.keys[self.indices].tolist(), self.dims.tolist()
+        ):
+            yield src, dst, self.zone.name, dims
+
+    def save(self, path):
+        """Write the graph to a compressed ``.npz`` file."""
+        meta = {
+            "zone": self.zone.name,
+            "zone_code": self.zone.zone_code,
+            "shape": [len(self.zone.alt_bins), len(self.zone.inc_bins), len(self.zone.raan_bins)],
+            "connectivity": self.connectivity,
+        }
+        np.savez_compressed(
+            path, indptr=self.indptr, indices=self.indices, dims=self.dims, keys=self.keys,
+            meta=np.array(json.dumps(meta)),
+        )
+
+    @classmethod
+    def load(cls, path, zones=None):
+        """Read a graph written by ``save``; ``zones`` maps names to ZoneSpecs (default: the config)."""
+        from orbital_tracts.zones import ZONES
+
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            spec = (zones or ZONES)[meta["zone"]]
+            if spec.tract_count != int(np.prod(meta["shape"])) or spec.zone_code != meta["zone_code"]:
+                raise ValueError(f"{path} was built for a different {meta['zone']} grid than the config")
+            return cls(spec, data["indptr"], data["indices"], data["dims"], data["keys"], meta["connectivity"])
+
+
+def build_adjacency(zone, connectivity="face"):
+    """Adjacency graph of one zone (a ZoneSpec, zone name or TractIndex)."""
+    if connectivity not in CONNECTIVITY:
+        raise ValueError(f"Unknown connectivity {connectivity!r}; expected one of {CONNECTIVITY}")
+    index = zone if isinstance(zone, TractIndex) else TractIndex(zone)
+    spec = index.zone
+    n_alt, n_inc, n_raan = index.shape
+
+    # Per-dimension "bin b + 1 borders bin b" flags; RAAN by segment index, with wrap-around.
+    alt_next = _steps(index.alt_lo, index.alt_hi)
+    inc_next = _steps(index.inc_lo, index.inc_hi)
+    seg_start = (index.raan_lo // spec.segment_span).astype(np.int64) % spec.n_segments
+    seg_end = (index.raan_hi // spec.segment_span).astype(np.int64) % spec.n_segments
+    raan_next = seg_end == np.roll(seg_start, -1)
+    if n_raan < 3:
+        # Two bins would border each other twice and one bin itself; keep plain steps only.
+        raan_next[-1] = False
+
+    a, i, r = (x.ravel() for x in np.meshgrid(np.arange(n_alt), np.arange(n_inc), np.arange(n_raan), indexing="ij"))
+    offsets = [
+        (da, di, dr)
+        for da in (-1, 0, 1) for di in (-1, 0, 1) for dr in (-1, 0, 1)
+        if (da, di, dr) != (0, 0, 0) and (connectivity == "full" or abs(da) + abs(di) + abs(dr) == 1)
+    ]
+
+    def step(idx, delta, next_ok, n, wrap=False):
+        # Neighbouring bin index and whether the step crosses a shared edge.
+        if delta == 0:
+            return idx, np.ones(len(idx), dtype=bool)
+        target = idx + delta
+        if wrap:
+            target %= n
+        else:
+            inside = (target >= 0) & (target < n)
+            target = np.clip(target, 0, n - 1)
+        ok = next_ok[idx] if delta > 0 else next_ok[target]
+        return target, ok if wrap else ok & inside
+
+    sources, targets, dims = [], [], []
+    for da, di, dr in offsets:
+        ta, ok_a = step(a, da, alt_next, n_alt)
+        ti, ok_i = step(i, di, inc_next, n_inc)
+        tr, ok_r = step(r, dr, raan_next, n_raan, wrap=True)
+        ok = ok_a & ok_i & ok_r
+        src = np.flatnonzero(ok)
+        sources.append(src)
+        targets.append(((ta * n_inc + ti) * n_raan + tr)[ok])
+        dims.append(np.full(len(src), (ALT if da else 0) | (INC if di else 0) | (RAAN if dr else 0), dtype=np.uint8))
+
+    sources, targets, dims = np.concatenate(sources), np.concatenate(targets), np.concatenate(dims)
+    order = np.lexsort((targets, sources))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(index)))]).astype(np.int64)
+    return TractGraph(spec, indptr, targets[order].astype(np.int32), dims[order], index.keys, connectivity)
+
+
+def write_adjacency(engine, graph, batch_size=DEFAULT_BATCH_SIZE):
+    """Replace the zone's ``dev.tract_adjacency`` rows with ``graph``'s edges. Returns the row count."""
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        for statement in ADJACENCY_DDL:
+            cur.execute(statement)
+        cur.execute("DELETE FROM dev.tract_adjacency WHERE orbit_zone = %s", (graph.zone.name,))
+        count = copy_rows(cur, "dev.tract_adjacency", ADJACENCY_COLUMNS, graph.rows(), batch_size)
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
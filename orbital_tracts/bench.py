@@ -0,0 +1,229 @@
+# === ⏱️ Generation Benchmark ===
+# Times each stage of tract generation over a synthetic grid:
+#
+#   metadata  binning + content hashes (generate.tract_rows)
+#   vertices  arc vertices + geodetic conversion (geometry.panel_vertices)
+#   polygons  rings → split MultiPolygons (geometry.rings_to_panels)
+#   validate  validity checks (geometry.validate_panel)
+#   wkt       3D WKT serialization
+#   insert    COPY / INSERT of tracts and panels
+#   index     spatial index build
+#
+# The database stages run against PostGIS (temporary tables, nothing persists) or,
+# without a database, SQLite, using SpatiaLite when the extension can be loaded.
+# Results are a JSON-ready dict with per-stage seconds, tracts/s and peak RSS, so
+# runs on refined grids (e.g. 1° RAAN) can be compared with a baseline.
+
+import platform
+import resource
+import sqlite3
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from orbital_tracts.zones import ZoneSpec
+
+STAGES = ("metadata", "vertices", "polygons", "validate", "wkt", "insert", "index")
+
+
+def synthetic_zone(alt_min=200, alt_max=2050, alt_step=50, inc_step=5, raan_step=5, n_segments=360, steps=16,
+                   name="BENCH"):
+    """A LEO-style regular grid; the defaults match the production LEO bins."""
+    def bins(start, stop, step):
+        return tuple((v, v + step) for v in range(start, stop, step))
+
+    return ZoneSpec(
+        name=name,
+        alt_bins=bins(alt_min, alt_max, alt_step),
+        inc_bins=bins(0, 180, inc_step),
+        raan_bins=bins(0, 360, raan_step),
+        n_segments=n_segments,
+        geometry_table="bench_geometries",
+        geometry_index="idx_bench_geometries",
+        steps=steps,
+    )
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage."""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+
+
+# === Database stand-ins ===
+
+def _insert_postgres(db_url, tract_rows, geometry_rows, timer, batch_size):
+    from sqlalchemy import create_engine
+
+    from orbital_tracts.loader import TRACT_COLUMNS, copy_rows
+
+    engine = create_engine(db_url)
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("CREATE TEMP TABLE bench_tracts (LIKE dev.tracts INCLUDING DEFAULTS) ON COMMIT DROP")
+        cur.execute(
+            "CREATE TEMP TABLE bench_geometries "
+            "(tract_id text PRIMARY KEY, geom geometry(MultiPolygonZ, 4326) NOT NULL, content_hash text) "
+            "ON COMMIT DROP"
+        )
+        with timer.stage("insert"):
+            copy_rows(cur, "bench_tracts", TRACT_COLUMNS, tract_rows, batch_size)
+            copy_rows(
+                cur, "bench_geometries", ("tract_id", "geom", "content_hash"),
+                ((tract_id, f"SRID=4326;{wkt}", content_hash) for tract_id, wkt, content_hash in geometry_rows),
+                batch_size,
+            )
+        with timer.stage("index"):
+            cur.execute("CREATE INDEX idx_bench_geometries ON bench_geometries USING gist (geom)")
+        # Everything above is temporary; leave the database as it was.
+        conn.rollback()
+    finally:
+        conn.close()
+        engine.dispose()
+    return "postgis"
+
+
+def _load_spatialite(conn):
+    try:
+        conn.enable_load_extension(True)
+        conn.load_extension("mod_spatialite")
+        return True
+    except (AttributeError, sqlite3.OperationalError):
+        # Python built without extension loading, or SpatiaLite not installed.
+        return False
+
+
+def _insert_sqlite(path, tract_rows, geometry_rows, timer, batch_size):
+    from orbital_tracts.loader import TRACT_COLUMNS
+
+    conn = sqlite3.connect(path)
+    try:
+        spatialite = _load_spatialite(conn)
+        cur = conn.cursor()
+        cur.execute("DROP TABLE IF EXISTS bench_tracts")
+        cur.execute("DROP TABLE IF EXISTS bench_geometries")
+        cur.execute(f"CREATE TABLE bench_tracts ({', '.join(TRACT_COLUMNS)}, PRIMARY KEY (tract_id))")
+        if spatialite:
+            cur.execute("SELECT InitSpatialMetadata(1)")
+            cur.execute("CREATE TABLE bench_geometries (tract_id TEXT PRIMARY KEY, content_hash TEXT)")
+            cur.execute("SELECT AddGeometryColumn('bench_geometries', 'geom', 4326, 'MULTIPOLYGON', 'XYZ')")
+            geometry_sql = "INSERT INTO bench_geometries (tract_id, geom, content_hash) VALUES (?, GeomFromText(?, 4326), ?)"
+        else:
+            cur.execute("CREATE TABLE bench_geometries (tract_id TEXT PRIMARY KEY, geom TEXT, content_hash TEXT)")
+            geometry_sql = "INSERT INTO bench_geometries (tract_id, geom, content_hash) VALUES (?, ?, ?)"
+
+        tract_sql = f"INSERT INTO bench_tracts VALUES ({', '.join('?' * len(TRACT_COLUMNS))})"
+        with timer.stage("insert"):
+            for start in range(0, len(tract_rows), batch_size):
+                cur.executemany(tract_sql, tract_rows[start:start + batch_size])
+            for start in range(0, len(geometry_rows), batch_size):
+                cur.executemany(geometry_sql, geometry_rows[start:start + batch_size])
+        if spatialite:
+            with timer.stage("index"):
+                cur.execute("SELECT CreateSpatialIndex('bench_geometries', 'geom')")
+        conn.commit()
+    finally:
+        conn.close()
+    return "spatialite" if spatialite else "sqlite"
+
+
+# === Runner ===
+
+def run_benchmark(spec, db_url=None, sqlite_path=":memory:", geodetic="pyproj", batch_size=10000,
+                  database=True):
+    """
+    Generate every tract of ``spec`` stage by stage and load the result.
+
+    Panels go to PostGIS when ``db_url`` is given, otherwise to SQLite at
+    ``sqlite_path``; ``database=False`` skips the load. Returns the report dict.
+    """
+    from shapely.wkt import dumps
+
+    from orbital_tracts.generate import tract_rows
+    from orbital_tracts.geometry import (
+        get_arc_cache, get_transformer, panel_vertices, rings_to_panels, shell_radius_km, validate_panel,
+    )
+    from orbital_tracts.parallel import group_by_shell
+
+    timer = StageTimer()
+    transformer = get_transformer(geodetic)
+    started = time.perf_counter()
+
+    with timer.stage("metadata"):
+        rows = tract_rows(spec, geodetic)
+    hashes = {row[0]: row[-1] for row in rows}
+
+    geometry_rows = []
+    skipped = 0
+    events = Counter()
+    for (alt_min, alt_max), chunk in group_by_shell(row[:7] for row in rows):
+        tract_ids, inc_min, inc_max, az_min, az_max = zip(*chunk)
+        with timer.stage("vertices"):
+            rings = panel_vertices(
+                shell_radius_km(alt_min, alt_max), inc_min, inc_max, az_min, az_max, spec.steps, transformer
+            )
+        with timer.stage("polygons"):
+            panels = rings_to_panels(rings, inc_min, inc_max, az_min, az_max, events)
+        with timer.stage("validate"):
+            panels = [validate_panel(tract_id, panel, events) for tract_id, panel in zip(tract_ids, panels)]
+        with timer.stage("wkt"):
+            for tract_id, panel in zip(tract_ids, panels):
+                if panel is None:
+                    skipped += 1
+                    continue
+                geometry_rows.append((tract_id, dumps(panel, output_dimension=3), hashes[tract_id]))
+
+    backend = None
+    if database:
+        if db_url:
+            backend = _insert_postgres(db_url, rows, geometry_rows, timer, batch_size)
+        else:
+            backend = _insert_sqlite(sqlite_path, rows, geometry_rows, timer, batch_size)
+
+    total = time.perf_counter() - started
+    cache = get_arc_cache()
+    return {
+        "grid": {
+            "zone": spec.name,
+            "alt_bins": len(spec.alt_bins),
+            "inc_bins": len(spec.inc_bins),
+            "raan_bins": len(spec.raan_bins),
+            "steps": spec.steps,
+        },
+        "tracts": len(rows),
+        "panels": len(geometry_rows),
+        "skipped": skipped,
+        "events": dict(events),
+        "geodetic": geodetic,
+        "backend": backend,
+        "total_seconds": round(total, 4),
+        "tracts_per_s": round(len(rows) / total, 1) if total else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "arc_cache": {"hits": cache.hits, "misses": cache.misses},
+        "stages": {
+            name: {
+                "seconds": round(timer.seconds[name], 4),
+                "tracts_per_s": round(len(rows) / timer.seconds[name], 1) if timer.seconds[name] else None,
+            }
+            for name in STAGES if name in timer.seconds
+        },
+        "python": platform.python_version(),
+    }
@@ -0,0 +1,369 @@
+# === 🗃️ Binary Tract Catalog ===
+# One versioned file holding every tract's metadata and panel geometry, so export,
+# lookup and analysis jobs can start without a database connection. Columns are
+# stored struct-of-arrays and read back through a memory map without copying:
+#
+#   alt_min … az_max           float64   per tract
+#   theta_start/end_idx        int32     per tract
+#   zone                       uint8     per tract, index into the header's zones
+#   tract_key                  int64     per tract, packed key (orbital_tracts.keys)
+#   content_hash               S<n>      per tract (dev.tracts content hash)
+#   id_offsets / id_bytes      int64 / uint8   UTF-8 tract IDs, CSR style
+#   geom_offsets               int64     tract → polygon parts
+#   part_offsets               int64     part  → rings
+#   ring_offsets               int64     ring  → vertices
+#   vertices                   float64 or float32 (n, 3): lon, lat, alt (km)
+#
+# The geometry offsets follow shapely's (and GeoArrow's) ragged layout, so a run of
+# tracts becomes shapely geometry with one ``from_ragged_array`` call. Tracts are
+# stored zone by zone in TractIndex's flat order, and the header carries each
+# zone's bins, so readers need neither the database nor zones.toml.
+#
+# Layout: MAGIC | uint32 format version | uint32 0 | uint64 header length |
+#         JSON header | columns, each 64-byte aligned.
+
+import json
+import os
+import struct
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon
+
+from orbital_tracts.export import DEFAULT_FETCH_SIZE, METADATA_COLUMNS, stream_rows
+from orbital_tracts.geometry import GEOMETRY_VERSION
+from orbital_tracts.index import TractIndex
+from orbital_tracts.keys import KEY_FORMAT, bin_indices, decode_keys, key_levels
+from orbital_tracts.zones import ZONES, ZoneSpec, export_style
+
+MAGIC = b"OTCATLG\x00"
+FORMAT_VERSION = 1
+DEFAULT_CATALOG = "tracts.catalog"
+
+_PREAMBLE = struct.Struct("<8sIIQ")
+_ALIGN = 64
+
+BIN_COLUMNS = ("alt_min", "alt_max", "inc_min", "inc_max", "az_min", "az_max")
+
+
+# === Panel sources ===
+
+def read_panels(conn, spec, batch_size=DEFAULT_FETCH_SIZE):
+    """
+    Stored panels and dev.tracts content hashes of one zone, in TractIndex flat
+    order → ``(geoms, hashes)``. Tracts without a panel get ``None``.
+    """
+    index = TractIndex(spec)
+    n_alt, n_inc, n_raan = index.shape
+    geoms = np.full(len(index), None, dtype=object)
+    hashes = [None] * len(index)
+    query = (
+        f"SELECT g.tract_key, ST_AsBinary(g.geom), t.content_hash, g.tract_id "
+        f"FROM {spec.geometry_table} g JOIN dev.tracts t ON t.tract_key = g.tract_key"
+    )
+    unknown = 0
+    rows = stream_rows(conn, query, batch_size=batch_size, cursor_name="tract_catalog")
+    for batch in _batched(rows, batch_size):
+        # Flat positions straight from the packed keys, no tract ID lookups.
+        keys = np.array([row[0] for row in batch], dtype=np.int64)
+        alt_bin, inc_bin, raan_bin = bin_indices(keys, spec)
+        known = (
+            (decode_keys(keys)[0] == spec.zone_code) & (key_levels(keys) == spec.level)
+            & (alt_bin >= 0) & (inc_bin >= 0) & (raan_bin >= 0)
+        )
+        positions = np.where(known, (alt_bin * n_inc + inc_bin) * n_raan + raan_bin, 0)
+        # Retired bins that share a minimum with a current one would land on the wrong tract.
+        known &= index.ids[positions] == np.array([row[3] for row in batch], dtype=object)
+        unknown += int(np.count_nonzero(~known))
+        positions = positions[known]
+        batch = [row for row, ok in zip(batch, known) if ok]
+        geoms[positions] = shapely.from_wkb([bytes(row[1]) for row in batch])
+        for i, row in zip(positions.tolist(), batch):
+            hashes[i] = row[2]
+    if unknown:
+        print(f"⚠️ {spec.name}: {unknown} stored panels match no tract in the zone config")
+    return geoms, hashes
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_panels(spec, geodetic="pyproj"):
+    """Regenerate every panel of one zone from its bins, in TractIndex flat order."""
+    from orbital_tracts.geometry import build_shell_panels, get_transformer, shell_radius_km
+
+    transformer = get_transformer(geodetic)
+    index = TractIndex(spec)
+    _, n_inc, n_raan = index.shape
+    inc_idx = np.repeat(np.arange(n_inc), n_raan)
+    raan_idx = np.tile(np.arange(n_raan), n_inc)
+    geoms = []
+    for alt_min, alt_max in spec.alt_bins:
+        geoms.extend(build_shell_panels(
+            shell_radius_km(alt_min, alt_max),
+            index.inc_lo[inc_idx], index.inc_hi[inc_idx], index.raan_lo[raan_idx], index.raan_hi[raan_idx],
+            steps=spec.steps, transformer=transformer,
+        ))
+    return np.array(geoms, dtype=object)
+
+
+# === Writer ===
+
+def _zone_header(spec):
+    return {
+        "name": spec.name,
+        "alt_bins": [list(b) for b in spec.alt_bins],
+        "inc_bins": [list(b) for b in spec.inc_bins],
+        "raan_bins": [list(b) for b in spec.raan_bins],
+        "n_segments": spec.n_segments,
+        "geometry_table": spec.geometry_table,
+        "geometry_index": spec.geometry_index,
+        "steps": spec.steps,
+        "zone_code": spec.zone_code,
+        "level": spec.level,
+        "parent": spec.parent,
+        "split": list(spec.split),
+        "export": asdict(spec.export),
+    }
+
+
+def write_catalog(path, zones, vertex_dtype="float64"):
+    """
+    Write ``zones`` — ``(spec, geoms, hashes)`` triples with geometry and hashes
+    in TractIndex flat order (``hashes`` may be ``None``) — to a catalog file at
+    ``path``, replacing it atomically. Returns the number of tracts written.
+    """
+    columns = {name: [] for name in (*BIN_COLUMNS, "theta_start_idx", "theta_end_idx", "zone", "tract_key")}
+    ids, hashes, geoms = [], [], []
+    zone_headers = []
+    for code, (spec, zone_geoms, zone_hashes) in enumerate(zones):
+        index = TractIndex(spec)
+        n_alt, n_inc, n_raan = index.shape
+        if len(zone_geoms) != len(index):
+            raise ValueError(f"{spec.name}: expected {len(index)} panels, got {len(zone_geoms)}")
+        columns["alt_min"].append(np.repeat(index.alt_lo, n_inc * n_raan))
+        columns["alt_max"].append(np.repeat(index.alt_hi, n_inc * n_raan))
+        columns["inc_min"].append(np.tile(np.repeat(index.inc_lo, n_raan), n_alt))
+        columns["inc_max"].append(np.tile(np.repeat(index.inc_hi, n_raan), n_alt))
+        columns["az_min"].append(np.tile(index.raan_lo, n_alt * n_inc))
+        columns["az_max"].append(np.tile(index.raan_hi, n_alt * n_inc))
+        columns["theta_start_idx"].append(index.theta_start_idx)
+        columns["theta_end_idx"].append(index.theta_end_idx)
+        columns["zone"].append(np.full(len(index), code))
+        columns["tract_key"].append(index.keys)
+        ids.extend(index.ids)
+        hashes.extend(zone_hashes if zone_hashes is not None else [None] * len(index))
+        geoms.extend(
+            MultiPolygon() if g is None else MultiPolygon([g]) if g.geom_type == "Polygon" else g
+            for g in zone_geoms
+        )
+        zone_headers.append({**_zone_header(spec), "start": len(ids) - len(index), "count": len(index)})
+
+    dtypes = {name: "<f8" for name in BIN_COLUMNS}
+    dtypes.update(theta_start_idx="<i4", theta_end_idx="<i4", zone="u1", tract_key="<i8")
+    arrays = {name: np.concatenate(parts).astype(dtypes[name]) for name, parts in columns.items()}
+
+    encoded = [tract_id.encode("utf-8") for tract_id in ids]
+    arrays["id_offsets"] = np.concatenate([[0], np.cumsum([len(b) for b in encoded])]).astype("<i8")
+    arrays["id_bytes"] = np.frombuffer(b"".join(encoded), dtype="u1")
+    width = max([len(h) for h in hashes if h] or [1])
+    arrays["content_hash"] = np.array([(h or "").encode("ascii") for h in hashes], dtype=f"S{width}")
+
+    geoms = np.array(geoms, dtype=object)
+    _, coords, (ring_offsets, part_offsets, geom_offsets) = shapely.to_ragged_array(geoms, include_z=True)
+    arrays["geom_offsets"] = geom_offsets.astype("<i8")
+    arrays["part_offsets"] = part_offsets.astype("<i8")
+    arrays["ring_offsets"] = ring_offsets.astype("<i8")
+    arrays["vertices"] = coords.astype("<f4" if vertex_dtype == "float32" else "<f8")
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "geometry_version": GEOMETRY_VERSION,
+        "key_format": KEY_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "tracts": len(ids),
+        "zones": zone_headers,
+        "columns": {},
+    }
+    # Column offsets depend on the header length, which depends on the offsets:
+    # lay out with a placeholder, then re-check until the header fits.
+    header_len = 4096
+    while True:
+        offset = _align(_PREAMBLE.size + header_len)
+        for name, array in arrays.items():
+            header["columns"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _align(offset + array.nbytes)
+        encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        if len(encoded_header) <= header_len:
+            break
+        header_len = _align(len(encoded_header))
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, header_len))
+        f.write(encoded_header.ljust(header_len, b" "))
+        for name, array in arrays.items():
+            f.seek(header["columns"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(offset)
+    os.replace(tmp, path)
+    return len(ids)
+
+
+def _align(n):
+    return -(-n // _ALIGN) * _ALIGN
+
+
+# === Reader ===
+
+class TractCatalogFile:
+    """
+    Memory-mapped, read-only view of a catalog file. Columns are NumPy arrays
+    backed by the mapping (``catalog.alt_min``, ``catalog.vertices``, …); nothing
+    is read from disk until it is touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, _, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a tract catalog file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path}: catalog format {version} is not supported (expected {FORMAT_VERSION})")
+            self.header = json.loads(f.read(header_len))
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        self.columns = {
+            name: np.ndarray(tuple(col["shape"]), dtype=np.dtype(col["dtype"]), buffer=self._map, offset=col["offset"])
+            for name, col in self.header["columns"].items()
+        }
+        self.zones = {
+            zone["name"]: ZoneSpec(
+                name=zone["name"],
+                alt_bins=tuple(map(tuple, zone["alt_bins"])),
+                inc_bins=tuple(map(tuple, zone["inc_bins"])),
+                raan_bins=tuple(map(tuple, zone["raan_bins"])),
+                n_segments=zone["n_segments"],
+                geometry_table=zone["geometry_table"],
+                geometry_index=zone["geometry_index"],
+                steps=zone["steps"],
+                zone_code=zone.get("zone_code", ZONES[zone["name"]].zone_code if zone["name"] in ZONES else 0),
+                level=zone.get("level", 0),
+                parent=zone.get("parent"),
+                split=tuple(zone.get("split", (1, 1, 1))),
+                # Files written before styles were stored take the configured zone's style.
+                export=export_style(
+                    zone["name"], zone.get("export"), ZONES[zone["name"]].export if zone["name"] in ZONES else None
+                ),
+            )
+            for zone in self.header["zones"]
+        }
+        if "tract_key" not in self.columns or self.header.get("key_format") != KEY_FORMAT:
+            # Files written before keys existed, or in an older key layout: derive them from the stored bins.
+            self.columns["tract_key"] = np.concatenate([TractIndex(spec).keys for spec in self.zones.values()])
+        self._ranges = {zone["name"]: (zone["start"], zone["start"] + zone["count"]) for zone in self.header["zones"]}
+        self._positions = None
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return self.header["tracts"]
+
+    def zone_range(self, zone=None):
+        """``(start, stop)`` tract positions of ``zone`` (every tract for ``None``)."""
+        if zone is None:
+            return 0, len(self)
+        try:
+            return self._ranges[zone]
+        except KeyError:
+            raise KeyError(f"Catalog {self.path} has no zone {zone!r}; it holds {', '.join(self._ranges)}") from None
+
+    def tract_ids(self, start=0, stop=None):
+        stop = len(self) if stop is None else stop
+        offsets = self.id_offsets[start:stop + 1]
+        data = self.id_bytes[offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+        return [data[a - base:b - base].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def position(self, tract_id):
+        """Catalog position of ``tract_id`` (the ID map is built on first use)."""
+        if self._positions is None:
+            self._positions = {tract_id: i for i, tract_id in enumerate(self.tract_ids())}
+        return self._positions[tract_id]
+
+    def rings(self, i):
+        """Zero-copy ``(n, 3)`` vertex arrays of every ring of tract ``i``."""
+        parts = self.geom_offsets[i:i + 2]
+        rings = self.part_offsets[parts[0]:parts[1] + 1]
+        bounds = self.ring_offsets[rings[0]:rings[-1] + 1]
+        return [self.vertices[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def geometries(self, start=0, stop=None):
+        """Panels of tracts ``start:stop`` as a shapely array (empty MultiPolygon where none is stored)."""
+        stop = len(self) if stop is None else stop
+        geom_offsets = self.geom_offsets[start:stop + 1]
+        part_offsets = self.part_offsets[geom_offsets[0]:geom_offsets[-1] + 1]
+        ring_offsets = self.ring_offsets[part_offsets[0]:part_offsets[-1] + 1]
+        coords = self.vertices[ring_offsets[0]:ring_offsets[-1]]
+        return shapely.from_ragged_array(
+            shapely.GeometryType.MULTIPOLYGON,
+            np.asarray(coords, dtype=float),
+            (ring_offsets - ring_offsets[0], part_offsets - part_offsets[0], geom_offsets - geom_offsets[0]),
+        )
+
+    def properties(self, i):
+        """The ``METADATA_COLUMNS`` of tract ``i``, as exported from dev.tracts."""
+        zone = self.header["zones"][int(self.zone[i])]["name"]
+        values = {name: float(self.columns[name][i]) for name in BIN_COLUMNS}
+        values.update(
+            orbit_zone=zone, theta_start_idx=int(self.theta_start_idx[i]), theta_end_idx=int(self.theta_end_idx[i]),
+            tract_key=int(self.tract_key[i]),
+        )
+        return {name: values[name] for name in METADATA_COLUMNS}
+
+    def count(self, zone=None):
+        """Stored (non-empty) panels in ``zone``."""
+        start, stop = self.zone_range(zone)
+        return int(np.count_nonzero(np.diff(self.geom_offsets[start:stop + 1])))
+
+    def iter_geometries(self, zone=None, batch_size=DEFAULT_FETCH_SIZE):
+        """Yield ``(tract_id, geometry)`` for every stored panel, like export.stream_geometries."""
+        start, stop = self.zone_range(zone)
+        for lo in range(start, stop, batch_size):
+            hi = min(lo + batch_size, stop)
+            for tract_id, geom in zip(self.tract_ids(lo, hi), self.geometries(lo, hi)):
+                if not geom.is_empty:
+                    yield tract_id, geom
+
+    def iter_features(self, zone=None, batch_size=DEFAULT_FETCH_SIZE):
+        """Yield ``(tract_id, wkb, properties)`` for every stored panel, like export.stream_features."""
+        start, stop = self.zone_range(zone)
+        for lo in range(start, stop, batch_size):
+            hi = min(lo + batch_size, stop)
+            geoms = self.geometries(lo, hi)
+            wkbs = shapely.to_wkb(geoms, output_dimension=3)
+            for i, (tract_id, geom, wkb) in enumerate(zip(self.tract_ids(lo, hi), geoms, wkbs)):
+                if not geom.is_empty:
+                    yield tract_id, wkb, self.properties(lo + i)
+
+    def zone_panels(self, zone):
+        """``(spec, geoms, hashes)`` of one zone, in the form ``write_catalog`` takes."""
+        start, stop = self.zone_range(zone)
+        geoms = self.geometries(start, stop)
+        geoms[shapely.is_empty(geoms)] = None
+        hashes = [h.decode("ascii") or None for h in self.content_hash[start:stop]]
+        return self.zones[zone], geoms, hashes
@@ -0,0 +1,532 @@
+# === 🖥️ Command-line Interface ===
+# python -m orbital_tracts generate [--zone LEO --zone MEO ...]
+# python -m orbital_tracts export [--zone LEO] [--format czml|geojson|fgb|parquet] [--tiles DIR]
+# python -m orbital_tracts serve [--zone LEO] [--port 8080]
+# python -m orbital_tracts catalog [-o tracts.catalog]
+# python -m orbital_tracts adjacency [-o DIR] [--connectivity full]
+# python -m orbital_tracts screen CATALOG... [--threshold 5] [--workers 4] [-o conjunctions.csv]
+# python -m orbital_tracts ingest CATALOG... [--zone LEO] [--hours 24] [--step 10]
+# python -m orbital_tracts density [--zone LEO] [--bucket hour] [--full]
+#
+# Zones come from the TOML config (orbital_tracts/zones.toml unless --config is
+# given) and run concurrently, one thread per zone, over a single SQLAlchemy engine.
+# Database time dominates each zone, so threads overlap it; panel building uses the
+# process pool behind --workers. Heavy modules (NumPy, shapely, pyproj, GeoAlchemy2)
+# are imported only once a command actually needs them.
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_DB_URL = "postgresql://postgres:@localhost:5432/extra_orbital"
+
+
+def _generate(args):
+    from sqlalchemy import create_engine
+
+    from orbital_tracts.generate import run_zone
+    from orbital_tracts.geometry import ArcCache, get_arc_cache, set_arc_cache
+    from orbital_tracts.metrics import open_sink, profiled
+    from orbital_tracts.models import create_tables
+    from orbital_tracts.zones import load_zones
+
+    zones = load_zones(args.config)
+    names = args.zone or list(zones)
+    unknown = [name for name in names if name not in zones]
+    if unknown:
+        raise SystemExit(f"Unknown zone(s) {', '.join(unknown)}; config defines {', '.join(zones)}")
+    specs = [zones[name] for name in names]
+
+    # One pool shared by every zone thread; each zone holds at most a couple of
+    # connections at a time.
+    engine = create_engine(args.db_url, pool_size=max(5, 2 * len(specs)), pool_pre_ping=True)
+    create_tables(engine, specs)
+
+    if args.arc_cache and os.path.exists(args.arc_cache):
+        set_arc_cache(ArcCache.load(args.arc_cache))
+
+    options = dict(
+        metadata=not args.skip_metadata,
+        geometry=not args.skip_geometry,
+        incremental=args.incremental,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        geodetic=args.geodetic,
+        sink=open_sink(args.metrics),
+        progress_interval=args.progress_interval,
+    )
+    started = time.perf_counter()
+    try:
+        with profiled(args.profile, args.profile_output):
+            if args.profile:
+                # Profilers only see the thread they were started on, so zones run in turn.
+                for spec in specs:
+                    run_zone(engine, spec, **options)
+            else:
+                with ThreadPoolExecutor(max_workers=len(specs), thread_name_prefix="zone") as pool:
+                    futures = [pool.submit(run_zone, engine, spec, **options) for spec in specs]
+                    for future in futures:
+                        future.result()
+    finally:
+        engine.dispose()
+    if args.arc_cache:
+        get_arc_cache().save(args.arc_cache)
+    print(f"🏁 Generated {', '.join(names)} in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+def _export(args):
+    from orbital_tracts.catalog import TractCatalogFile
+    from orbital_tracts.exporter import export_zone
+    from orbital_tracts.metrics import open_sink, profiled
+    from orbital_tracts.simplify import DEFAULT_SIMPLIFY_TOLERANCE_M, PositionEncoder
+
+    if args.catalog and args.tiles:
+        raise SystemExit("--tiles reads from the database; it cannot be combined with --catalog")
+    if args.occupancy and (args.tiles or args.format != "czml"):
+        raise SystemExit("--occupancy animates the single-file CZML export")
+    specs = _zone_specs(args)
+
+    # Memory-mapped catalog file: no database needed for the panels
+    catalog = TractCatalogFile(args.catalog) if args.catalog else None
+    engine = conn = None
+    if catalog is None or args.occupancy:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(args.db_url)
+        conn = engine.raw_connection()
+
+    # Optional simplification / quantization / delta encoding of CZML positions, with a size and deviation report
+    tolerance = DEFAULT_SIMPLIFY_TOLERANCE_M if args.simplify_tolerance is None else args.simplify_tolerance
+    encoder = PositionEncoder.from_options(args.precision, args.height_precision, args.simplify, tolerance, args.delta)
+    options = dict(
+        fmt=args.format, tiles=args.tiles, catalog=catalog, sector_deg=args.sector_deg, lod_steps=args.lod_steps,
+        compress=args.gzip, precision=args.precision, height_precision=args.height_precision, encoder=encoder,
+        occupancy=args.occupancy, occupancy_start=args.occupancy_start, occupancy_end=args.occupancy_end,
+        chunk_epochs=args.chunk_epochs, batch_size=args.batch_size,
+        sink=open_sink(args.metrics, job="export"), progress_interval=args.progress_interval,
+    )
+    try:
+        with profiled(args.profile, args.profile_output):
+            for spec in specs:
+                if args.tiles and len(specs) > 1:
+                    options["tiles"] = os.path.join(args.tiles, spec.name.lower())
+                export_zone(conn, spec, **options)
+                if conn is not None:
+                    conn.commit()
+    finally:
+        if conn is not None:
+            conn.close()
+            engine.dispose()
+    if encoder is not None and encoder.rings:
+        print(encoder.report())
+    return 0
+
+
+def _validate_geodetic(args):
+    from orbital_tracts.geodetic import validate, within_tolerance
+    from orbital_tracts.zones import load_zones
+
+    zones = load_zones(args.config)
+    specs = [zones[name] for name in (args.zone or zones)]
+    ok = True
+    for name, stats in validate(specs, steps=args.steps).items():
+        passed = within_tolerance(stats)
+        ok &= passed
+        print(
+            f"{'✅' if passed else '❌'} {name}: {stats['vertices']} vertices | "
+            f"max Δlon {stats['dlon_deg']:.2e}° Δlat {stats['dlat_deg']:.2e}° Δalt {stats['dalt_m']:.3f} m vs pyproj | "
+            f"round-trip residual numpy {stats['numpy_residual_m']:.2e} m, pyproj {stats['pyproj_residual_m']:.2e} m"
+        )
+    return 0 if ok else 1
+
+
+def _bench(args):
+    import json
+
+    from orbital_tracts.bench import run_benchmark, synthetic_zone
+    from orbital_tracts.zones import load_zones
+
+    if args.zone:
+        spec = load_zones(args.config)[args.zone]
+    else:
+        spec = synthetic_zone(
+            alt_min=args.alt_min, alt_max=args.alt_max, alt_step=args.alt_step,
+            inc_step=args.inc_step, raan_step=args.raan_step, steps=args.steps,
+        )
+    report = run_benchmark(
+        spec, db_url=args.db_url, sqlite_path=args.sqlite, geodetic=args.geodetic,
+        batch_size=args.batch_size, database=not args.no_db,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"📝 Wrote benchmark report to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+def _zone_specs(args):
+    from orbital_tracts.zones import load_zones
+
+    zones = load_zones(args.config)
+    unknown = [name for name in args.zone or () if name not in zones]
+    if unknown:
+        raise SystemExit(f"Unknown zone(s) {', '.join(unknown)}; config defines {', '.join(zones)}")
+    return [zones[name] for name in (args.zone or zones)]
+
+
+def _serve(args):
+    import asyncio
+
+    from orbital_tracts.service import build_catalog, load_catalog, open_catalog, serve
+
+    if args.catalog:
+        catalog = open_catalog(args.catalog, args.zone)
+    elif args.no_db:
+        catalog = build_catalog(_zone_specs(args), geodetic=args.geodetic)
+    else:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(args.db_url)
+        try:
+            catalog = load_catalog(engine, _zone_specs(args))
+        finally:
+            engine.dispose()
+    try:
+        asyncio.run(serve(catalog, args.host, args.port, cache_size=args.cache_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _catalog(args):
+    from orbital_tracts.catalog import build_panels, read_panels, write_catalog
+
+    specs = _zone_specs(args)
+    started = time.perf_counter()
+    if args.no_db:
+        zones = [(spec, build_panels(spec, args.geodetic), None) for spec in specs]
+    else:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(args.db_url)
+        conn = engine.raw_connection()
+        try:
+            zones = [(spec, *read_panels(conn, spec, args.batch_size)) for spec in specs]
+            conn.commit()
+        finally:
+            conn.close()
+            engine.dispose()
+    count = write_catalog(args.output, zones, vertex_dtype=args.vertex_dtype)
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"🗃️ Wrote {count} tracts to {args.output} ({size_mb:.1f} MiB) in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+def _adjacency(args):
+    from orbital_tracts.adjacency import build_adjacency
+
+    os.makedirs(args.output, exist_ok=True)
+    for spec in _zone_specs(args):
+        graph = build_adjacency(spec, connectivity=args.connectivity)
+        path = os.path.join(args.output, f"tract_adjacency_{spec.name.lower()}.npz")
+        graph.save(path)
+        print(f"🕸️ {spec.name}: {len(graph)} tracts, {graph.edges} edges → {path}")
+    return 0
+
+
+def _screen(args):
+    import csv
+    from datetime import timedelta
+
+    from orbital_tracts.ingest import grid_start, load_elements, state_vectors, time_grid
+    from orbital_tracts.screening import CONJUNCTION_COLUMNS, screen
+
+    specs = _zone_specs(args)
+    try:
+        start = grid_start(args.start, args.step)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    epochs = time_grid(start, start + timedelta(hours=args.hours), args.step)
+
+    sats = load_elements(args.paths)
+    print(f"📡 Loaded {len(sats)} element sets; propagating over {len(epochs)} epochs")
+    started = time.perf_counter()
+    r, v = state_vectors(sats, epochs, sat_chunk=args.sat_chunk)
+    result = screen(r, args.threshold, zones=specs, workers=args.workers)
+    print(f"{result.report()} in {time.perf_counter() - started:.1f}s")
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CONJUNCTION_COLUMNS)
+        writer.writerows(result.rows(sats, epochs, r, v, zones=specs))
+    print(f"📝 Wrote {len(result)} close approaches to {args.output}")
+    return 0
+
+
+def _ingest(args):
+    from datetime import timedelta
+
+    from sqlalchemy import create_engine
+
+    from orbital_tracts.ingest import (
+        grid_start, load_elements, occupancy_counts, occupancy_rows, time_grid, write_occupancy,
+    )
+    from orbital_tracts.zones import load_zones
+
+    zones = load_zones(args.config)
+    # Finer levels are counted through their zone and rolled up, so the default is every level-0 zone.
+    specs = _zone_specs(args) if args.zone else [spec for spec in zones.values() if spec.level == 0]
+    try:
+        start = grid_start(args.start, args.step)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    end = start + timedelta(hours=args.hours)
+    epochs = time_grid(start, end, args.step)
+
+    sats = load_elements(args.paths)
+    print(f"📡 Loaded {len(sats)} element sets; propagating over {len(epochs)} epochs "
+          f"({start:%Y-%m-%d %H:%M} → {end:%Y-%m-%d %H:%M} UTC)")
+    zone_counts = occupancy_counts(sats, epochs, zones=specs, sat_chunk=args.sat_chunk, config=zones)
+    for zone, (_, counts) in zone_counts.items():
+        print(f"   {zone}: {int(counts.sum())} object-epochs in {int((counts.sum(axis=0) > 0).sum())} tracts")
+
+    engine = create_engine(args.db_url)
+    try:
+        count = write_occupancy(engine, occupancy_rows(zone_counts, epochs), start, end, batch_size=args.batch_size)
+    finally:
+        engine.dispose()
+    print(f"✅ Wrote {count} tract occupancy rows into dev.tract_occupancy.")
+    return 0
+
+
+def _density(args):
+    from sqlalchemy import create_engine
+
+    from orbital_tracts.density import refresh_density
+
+    specs = _zone_specs(args)
+    engine = create_engine(args.db_url)
+    try:
+        for spec in specs:
+            from_bucket, rows = refresh_density(
+                engine, zone=spec, bucket=args.bucket, time_column=args.time_column, full=args.full
+            )
+            if from_bucket is None:
+                print(f"✅ {spec.name}: no new snapshots since last refresh.")
+            else:
+                print(f"✅ {spec.name}: refreshed {rows} tract density rows from bucket {from_bucket:%Y-%m-%d %H:%M}.")
+    finally:
+        engine.dispose()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="orbital_tracts", description="Orbital Tract Framework tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="generate tract metadata and geometry panels")
+    gen.add_argument("--config", default=None,
+                     help="zone definition TOML (default: orbital_tracts/zones.toml)")
+    gen.add_argument("--zone", action="append",
+                     help="zone to generate; repeat for several (default: every zone in the config)")
+    gen.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="SQLAlchemy database URL (default: $ORBITAL_TRACTS_DB_URL or the local dev database)")
+    gen.add_argument("--workers", type=int, default=1,
+                     help="worker processes for panel generation (one altitude shell per task)")
+    gen.add_argument("--batch-size", type=int, default=10000,
+                     help="rows per COPY batch when loading tracts and geometry")
+    gen.add_argument("--incremental", action="store_true",
+                     help="only rewrite tracts and panels whose content hash changed")
+    gen.add_argument("--geodetic", choices=("pyproj", "numpy"), default="pyproj",
+                     help="ECEF → WGS84 conversion: PROJ, or the closed-form NumPy fast path")
+    gen.add_argument("--arc-cache", metavar="PATH",
+                     help="load/save the unit-arc geometry cache across runs (an .npz file)")
+    gen.add_argument("--metrics", metavar="PATH",
+                     help="write progress metrics: a Prometheus textfile for *.prom, JSON lines otherwise")
+    gen.add_argument("--progress-interval", type=float, default=5.0,
+                     help="seconds between progress lines and metric snapshots")
+    gen.add_argument("--profile", choices=("cprofile", "pyinstrument"),
+                     help="profile the run (zones then run one after another)")
+    gen.add_argument("--profile-output", metavar="PATH",
+                     help="profile output (default profile.prof / profile.html)")
+    gen.add_argument("-v", "--verbose", action="store_true",
+                     help="debug logging, including coordinates of invalid panels")
+    gen.add_argument("--skip-metadata", action="store_true", help="reuse the stored dev.tracts rows")
+    gen.add_argument("--skip-geometry", action="store_true", help="only regenerate metadata")
+    gen.set_defaults(func=_generate)
+
+    exp = commands.add_parser("export", help="export tract panels to CZML, GeoJSON, FlatGeobuf or GeoParquet")
+    exp.add_argument("--config", default=None, help="zone definition TOML (styles come from each zone's export table)")
+    exp.add_argument("--zone", action="append",
+                     help="zone to export; repeat for several (default: every zone in the config)")
+    exp.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="database to read panels (and occupancy) from")
+    exp.add_argument("--format", choices=("czml", "geojson", "fgb", "parquet"), default="czml",
+                     help="output format (geojson is newline-delimited)")
+    exp.add_argument("--batch-size", type=int, default=2000,
+                     help="rows fetched per round trip from the server-side cursor")
+    exp.add_argument("--precision", type=int, default=None,
+                     help="round lon/lat to this many decimal places")
+    exp.add_argument("--height-precision", type=int, default=None,
+                     help="round heights (metres) to this many decimal places")
+    exp.add_argument("--simplify", choices=("dp", "arc"),
+                     help="CZML: drop ring vertices within --simplify-tolerance (arc: against great-circle "
+                          "edges, recommended for panels; dp: Douglas-Peucker on lon/lat, which keeps most "
+                          "orbit-arc vertices)")
+    # Resolved to simplify.DEFAULT_SIMPLIFY_TOLERANCE_M in _export, which imports NumPy only when it runs.
+    exp.add_argument("--simplify-tolerance", type=float, default=None,
+                     help="simplification tolerance in metres (default: simplify.DEFAULT_SIMPLIFY_TOLERANCE_M, 100)")
+    exp.add_argument("--delta", action="store_true",
+                     help="CZML: delta-encode quantized positions (non-standard; needs a client-side decoder)")
+    exp.add_argument("--gzip", action="store_true", help="write gzip-compressed output (CZML and GeoJSON)")
+    exp.add_argument("--tiles", metavar="DIR", default=None,
+                     help="write tiled CZML (one file per altitude shell and RAAN sector, plus LODs) into DIR "
+                          "(DIR/<zone> with several zones)")
+    exp.add_argument("--sector-deg", type=float, default=None,
+                     help="RAAN width of each tile in degrees (default: the zone's sector_deg)")
+    exp.add_argument("--lod-steps", type=int, nargs="*", default=[4, 8],
+                     help="arc steps for the coarser LOD levels, coarsest first")
+    exp.add_argument("--occupancy", nargs="?", const="occupancy", choices=("occupancy", "density"),
+                     help="CZML: animate panel colours by per-epoch object counts from dev.tract_occupancy "
+                          "(default) or dev.tract_density")
+    exp.add_argument("--occupancy-start", metavar="TIME", help="first epoch to animate (ISO 8601)")
+    exp.add_argument("--occupancy-end", metavar="TIME", help="last epoch to animate (ISO 8601)")
+    exp.add_argument("--chunk-epochs", type=int, default=24,
+                     help="epochs per time-sorted chunk of colour packets")
+    exp.add_argument("--catalog", metavar="PATH",
+                     help="read panels from a catalog file (see `catalog`) instead of the database")
+    exp.add_argument("--metrics", metavar="PATH",
+                     help="write progress metrics: a Prometheus textfile for *.prom, JSON lines otherwise")
+    exp.add_argument("--progress-interval", type=float, default=5.0,
+                     help="seconds between progress lines and metric snapshots")
+    exp.add_argument("--profile", choices=("cprofile", "pyinstrument"), help="profile the export")
+    exp.add_argument("--profile-output", metavar="PATH",
+                     help="profile output (default profile.prof / profile.html)")
+    exp.set_defaults(func=_export)
+
+    check = commands.add_parser(
+        "validate-geodetic", help="compare the NumPy geodetic conversion with pyproj over the tract grid"
+    )
+    check.add_argument("--config", default=None, help="zone definition TOML")
+    check.add_argument("--zone", action="append", help="zone to check (default: all)")
+    check.add_argument("--steps", type=int, default=None, help="vertices per arc edge (default: per zone)")
+    check.set_defaults(func=_validate_geodetic)
+
+    bench = commands.add_parser("bench", help="time each generation stage on a synthetic grid, as JSON")
+    bench.add_argument("--zone", help="benchmark a zone from the config instead of the synthetic grid")
+    bench.add_argument("--config", default=None, help="zone definition TOML (with --zone)")
+    bench.add_argument("--alt-min", type=int, default=200, help="synthetic grid: lowest altitude (km)")
+    bench.add_argument("--alt-max", type=int, default=2050, help="synthetic grid: altitude upper bound (km)")
+    bench.add_argument("--alt-step", type=int, default=50, help="synthetic grid: shell thickness (km)")
+    bench.add_argument("--inc-step", type=int, default=5, help="synthetic grid: inclination bin (deg)")
+    bench.add_argument("--raan-step", type=int, default=5, help="synthetic grid: RAAN bin (deg)")
+    bench.add_argument("--steps", type=int, default=16, help="vertices per arc edge")
+    bench.add_argument("--geodetic", choices=("pyproj", "numpy"), default="pyproj")
+    bench.add_argument("--db-url", default=None,
+                       help="load into PostGIS temp tables at this URL (default: SQLite/SpatiaLite)")
+    bench.add_argument("--sqlite", default=":memory:", help="SQLite database file for the fallback")
+    bench.add_argument("--no-db", action="store_true", help="skip the insert and index stages")
+    bench.add_argument("--batch-size", type=int, default=10000, help="rows per COPY/INSERT batch")
+    bench.add_argument("--output", help="write the JSON report here instead of stdout")
+    bench.set_defaults(func=_bench)
+
+    srv = commands.add_parser("serve", help="serve tract lookups and geometry over HTTP from memory")
+    srv.add_argument("--config", default=None, help="zone definition TOML")
+    srv.add_argument("--zone", action="append", help="zone to load; repeat for several (default: all)")
+    srv.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="database to load panels from at startup")
+    srv.add_argument("--catalog", metavar="PATH",
+                     help="load tracts from a catalog file (see `catalog`) instead of the database")
+    srv.add_argument("--no-db", action="store_true",
+                     help="rebuild the panels from the zone config instead of loading them")
+    srv.add_argument("--geodetic", choices=("pyproj", "numpy"), default="pyproj",
+                     help="ECEF → WGS84 conversion when rebuilding panels (--no-db)")
+    srv.add_argument("--host", default="127.0.0.1", help="address to bind")
+    srv.add_argument("--port", type=int, default=8080, help="port to listen on")
+    srv.add_argument("--cache-size", type=int, default=1024, help="rendered responses kept in the LRU cache")
+    srv.set_defaults(func=_serve)
+
+    cat = commands.add_parser("catalog", help="write tract metadata and panels to a memory-mappable catalog file")
+    cat.add_argument("--config", default=None, help="zone definition TOML")
+    cat.add_argument("--zone", action="append", help="zone to include; repeat for several (default: all)")
+    cat.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="database to read the stored panels from")
+    cat.add_argument("--no-db", action="store_true",
+                     help="rebuild the panels from the zone config instead of reading them")
+    cat.add_argument("--geodetic", choices=("pyproj", "numpy"), default="pyproj",
+                     help="ECEF → WGS84 conversion when rebuilding panels (--no-db)")
+    cat.add_argument("--vertex-dtype", choices=("float64", "float32"), default="float64",
+                     help="vertex precision; float32 halves the vertex buffer (metre-level rounding)")
+    cat.add_argument("--batch-size", type=int, default=2000, help="rows fetched per round trip")
+    cat.add_argument("--output", "-o", default="tracts.catalog", help="catalog file to write")
+    cat.set_defaults(func=_catalog)
+
+    adj = commands.add_parser("adjacency", help="save each zone's tract adjacency graph (CSR) as a .npz file")
+    adj.add_argument("--config", default=None, help="zone definition TOML")
+    adj.add_argument("--zone", action="append", help="zone to include; repeat for several (default: all)")
+    adj.add_argument("--connectivity", choices=("face", "full"), default="face",
+                     help="face: neighbours differ in one bin; full: diagonal neighbours too")
+    adj.add_argument("--output", "-o", default=".", help="directory for tract_adjacency_<zone>.npz")
+    adj.set_defaults(func=_adjacency)
+
+    scr = commands.add_parser("screen", help="screen a TLE/OMM catalog for close approaches, bucketed by altitude shell")
+    scr.add_argument("paths", nargs="+", help="TLE (.tle/.txt/.3le) or OMM (.json/.csv/.xml) files, directories or globs")
+    scr.add_argument("--config", default=None, help="zone definition TOML")
+    scr.add_argument("--zone", action="append",
+                     help="zone whose altitude shells bucket the screen and label tracts (default: all)")
+    scr.add_argument("--start", default=None,
+                     help="first epoch, ISO 8601 UTC (default: now, rounded down to the step)")
+    scr.add_argument("--hours", type=float, default=24, help="length of the time grid in hours")
+    scr.add_argument("--step", type=float, default=1, help="time grid step in minutes")
+    scr.add_argument("--threshold", type=float, default=5.0, help="report pairs closer than this (km)")
+    scr.add_argument("--workers", type=int, default=1, help="worker processes (one altitude shell per task)")
+    scr.add_argument("--sat-chunk", type=int, default=2000, help="satellites per vectorized SGP4 call")
+    scr.add_argument("--output", "-o", default="conjunctions.csv", help="CSV file for the close approaches")
+    scr.set_defaults(func=_screen)
+
+    ing = commands.add_parser("ingest", help="bin a TLE/OMM catalog into per-tract occupancy counts")
+    ing.add_argument("paths", nargs="+", help="TLE (.tle/.txt/.3le) or OMM (.json/.csv/.xml) files, directories or globs")
+    ing.add_argument("--config", default=None, help="zone definition TOML")
+    ing.add_argument("--zone", action="append",
+                     help="zone to count (its finer levels are rolled up from it); default: every zone")
+    ing.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="database holding dev.tract_occupancy")
+    ing.add_argument("--start", default=None,
+                     help="first epoch, ISO 8601 UTC (default: now, rounded down to the step)")
+    ing.add_argument("--hours", type=float, default=24, help="length of the time grid in hours")
+    ing.add_argument("--step", type=float, default=10, help="time grid step in minutes")
+    ing.add_argument("--sat-chunk", type=int, default=2000, help="satellites per vectorized SGP4 call")
+    ing.add_argument("--batch-size", type=int, default=10000, help="rows per COPY batch")
+    ing.set_defaults(func=_ingest)
+
+    den = commands.add_parser("density", help="refresh the per-tract density aggregates from dev.tle_snapshots")
+    den.add_argument("--config", default=None, help="zone definition TOML")
+    den.add_argument("--zone", action="append", help="zone to refresh; repeat for several (default: all)")
+    den.add_argument("--db-url", default=os.environ.get("ORBITAL_TRACTS_DB_URL", DEFAULT_DB_URL),
+                     help="database holding dev.tle_snapshots and the aggregates")
+    den.add_argument("--bucket", choices=("minute", "hour", "day", "week"), default="hour",
+                     help="time bucket width")
+    den.add_argument("--time-column", default="epoch", help="timestamp column in dev.tle_snapshots")
+    den.add_argument("--full", action="store_true", help="re-aggregate every bucket, not just new ones")
+    den.set_defaults(func=_density)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if getattr(args, "verbose", False) else logging.INFO,
+        format="%(message)s",
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
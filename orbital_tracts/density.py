@@ -0,0 +1,181 @@
+# === 📊 Tract Density Aggregates ===
+# Maintains per-tract, per-time-bucket summaries of dev.tle_snapshots so dashboards
+# read pre-aggregated rows instead of re-running the ST_Contains join over every
+# snapshot:
+#
+#   dev.tract_satellite_buckets  (tract, bucket, satellite) → orbit_points
+#   dev.tract_density            (tract, bucket)            → orbit_points, distinct_sats
+#
+# A refresh only re-aggregates buckets at or after the oldest snapshot newer than
+# the zone's watermark (dev.tract_density_state), so routine refreshes touch only
+# the latest bucket or two. Snapshots back-filled with timestamps older than the
+# watermark are only picked up by a full refresh.
+#
+# The spatial join runs once per altitude shell: each statement fixes g.alt_min,
+# so the planner prunes the panel table to that shell's partition, and only
+# snapshots inside the shell are tested against it.
+
+from orbital_tracts.partitions import altitude_predicate, shell_filter, shells
+from orbital_tracts.zones import ZONES
+
+BUCKETS = ("minute", "hour", "day", "week")
+
+DENSITY_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS dev.tract_satellite_buckets
+    (
+        tract_id text NOT NULL,
+        tract_key bigint,
+        orbit_zone text NOT NULL,
+        epoch_bucket timestamp with time zone NOT NULL,
+        satellite_id text NOT NULL,
+        name text,
+        orbit_points integer NOT NULL,
+        CONSTRAINT tract_satellite_buckets_pkey PRIMARY KEY (tract_id, epoch_bucket, satellite_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tract_satellite_buckets_sat
+        ON dev.tract_satellite_buckets (satellite_id)
+    """,
+    "ALTER TABLE dev.tract_satellite_buckets ADD COLUMN IF NOT EXISTS tract_key bigint",
+    """
+    CREATE INDEX IF NOT EXISTS idx_tract_satellite_buckets_key
+        ON dev.tract_satellite_buckets (tract_key, epoch_bucket)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dev.tract_density
+    (
+        tract_id text NOT NULL,
+        tract_key bigint,
+        orbit_zone text NOT NULL,
+        epoch_bucket timestamp with time zone NOT NULL,
+        orbit_points integer NOT NULL,
+        distinct_sats integer NOT NULL,
+        CONSTRAINT tract_density_pkey PRIMARY KEY (tract_id, epoch_bucket)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tract_density_bucket
+        ON dev.tract_density (orbit_zone, epoch_bucket)
+    """,
+    "ALTER TABLE dev.tract_density ADD COLUMN IF NOT EXISTS tract_key bigint",
+    """
+    CREATE TABLE IF NOT EXISTS dev.tract_density_state
+    (
+        orbit_zone text PRIMARY KEY,
+        bucket text NOT NULL,
+        watermark timestamp with time zone,
+        refreshed_at timestamp with time zone DEFAULT now()
+    )
+    """,
+)
+
+
+def ensure_density_tables(cur):
+    for statement in DENSITY_DDL:
+        cur.execute(statement)
+
+
+def refresh_density(engine, zone="LEO", bucket="hour", time_column="epoch", full=False):
+    """
+    Bring the density aggregates for ``zone`` (a name or ZoneSpec) up to date
+    with dev.tle_snapshots.
+
+    ``time_column`` is the snapshot timestamp column. ``full`` (or a change of
+    ``bucket``) re-aggregates everything. Returns ``(from_bucket, rows_written)``,
+    or ``(None, 0)`` when there was nothing new.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {BUCKETS}, got {bucket!r}")
+    spec = ZONES[zone] if isinstance(zone, str) else zone
+    zone = spec.name
+
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        ensure_density_tables(cur)
+
+        # Serialize refreshes of the same zone.
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"tract_density:{zone}",))
+        cur.execute("SELECT bucket, watermark FROM dev.tract_density_state WHERE orbit_zone = %s", (zone,))
+        state = cur.fetchone()
+        watermark = None
+        if state and not full and state[0] == bucket:
+            watermark = state[1]
+
+        if watermark is None:
+            cur.execute(f"SELECT min({time_column}), max({time_column}) FROM dev.tle_snapshots")
+        else:
+            cur.execute(
+                f"SELECT min({time_column}), max({time_column}) FROM dev.tle_snapshots "
+                f"WHERE {time_column} > %s",
+                (watermark,),
+            )
+        new_min, new_max = cur.fetchone()
+        if new_min is None:
+            conn.commit()
+            return None, 0
+
+        cur.execute("SELECT date_trunc(%s, %s::timestamptz)", (bucket, new_min))
+        from_bucket = cur.fetchone()[0]
+        if watermark is None:
+            # Full rebuild: clear every bucket for the zone, whatever its start.
+            cur.execute("DELETE FROM dev.tract_satellite_buckets WHERE orbit_zone = %s", (zone,))
+            cur.execute("DELETE FROM dev.tract_density WHERE orbit_zone = %s", (zone,))
+        else:
+            cur.execute(
+                "DELETE FROM dev.tract_satellite_buckets WHERE orbit_zone = %s AND epoch_bucket >= %s",
+                (zone, from_bucket),
+            )
+            cur.execute(
+                "DELETE FROM dev.tract_density WHERE orbit_zone = %s AND epoch_bucket >= %s",
+                (zone, from_bucket),
+            )
+
+        # The spatial join, shell by shell and only over snapshots in the affected buckets.
+        for alt_min, alt_max in shells(spec):
+            cur.execute(
+                f"""
+                INSERT INTO dev.tract_satellite_buckets
+                    (tract_id, tract_key, orbit_zone, epoch_bucket, satellite_id, name, orbit_points)
+                SELECT g.tract_id, g.tract_key, %s, date_trunc(%s, s.{time_column}),
+                       s.satellite_id::text, max(s.name), count(*)
+                FROM dev.tle_snapshots s
+                JOIN {spec.geometry_table} g
+                  ON {shell_filter('g', alt_min)} AND ST_Contains(g.geom, s.position)
+                WHERE s.{time_column} >= %s
+                  AND {altitude_predicate('s.altitude', alt_min, alt_max)}
+                GROUP BY g.tract_key, g.tract_id, date_trunc(%s, s.{time_column}), s.satellite_id
+                """,
+                (zone, bucket, from_bucket, bucket),
+            )
+        cur.execute(
+            """
+            INSERT INTO dev.tract_density
+                (tract_id, tract_key, orbit_zone, epoch_bucket, orbit_points, distinct_sats)
+            SELECT tract_id, tract_key, orbit_zone, epoch_bucket, sum(orbit_points), count(*)
+            FROM dev.tract_satellite_buckets
+            WHERE orbit_zone = %s AND epoch_bucket >= %s
+            GROUP BY tract_key, tract_id, orbit_zone, epoch_bucket
+            """,
+            (zone, from_bucket),
+        )
+        rows = cur.rowcount
+
+        cur.execute(
+            """
+            INSERT INTO dev.tract_density_state (orbit_zone, bucket, watermark, refreshed_at)
+            VALUES (%s, %s, %s, now())
+            ON CONFLICT (orbit_zone) DO UPDATE
+            SET bucket = EXCLUDED.bucket, watermark = EXCLUDED.watermark, refreshed_at = now()
+            """,
+            (zone, bucket, new_max),
+        )
+        conn.commit()
+        return from_bucket, rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,356 @@
+# === 📤 Streaming Tract Export ===
+# Reads panel geometry through a named (server-side) psycopg2 cursor as WKB, a batch
+# at a time, and writes CZML packets to disk as they are produced. Peak memory is
+# bounded by the batch size, not by the number of tracts.
+
+import gzip
+import json
+
+import numpy as np
+import shapely
+
+DEFAULT_FETCH_SIZE = 2000
+
+# Compact separators: no indentation or padding in the output file.
+_SEPARATORS = (",", ":")
+
+
+def _fetch_batches(conn, query, batch_size, cursor_name):
+    # Yield (column_names, rows) batches from a server-side cursor.
+    with conn.cursor(name=cursor_name) as cur:
+        cur.itersize = batch_size
+        cur.execute(query)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [col[0] for col in cur.description], rows
+
+
+def count_rows(conn, geometry_table, where=None):
+    """Number of panels an export of ``geometry_table`` will write (for progress / ETA)."""
+    sql = f"SELECT count(*) FROM {geometry_table} g"
+    if where:
+        sql += f" WHERE {where}"
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchone()[0]
+
+
+def stream_rows(conn, query, batch_size=DEFAULT_FETCH_SIZE, cursor_name="tract_export"):
+    """Yield raw rows of ``query`` from a server-side cursor, ``batch_size`` per round trip."""
+    for _, rows in _fetch_batches(conn, query, batch_size, cursor_name):
+        yield from rows
+
+
+def stream_geometries(conn, query, batch_size=DEFAULT_FETCH_SIZE, cursor_name="tract_export"):
+    """
+    Yield ``(tract_id, geometry)`` for each row of ``query``, which must select
+    ``tract_id`` and ``ST_AsBinary(geom)`` (in that order). Rows are fetched from a
+    server-side cursor ``batch_size`` at a time and decoded with one vectorized
+    ``shapely.from_wkb`` call per batch.
+    """
+    for _, rows in _fetch_batches(conn, query, batch_size, cursor_name):
+        tract_ids = [row[0] for row in rows]
+        geoms = shapely.from_wkb([bytes(row[1]) for row in rows])
+        yield from zip(tract_ids, geoms)
+
+
+# Tract metadata joined onto every exported feature.
+METADATA_COLUMNS = (
+    "orbit_zone", "alt_min", "alt_max", "inc_min", "inc_max", "az_min", "az_max",
+    "theta_start_idx", "theta_end_idx", "tract_key",
+)
+
+
+def feature_query(geometry_table, where=None):
+    """SQL selecting ``tract_id``, WKB geometry and ``METADATA_COLUMNS`` for a geometry table."""
+    columns = ", ".join(f"t.{c}" for c in METADATA_COLUMNS)
+    sql = (
+        f"SELECT g.tract_id, ST_AsBinary(g.geom) AS geom, {columns} "
+        f"FROM {geometry_table} g JOIN dev.tracts t ON t.tract_key = g.tract_key"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    return sql + " ORDER BY g.tract_id"
+
+
+def stream_features(conn, query, batch_size=DEFAULT_FETCH_SIZE, cursor_name="tract_export"):
+    """
+    Yield ``(tract_id, wkb, properties)`` for each row of a ``feature_query``.
+    ``properties`` maps every column after the geometry to its value.
+    """
+    for names, rows in _fetch_batches(conn, query, batch_size, cursor_name):
+        prop_names = names[2:]
+        for row in rows:
+            yield row[0], bytes(row[1]), dict(zip(prop_names, row[2:]))
+
+
+def polygon_positions(geom, precision=None, height_precision=None):
+    """
+    Flatten a polygon's exterior ring into a CZML ``cartographicDegrees`` list of
+    lon, lat, height (km → metres). When ``precision`` or ``height_precision`` is
+    set, degrees and metres are rounded to that many decimal places.
+    """
+    coords = np.array(geom.exterior.coords, dtype=float)
+    coords[:, 2] *= 1000  # km → meters
+    if precision is not None:
+        coords[:, :2] = np.round(coords[:, :2], precision)
+    if height_precision is not None:
+        coords[:, 2] = np.round(coords[:, 2], height_precision)
+    return coords.ravel().tolist()
+
+
+def polygon_packet(tract_id, positions, color, outline_color, packet_id=None):
+    """
+    A CZML packet drawing one panel as a translucent, outlined 3D polygon.
+    ``positions`` is a ``cartographicDegrees`` list, or a complete positions
+    value (e.g. from a simplify.PositionEncoder).
+    """
+    return {
+        "id": packet_id or tract_id,
+        "name": tract_id,
+        "polygon": {
+            "positions": positions if isinstance(positions, dict) else {
+                "cartographicDegrees": positions
+            },
+            "material": {
+                "solidColor": {
+                    "color": {"rgba": color}
+                }
+            },
+            "outline": True,
+            "outlineColor": {"rgba": outline_color},
+            "perPositionHeight": True
+        }
+    }
+
+
+def panel_packets(tract_id, geom, color, outline_color, precision=None, height_precision=None, encoder=None):
+    """
+    Yield one ``polygon_packet`` per part of a panel. Panels split at the
+    antimeridian are MultiPolygons; their parts get ids ``<tract_id>#<n>`` and
+    share the tract's name. Empty panels yield nothing. An ``encoder``
+    (simplify.PositionEncoder) replaces the plain rounding by ``precision``.
+    """
+    parts = [part for part in getattr(geom, "geoms", [geom]) if not part.is_empty]
+    for i, part in enumerate(parts):
+        packet_id = tract_id if len(parts) == 1 else f"{tract_id}#{i}"
+        if encoder is not None:
+            positions = encoder.positions(part)
+        else:
+            positions = polygon_positions(part, precision, height_precision)
+        yield polygon_packet(tract_id, positions, color=color, outline_color=outline_color, packet_id=packet_id)
+
+
+def open_output(path, compress=False):
+    """Open a text file for writing, gzip-compressed when ``compress`` is set."""
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+class CzmlWriter:
+    """
+    Incremental CZML document writer.
+
+    The document packet is written on open, every ``write`` appends one packet,
+    and the JSON array is closed on exit. Nothing is buffered beyond the packet in
+    hand.
+    """
+
+    def __init__(self, path, document, compress=False):
+        self.path = path
+        self.document = document
+        self.compress = compress
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open_output(self.path, self.compress)
+        self._file.write("[")
+        self._file.write(json.dumps(self.document, separators=_SEPARATORS))
+        return self
+
+    def write(self, packet):
+        self._file.write(",\n")
+        self._file.write(json.dumps(packet, separators=_SEPARATORS))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.write("]\n")
+        self._file.close()
+        return False
+
+
+# === 🧩 Feature Exporters ===
+# Writers for analytics and web-map formats. They share one interface: use as a
+# context manager and call ``write(tract_id, wkb, properties)`` per feature.
+# FlatGeobuf and GeoParquet need optional packages (pyogrio, pyarrow). Those are
+# imported only when the format is picked.
+
+class GeoJsonSeqWriter:
+    """Newline-delimited GeoJSON: one Feature per line, readable as a stream."""
+
+    def __init__(self, path, compress=False, precision=None):
+        self.path = path
+        self.compress = compress
+        self.precision = precision
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open_output(self.path, self.compress)
+        return self
+
+    def write(self, tract_id, wkb, properties):
+        geom = shapely.from_wkb(wkb)
+        if self.precision is not None:
+            geom = shapely.transform(geom, lambda c: np.round(c, self.precision), include_z=True)
+        feature = {
+            "type": "Feature",
+            "id": tract_id,
+            "geometry": json.loads(shapely.to_geojson(geom)),
+            "properties": {"tract_id": tract_id, **properties},
+        }
+        self._file.write(json.dumps(feature, separators=_SEPARATORS))
+        self._file.write("\n")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        return False
+
+
+class FlatGeobufWriter:
+    """
+    FlatGeobuf with its packed Hilbert R-tree, so clients can do bbox range reads
+    over HTTP. The index has to be built over every feature before the file can be
+    written. Features are therefore buffered as WKB and written once on exit.
+    """
+
+    def __init__(self, path, layer="tracts"):
+        self.path = path
+        self.layer = layer
+        self.count = 0
+        self._wkb = []
+        self._tract_ids = []
+        self._properties = {}
+
+    def __enter__(self):
+        return self
+
+    def write(self, tract_id, wkb, properties):
+        self._wkb.append(wkb)
+        self._tract_ids.append(tract_id)
+        for name, value in properties.items():
+            self._properties.setdefault(name, []).append(value)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            return False
+        from pyogrio.raw import write
+
+        fields = ["tract_id", *self._properties]
+        field_data = [np.array(self._tract_ids, dtype=object)]
+        field_data += [np.array(values) for values in self._properties.values()]
+        write(
+            self.path,
+            np.array(self._wkb, dtype=object),
+            field_data,
+            fields,
+            layer=self.layer,
+            driver="FlatGeobuf",
+            geometry_type="Unknown",
+            crs="EPSG:4326",
+            layer_options={"SPATIAL_INDEX": "YES"},
+        )
+        return False
+
+
+class GeoParquetWriter:
+    """
+    GeoParquet 1.0: tract metadata as typed columns plus a WKB ``geometry`` column.
+    Each batch of features is flushed as its own row group, so memory stays bounded.
+    """
+
+    def __init__(self, path, row_group_size=DEFAULT_FETCH_SIZE):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.count = 0
+        self._rows = []
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self):
+        import pyarrow as pa
+
+        fields = [pa.field("tract_id", pa.string())]
+        for name in METADATA_COLUMNS:
+            if name == "orbit_zone":
+                fields.append(pa.field(name, pa.string()))
+            elif name.startswith("theta_"):
+                fields.append(pa.field(name, pa.int32()))
+            elif name == "tract_key":
+                fields.append(pa.field(name, pa.int64()))
+            else:
+                fields.append(pa.field(name, pa.float64()))
+        fields.append(pa.field("geometry", pa.binary()))
+
+        geo = {
+            "version": "1.0.0",
+            "primary_column": "geometry",
+            "columns": {"geometry": {"encoding": "WKB", "geometry_types": []}},
+        }
+        self._schema = pa.schema(fields, metadata={"geo": json.dumps(geo)})
+        return self
+
+    def write(self, tract_id, wkb, properties):
+        self._rows.append((tract_id, wkb, properties))
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._rows:
+            return
+        columns = {"tract_id": [r[0] for r in self._rows]}
+        for name in METADATA_COLUMNS:
+            columns[name] = [r[2].get(name) for r in self._rows]
+        columns["geometry"] = [r[1] for r in self._rows]
+        table = pa.Table.from_pydict(columns, schema=self._schema)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        self._writer.write_table(table)
+        self._rows = []
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._flush()
+        if self._writer is not None:
+            self._writer.close()
+        return False
+
+
+# Format name → (writer class, file extension)
+FEATURE_WRITERS = {
+    "geojson": (GeoJsonSeqWriter, ".geojsonl"),
+    "fgb": (FlatGeobufWriter, ".fgb"),
+    "parquet": (GeoParquetWriter, ".parquet"),
+}
+
+
+def open_feature_writer(fmt, stem, compress=False, precision=None, batch_size=DEFAULT_FETCH_SIZE):
+    """Create the writer for ``fmt`` at ``stem`` + its extension. Returns ``(writer, path)``."""
+    writer_cls, ext = FEATURE_WRITERS[fmt]
+    if fmt == "geojson":
+        path = stem + ext + (".gz" if compress else "")
+        return writer_cls(path, compress=compress, precision=precision), path
+    path = stem + ext
+    if fmt == "parquet":
+        return writer_cls(path, row_group_size=batch_size), path
+    return writer_cls(path), path
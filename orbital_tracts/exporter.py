@@ -0,0 +1,130 @@
+# === 🎨 Zone Export Pipeline ===
+# CZML, tiled CZML and feature-format export for one orbit zone, driven by its
+# ZoneSpec (the table to read and the ExportStyle to draw it with). This is the body
+# the per-zone 2_*export_tracts_visual_enhanced_v10.py scripts used to duplicate;
+# the CLI (python -m orbital_tracts export) runs it for any zone in the config.
+
+from orbital_tracts.export import (
+    DEFAULT_FETCH_SIZE, CzmlWriter, count_rows, feature_query, open_feature_writer, panel_packets,
+    stream_features, stream_geometries,
+)
+from orbital_tracts.metrics import DEFAULT_INTERVAL, Progress
+from orbital_tracts.tiles import export_tiles
+from orbital_tracts.timeline import DEFAULT_CHUNK_EPOCHS, load_timeline
+
+VALID_PANELS = "ST_IsValid(g.geom) AND NOT ST_IsEmpty(g.geom)"
+
+
+def _where(spec):
+    return VALID_PANELS if spec.export.valid_only else None
+
+
+def export_czml(conn, spec, catalog=None, compress=False, precision=None, height_precision=None, encoder=None,
+                occupancy=None, occupancy_start=None, occupancy_end=None, chunk_epochs=DEFAULT_CHUNK_EPOCHS,
+                batch_size=DEFAULT_FETCH_SIZE, progress=None):
+    """
+    Write the zone's panels as one CZML document, optionally animated by
+    ``occupancy`` (``"occupancy"`` or ``"density"``). Returns ``(path, packets)``.
+    """
+    style = spec.export
+    document = {"id": "document", "name": style.title, "version": "1.0"}
+    output = style.czml_output + ".czml" + (".gz" if compress else "")
+
+    # Optional congestion playback: per-epoch colour intervals on top of the panels
+    timeline = None
+    if occupancy:
+        timeline = load_timeline(conn, spec.name, occupancy, occupancy_start, occupancy_end)
+        if timeline is None:
+            print(f"⚠️ No occupancy rows for {spec.name} in that range; writing static colours")
+        else:
+            document["clock"] = timeline.clock()
+
+    if catalog:
+        panels = catalog.iter_geometries(spec.name, batch_size)
+    else:
+        # Streamed through a server-side cursor
+        query = f"SELECT g.tract_id, ST_AsBinary(g.geom) FROM {spec.geometry_table} g"
+        if _where(spec):
+            query += f" WHERE {_where(spec)}"
+        panels = stream_geometries(conn, query, batch_size=batch_size)
+
+    # Packets are written as soon as they are built
+    packet_ids = {}
+    with CzmlWriter(output, document, compress=compress) as czml:
+        for tract_id, shape in panels:
+            for packet in panel_packets(
+                tract_id, shape, list(style.color), list(style.outline_color), precision, height_precision, encoder
+            ):
+                czml.write(packet)
+                if timeline is not None and tract_id in timeline:
+                    packet_ids.setdefault(tract_id, []).append(packet["id"])
+            if progress is not None:
+                progress.update()
+
+        # Time-sorted colour chunks; Cesium merges them into the panels above
+        if timeline is not None:
+            for packet in timeline.packets(packet_ids, list(style.color), chunk_epochs):
+                czml.write(packet)
+    return output, czml.count
+
+
+def export_features(conn, spec, fmt, catalog=None, compress=False, precision=None, batch_size=DEFAULT_FETCH_SIZE,
+                    progress=None):
+    """
+    Write the zone's panels with their dev.tracts metadata as ``fmt`` (see
+    export.FEATURE_WRITERS). Returns ``(path, features)``.
+    """
+    writer, output = open_feature_writer(
+        fmt, spec.export.feature_output, compress=compress, precision=precision, batch_size=batch_size
+    )
+    if catalog:
+        features = catalog.iter_features(spec.name, batch_size)
+    else:
+        features = stream_features(conn, feature_query(spec.geometry_table, where=_where(spec)), batch_size=batch_size)
+    with writer:
+        for tract_id, wkb, properties in features:
+            writer.write(tract_id, wkb, properties)
+            if progress is not None:
+                progress.update()
+    return output, writer.count
+
+
+def export_zone(conn, spec, fmt="czml", tiles=None, catalog=None, sector_deg=None, lod_steps=(4, 8),
+                compress=False, precision=None, height_precision=None, encoder=None, occupancy=None,
+                occupancy_start=None, occupancy_end=None, chunk_epochs=DEFAULT_CHUNK_EPOCHS,
+                batch_size=DEFAULT_FETCH_SIZE, sink=None, progress_interval=DEFAULT_INTERVAL):
+    """
+    Export one zone: tiled CZML into the ``tiles`` directory, or a single file in
+    ``fmt``. Panels come from ``catalog`` (a TractCatalogFile) when given and from
+    the zone's geometry table over ``conn`` otherwise. Returns the number written.
+    """
+    total = catalog.count(spec.name) if catalog else count_rows(conn, spec.geometry_table, where=_where(spec))
+    progress = Progress(f"{spec.name} export", total=total, interval=progress_interval, sink=sink)
+
+    if tiles:
+        # Tiled CZML: one file per altitude shell and RAAN sector, with coarser LOD variants
+        manifest = export_tiles(
+            conn, spec.geometry_table, tiles, spec.export.title,
+            color=list(spec.export.color), outline_color=list(spec.export.outline_color),
+            sector_deg=sector_deg or spec.export.sector_deg, lod_steps=lod_steps, where=_where(spec),
+            precision=precision, height_precision=height_precision, compress=compress, batch_size=batch_size,
+            progress=progress, encoder=encoder, steps=spec.steps,
+        )
+        count = sum(tile["count"] for tile in manifest["tiles"])
+        print(f"✅ Wrote {len(manifest['tiles'])} {spec.name} tiles × {len(manifest['levels'])} LODs to {tiles}")
+    elif fmt == "czml":
+        output, count = export_czml(
+            conn, spec, catalog=catalog, compress=compress, precision=precision, height_precision=height_precision,
+            encoder=encoder, occupancy=occupancy, occupancy_start=occupancy_start, occupancy_end=occupancy_end,
+            chunk_epochs=chunk_epochs, batch_size=batch_size, progress=progress,
+        )
+        print(f"✅ {spec.name} CZML saved as {output} ({count} packets)")
+    else:
+        # Feature formats carry the tract metadata, joined from dev.tracts
+        output, count = export_features(
+            conn, spec, fmt, catalog=catalog, compress=compress, precision=precision, batch_size=batch_size,
+            progress=progress,
+        )
+        print(f"✅ Exported {count} {spec.name} tracts to {output}")
+    progress.finish()
+    return count
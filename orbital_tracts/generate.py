@@ -0,0 +1,136 @@
+# === 🏗️ Tract Generation Pipeline ===
+# Metadata and panel generation for one orbit zone, driven entirely by its ZoneSpec.
+# This is the body the per-zone 1_Generate*_Metadata_Geometry_v10.py scripts used to
+# duplicate; the CLI (python -m orbital_tracts generate) runs it for any zone in the
+# config.
+
+from sqlalchemy import text
+
+from orbital_tracts.adjacency import build_adjacency, write_adjacency
+from orbital_tracts.incremental import diff_tracts, existing_hashes, tract_hash
+from orbital_tracts.keys import zone_keys
+from orbital_tracts.levels import parent_keys
+from orbital_tracts.loader import (
+    DEFAULT_BATCH_SIZE, delete_geometries, delete_tracts, load_geometries, load_tracts, upsert_geometries,
+    upsert_tracts,
+)
+from orbital_tracts.metrics import DEFAULT_INTERVAL, Progress
+from orbital_tracts.parallel import generate_panels
+from orbital_tracts.partitions import shells as partition_shells
+
+
+def tract_rows(spec, geodetic="pyproj"):
+    """
+    Every tract of ``spec`` as a row in ``loader.TRACT_COLUMNS`` order, hashed
+    for panels built with the ``geodetic`` conversion.
+    """
+    rows = []
+    keys = zone_keys(spec)
+    # Coarser-level tract of each tract; NULL at level 0.
+    parents = parent_keys(keys, spec).tolist() if spec.parent else [None] * len(keys)
+    bins = zip(spec.iter_bins(), parents, keys.tolist())
+    for (tract_id, alt_min, alt_max, inc_min, inc_max, az_min, az_max, theta_start_idx, theta_end_idx), parent, key in bins:
+        rows.append((
+            tract_id, alt_min, alt_max, inc_min, inc_max, az_min, az_max,
+            spec.name, theta_start_idx, theta_end_idx, parent, key,
+            tract_hash(alt_min, alt_max, inc_min, inc_max, az_min, az_max, theta_start_idx, theta_end_idx,
+                       steps=spec.steps, geodetic=geodetic),
+        ))
+    return rows
+
+
+def generate_metadata(engine, spec, incremental=False, batch_size=DEFAULT_BATCH_SIZE, geodetic="pyproj"):
+    """Write the zone's dev.tracts rows: a full replace, or an upsert of changed tracts."""
+    new_tracts = tract_rows(spec, geodetic)
+
+    if incremental:
+        # Upsert only new or changed tracts and drop the ones no longer in the bins.
+        changed, removed = diff_tracts(existing_hashes(engine, spec.name), new_tracts)
+        upsert_tracts(engine, changed, batch_size=batch_size)
+        delete_tracts(engine, removed, spec.geometry_table)
+        print(f"✅ [{spec.name}] Upserted {len(changed)} changed metadata rows, removed {len(removed)} retired tracts.")
+    else:
+        # Rows are COPY'd into a staging table and swapped in for the zone in one transaction.
+        # The panels stay online until load_geometries swaps in their replacement partitions.
+        load_tracts(engine, new_tracts, spec.name, batch_size=batch_size)
+        print(f"✅ [{spec.name}] Inserted {len(new_tracts)} updated metadata rows with arc segment indices.")
+
+    # Adjacency follows from the bins alone; rewrite it with them so keys never go stale.
+    edges = write_adjacency(engine, build_adjacency(spec), batch_size=batch_size)
+    print(f"🕸️ [{spec.name}] Wrote {edges} adjacency edges to dev.tract_adjacency.")
+
+    print(f"🔍 [{spec.name}] Sample tract IDs: {', '.join(t[0] for t in new_tracts[:5])}")
+    return len(new_tracts)
+
+
+def _load_tracts_for_geometry(engine, spec, incremental):
+    sql = (
+        "SELECT t.tract_id, t.alt_min, t.alt_max, t.inc_min, t.inc_max, t.az_min, t.az_max, t.content_hash, "
+        "t.tract_key FROM dev.tracts t "
+    )
+    if incremental:
+        # Only tracts whose stored panel is missing or was built from different inputs.
+        sql += (
+            f"LEFT JOIN {spec.geometry_table} g ON g.tract_key = t.tract_key AND g.alt_min = t.alt_min "
+            "WHERE t.orbit_zone = :zone AND g.content_hash IS DISTINCT FROM t.content_hash "
+        )
+    else:
+        sql += "WHERE t.orbit_zone = :zone "
+    sql += "ORDER BY t.alt_min, t.inc_min, t.az_min"
+    with engine.connect() as conn:
+        return conn.execute(text(sql), {"zone": spec.name}).fetchall()
+
+
+def generate_geometry(engine, spec, incremental=False, workers=1, batch_size=DEFAULT_BATCH_SIZE,
+                      geodetic="pyproj", sink=None, progress_interval=DEFAULT_INTERVAL):
+    """
+    Build, validate and load the zone's panels. Returns the number of panels written.
+
+    Progress (rate, ETA, skipped / invalid / antimeridian-split counts) goes to
+    stderr every ``progress_interval`` seconds and to the metrics ``sink``, if any.
+    """
+    rows = _load_tracts_for_geometry(engine, spec, incremental)
+    tracts = [tuple(row[:7]) for row in rows]
+    hashes = {row[0]: row[7] for row in rows}
+    keys = {row[0]: row[8] for row in rows}
+    shells = {row[0]: (row[1], row[2]) for row in rows}
+    print(f"Loaded {len(tracts)} {spec.name} tracts for geometry generation.")
+
+    # Panels are built per altitude shell (in worker processes with workers > 1)
+    # and validated before they come back, in a stable order for insertion.
+    progress = Progress(f"{spec.name} panels", total=len(tracts), interval=progress_interval, sink=sink)
+    panels = generate_panels(tracts, workers=workers, steps=spec.steps, geodetic=geodetic, progress=progress)
+    skipped = []
+
+    def valid_panels():
+        for tract_id, polygon_wkt in panels:
+            if polygon_wkt is None:
+                skipped.append(tract_id)
+                continue
+            yield (tract_id, keys[tract_id], *shells[tract_id], polygon_wkt, hashes[tract_id])
+
+    if incremental:
+        count = upsert_geometries(engine, spec.geometry_table, valid_panels(), batch_size=batch_size)
+        # Stale panels that could not be rebuilt are removed rather than left behind.
+        removed = delete_geometries(engine, spec.geometry_table, skipped)
+        print(f"✅ [{spec.name}] Upserted {count} changed shell panels, removed {removed} stale panels "
+              f"from {spec.geometry_table}.")
+    else:
+        # Stream straight into a staging table via COPY; the indexes are rebuilt after the load.
+        count = load_geometries(engine, spec.geometry_table, spec.geometry_index, valid_panels(),
+                                [alt_min for alt_min, _ in partition_shells(spec)], batch_size=batch_size)
+        print(f"✅ [{spec.name}] Inserted {count} toroidal shell panels into {spec.geometry_table}.")
+    progress.incr("written", count)
+    progress.finish()
+    return count
+
+
+def run_zone(engine, spec, metadata=True, geometry=True, incremental=False, workers=1,
+             batch_size=DEFAULT_BATCH_SIZE, geodetic="pyproj", sink=None, progress_interval=DEFAULT_INTERVAL):
+    """Run the metadata and/or geometry stages for one zone."""
+    if metadata:
+        generate_metadata(engine, spec, incremental=incremental, batch_size=batch_size, geodetic=geodetic)
+    if geometry:
+        generate_geometry(engine, spec, incremental=incremental, workers=workers, batch_size=batch_size,
+                          geodetic=geodetic, sink=sink, progress_interval=progress_interval)
+    return spec.name
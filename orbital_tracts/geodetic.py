@@ -0,0 +1,127 @@
+# === 📐 Closed-form ECEF → Geodetic Conversion ===
+# A pure-NumPy alternative to the PROJ pipeline behind
+# Transformer.from_crs("epsg:4978", "epsg:4326"), using Vermeille's exact closed-form
+# solution on the WGS84 ellipsoid. It skips PROJ's per-call setup and coordinate
+# marshalling, which dominates when every panel vertex of a shell is converted at once.
+#
+# validate() compares it with pyproj over every vertex of the configured tract grid;
+# run it with `python -m orbital_tracts validate-geodetic` before switching modes.
+
+import numpy as np
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+GEODETIC_MODES = ("pyproj", "numpy")
+
+# Largest differences from pyproj the numpy mode may show (degrees, degrees, metres).
+# PROJ's inverse is not exact either: its height drifts by decimetres at MEO/GEO
+# radii, which is why validate() also reports each mode's ECEF round-trip residual.
+DEFAULT_TOLERANCE = (1e-6, 1e-6, 1.0)
+
+# Largest ECEF round-trip residual (metres) accepted for the numpy mode.
+ROUND_TRIP_TOLERANCE = 1e-3
+
+
+def ecef_to_geodetic(x, y, z):
+    """
+    ECEF metres → (lon_deg, lat_deg, height_m) on WGS84, for arrays of any shape.
+
+    Vermeille (2004), "Direct transformation from geocentric coordinates to
+    geodetic coordinates". Exact for every point outside the ellipsoid's evolute,
+    a region within ~50 km of Earth's centre.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    e4 = WGS84_E2 * WGS84_E2
+
+    rho2 = x * x + y * y
+    p = rho2 / (WGS84_A * WGS84_A)
+    q = (1 - WGS84_E2) / (WGS84_A * WGS84_A) * z * z
+    r = (p + q - e4) / 6
+    s = e4 * p * q / (4 * r ** 3)
+    t = np.cbrt(1 + s + np.sqrt(s * (2 + s)))
+    u = r * (1 + t + 1 / t)
+    v = np.sqrt(u * u + e4 * q)
+    w = WGS84_E2 * (u + v - q) / (2 * v)
+    k = np.sqrt(u + v + w * w) - w
+    d = k * np.sqrt(rho2) / (k + WGS84_E2)
+    dz = np.sqrt(d * d + z * z)
+
+    lon = np.degrees(np.arctan2(y, x))
+    lat = np.degrees(2 * np.arctan2(z, d + dz))
+    height = (k + WGS84_E2 - 1) / k * dz
+    return lon, lat, height
+
+
+def geodetic_to_ecef(lon, lat, height):
+    """(lon_deg, lat_deg, height_m) on WGS84 → ECEF metres; the exact forward transform."""
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    sin_lat = np.sin(lat)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+    return (
+        (n + height) * np.cos(lat) * np.cos(lon),
+        (n + height) * np.cos(lat) * np.sin(lon),
+        (n * (1 - WGS84_E2) + height) * sin_lat,
+    )
+
+
+class NumpyGeodeticTransformer:
+    """Drop-in for the pyproj ECEF → WGS84 transformer (``always_xy`` order)."""
+
+    def transform(self, x, y, z):
+        return ecef_to_geodetic(x, y, z)
+
+
+def validate(zones, steps=None):
+    """
+    Convert every panel vertex of every shell in ``zones`` (ZoneSpecs) with both
+    modes.
+
+    Returns ``{zone: stats}``, where ``stats`` holds the vertex count, the largest
+    numpy-vs-pyproj differences (``dlon_deg``, ``dlat_deg``, ``dalt_m``) and the
+    largest ECEF round-trip residual of each mode (``numpy_residual_m``,
+    ``pyproj_residual_m``).
+    """
+    from orbital_tracts.geometry import _unit_rings, get_transformer, shell_radius_km
+
+    reference = get_transformer("pyproj")
+    report = {}
+    for spec in zones:
+        n_steps = steps or spec.steps
+        inc = np.array([b for b in spec.inc_bins for _ in spec.raan_bins], dtype=float)
+        raan = np.array([b for _ in spec.inc_bins for b in spec.raan_bins], dtype=float)
+        unit = _unit_rings(inc[:, 0], inc[:, 1], raan[:, 0], raan[:, 1], n_steps).reshape(-1, 3)
+
+        vertices = 0
+        worst = np.zeros(5)
+        for alt_min, alt_max in spec.alt_bins:
+            xyz = unit.T * (shell_radius_km(alt_min, alt_max) * 1000)
+            expected = np.array(reference.transform(*xyz))
+            actual = np.array(ecef_to_geodetic(*xyz))
+            diff = np.abs(actual - expected)
+            diff[0] = np.minimum(diff[0], 360 - diff[0])  # ±180° is the same meridian
+            residuals = [
+                np.linalg.norm(np.array(geodetic_to_ecef(*lla)) - xyz, axis=0).max()
+                for lla in (actual, expected)
+            ]
+            worst = np.maximum(worst, [*diff.max(axis=1), *residuals])
+            vertices += xyz.shape[1]
+        report[spec.name] = dict(zip(
+            ("vertices", "dlon_deg", "dlat_deg", "dalt_m", "numpy_residual_m", "pyproj_residual_m"),
+            (vertices, *map(float, worst)),
+        ))
+    return report
+
+
+def within_tolerance(stats, tolerance=DEFAULT_TOLERANCE, round_trip=ROUND_TRIP_TOLERANCE):
+    """Whether one zone's ``validate`` stats are inside the accepted error bounds."""
+    dlon, dlat, dalt = tolerance
+    return (
+        stats["dlon_deg"] <= dlon and stats["dlat_deg"] <= dlat and stats["dalt_m"] <= dalt
+        and stats["numpy_residual_m"] <= round_trip
+    )
@@ -0,0 +1,456 @@
+# === 🌐 Toroidal Panel Geometry Engine ===
+# Builds tract panels for a whole altitude shell at once: every arc vertex of every
+# tract is computed in one NumPy pass and reprojected with a single array-valued
+# pyproj call, then the rings are turned into MultiPolygon Z panels with shapely's
+# vectorized constructors. Rings crossing the antimeridian are split on the great
+# circle at ±180° (and closed over a pole they encircle) rather than dropped.
+# The trig for each (inclination, RAAN) bin is shared by every shell: ArcCache
+# keeps the unit-radius ring directions, and a shell only scales them by its
+# radius before the geodetic conversion.
+
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+import shapely
+from pyproj import Transformer
+from shapely.geometry import MultiPolygon, Polygon
+from shapely.wkt import dumps
+
+EARTH_RADIUS_KM = 6371
+
+# Vertices per arc edge of a panel.
+DEFAULT_STEPS = 16
+
+# Bump whenever a change here alters the panels produced for the same tract inputs,
+# so incremental runs know to rebuild every stored panel.
+GEOMETRY_VERSION = 2
+
+# Bin sets kept by ArcCache. A full zone needs one (its shells share their bins);
+# incremental runs can produce one per shell.
+DEFAULT_ARC_CACHE_SIZE = 64
+
+log = logging.getLogger(__name__)
+
+_transformers = {}
+_arc_cache = None
+
+
+def get_transformer(mode="pyproj"):
+    """
+    Return the ECEF → WGS84 transformer for ``mode``, created once per process:
+    ``"pyproj"`` (PROJ) or ``"numpy"`` (closed form, see orbital_tracts.geodetic).
+    """
+    transformer = _transformers.get(mode)
+    if transformer is None:
+        if mode == "pyproj":
+            transformer = Transformer.from_crs("epsg:4978", "epsg:4326", always_xy=True)
+        elif mode == "numpy":
+            from orbital_tracts.geodetic import NumpyGeodeticTransformer
+            transformer = NumpyGeodeticTransformer()
+        else:
+            raise ValueError(f"Unknown geodetic mode {mode!r}; expected 'pyproj' or 'numpy'")
+        _transformers[mode] = transformer
+    return transformer
+
+
+def normalize_longitude(lon):
+    return ((lon + 180) % 360) - 180
+
+
+def unwrap_lon(lon):
+    """Vectorized form of the scripts' scalar unwrap: fold ±360° overshoot back into range."""
+    lon = np.asarray(lon, dtype=float)
+    return np.where(lon > 180, lon - 360, np.where(lon < -180, lon + 360, lon))
+
+
+def shell_radius_km(alt_min, alt_max):
+    """Panels are drawn at the mid-altitude of the shell."""
+    return (alt_min + alt_max) / 2 + EARTH_RADIUS_KM
+
+
+def _arc_xyz(radius_km, raan_deg, inc_deg):
+    # Point on an inclined circle of the given radius, in kilometres (ECEF).
+    theta = raan_deg % 360
+    theta_rad = np.radians(theta)
+    inc_rad = np.radians(inc_deg)[:, None]
+    # Exact zeros at the nodes (0°, 180°) and apexes (90°, 270°), so arcs of every
+    # inclination meet in one identical vertex instead of 1e-16 apart.
+    cos_t = np.where(theta % 180 == 90, 0.0, np.cos(theta_rad))
+    sin_t = np.where(theta % 180 == 0, 0.0, np.sin(theta_rad))
+    x = radius_km * cos_t
+    # + 0.0 turns -0.0 into +0.0, so the 180° node is always lon +180, never -180.
+    y = radius_km * sin_t * np.cos(inc_rad) + 0.0
+    z = radius_km * sin_t * np.sin(inc_rad) + 0.0
+    return x, y, z
+
+
+def _unit_rings(inc_min, inc_max, raan_min, raan_max, steps):
+    # Unit-radius ECEF ring directions: the outer arc at inc_max, then the inner arc
+    # at inc_min walked backwards (ring not yet closed) → (n, 2 * steps, 3).
+    raan_max = np.where(raan_max < raan_min, raan_max + 360, raan_max)
+    raan_range = np.linspace(raan_min, raan_max, steps, axis=1)
+
+    # Exactly polar arcs are nudged off 90° so the outer and inner arcs never coincide.
+    outer_inc = np.where(np.isclose(inc_max, 90.0), 89.9, inc_max)
+    inner_inc = np.where(np.isclose(inc_min, 90.0), 90.1, inc_min)
+
+    ox, oy, oz = _arc_xyz(1.0, raan_range, outer_inc)
+    ix, iy, iz = _arc_xyz(1.0, raan_range[:, ::-1], inner_inc)
+    return np.stack([
+        np.concatenate([ox, ix], axis=1),
+        np.concatenate([oy, iy], axis=1),
+        np.concatenate([oz, iz], axis=1),
+    ], axis=-1)
+
+
+class ArcCache:
+    """
+    LRU cache of unit-radius panel rings for whole sets of (inclination, RAAN) bins.
+
+    Every altitude shell of a zone is built from the same bins, so the trig for a
+    bin set is done once and each further shell only multiplies the cached rings
+    by its radius. Entries are keyed by a digest of the bin arrays and ``steps``.
+    The cache can be saved to and loaded from an ``.npz`` file so regeneration
+    runs start warm, and it is safe to share between threads.
+    """
+
+    def __init__(self, maxsize=DEFAULT_ARC_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Picklable (minus the lock) so a warmed cache can be handed to pool workers.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(bins, steps):
+        return int(steps), hashlib.sha1(bins.tobytes()).hexdigest()
+
+    def unit_rings(self, inc_min, inc_max, raan_min, raan_max, steps=DEFAULT_STEPS):
+        """Unit rings for equal-length bin arrays → ``(n, 2 * steps, 3)``, read-only."""
+        bins = np.ascontiguousarray(np.stack(np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (inc_min, inc_max, raan_min, raan_max))
+        )))
+        key = self._key(bins, steps)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        rings = _unit_rings(*bins, steps)
+        rings.flags.writeable = False
+        self._store(key, bins, rings)
+        return rings
+
+    def _store(self, key, bins, rings):
+        with self._lock:
+            self._entries[key] = (bins, rings)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def save(self, path):
+        """Write every cached bin set and its rings to an ``.npz`` file, stamped with GEOMETRY_VERSION."""
+        with self._lock:
+            entries = list(self._entries.values())
+        arrays = {"version": np.array(GEOMETRY_VERSION)}
+        for i, (bins, rings) in enumerate(entries):
+            arrays[f"bins_{i}"] = bins
+            arrays[f"rings_{i}"] = rings
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path, maxsize=DEFAULT_ARC_CACHE_SIZE):
+        """
+        Create a cache pre-filled from a file written by :meth:`save`. A file
+        from another GEOMETRY_VERSION holds stale rings and is ignored (the
+        cache starts empty).
+        """
+        cache = cls(maxsize)
+        with np.load(path) as data:
+            version = int(data["version"]) if "version" in data.files else None
+            if version != GEOMETRY_VERSION:
+                log.warning("⚠️ Ignoring arc cache %s from geometry version %s (current: %s)",
+                            path, version, GEOMETRY_VERSION)
+                return cache
+            count = sum(name.startswith("bins_") for name in data.files)
+            for i in range(count):
+                bins, rings = data[f"bins_{i}"], data[f"rings_{i}"]
+                rings.flags.writeable = False
+                steps = rings.shape[1] // 2
+                cache._store(cls._key(bins, steps), bins, rings)
+        return cache
+
+
+def get_arc_cache():
+    """Return this process's ArcCache, created on first use."""
+    global _arc_cache
+    if _arc_cache is None:
+        _arc_cache = ArcCache()
+    return _arc_cache
+
+
+def set_arc_cache(cache):
+    """Install ``cache`` (e.g. one loaded from disk or warmed by a parent) for this process."""
+    global _arc_cache
+    _arc_cache = cache
+
+
+def panel_vertices(radius_km, inc_min, inc_max, raan_min, raan_max, steps=DEFAULT_STEPS, transformer=None,
+                   cache=None):
+    """
+    Compute the closed panel rings for many tracts on one shell.
+
+    The inputs are equal-length arrays (one entry per tract) and ``radius_km`` is a
+    scalar or a matching array. Returns an ``(n, 2 * steps + 1, 3)`` array of
+    (lon, lat, alt_km) vertices: the outer arc at ``inc_max``, the inner arc at
+    ``inc_min`` walked backwards, and the first vertex repeated to close the ring.
+    """
+    transformer = transformer or get_transformer()
+    cache = cache or get_arc_cache()
+    inc_min = np.atleast_1d(np.asarray(inc_min, dtype=float))
+    inc_max = np.atleast_1d(np.asarray(inc_max, dtype=float))
+    raan_min = np.atleast_1d(np.asarray(raan_min, dtype=float))
+    raan_max = np.atleast_1d(np.asarray(raan_max, dtype=float))
+    radius_km = np.asarray(radius_km, dtype=float)
+    if radius_km.ndim:
+        radius_km = radius_km[:, None, None]
+
+    xyz = cache.unit_rings(inc_min, inc_max, raan_min, raan_max, steps) * (radius_km * 1000)
+
+    # One transform call for every vertex in the batch.
+    lon, lat, alt = transformer.transform(xyz[..., 0].ravel(), xyz[..., 1].ravel(), xyz[..., 2].ravel())
+    dims = xyz.shape[:2]
+    lon = unwrap_lon(lon).reshape(dims)
+    lat = np.clip(np.asarray(lat), -89.9999, 89.9999).reshape(dims)
+    alt = np.asarray(alt).reshape(dims) / 1000
+
+    ring = np.stack([lon, lat, alt], axis=-1)
+    return np.concatenate([ring, ring[:, :1]], axis=1)
+
+
+def _wrap_delta(delta):
+    # Longitude steps folded into [-180, 180): the short way round.
+    return (delta + 180) % 360 - 180
+
+
+def _unwrap(lon):
+    # Continuous longitudes along a ring: add whole turns wherever a step jumps by
+    # more than 180°. Only multiples of 360 are added, so vertices that started out
+    # identical stay bit-identical (a cumulative sum of deltas would drift).
+    step = np.diff(lon, axis=-1)
+    turns = np.cumsum((step < -180).astype(int) - (step > 180).astype(int), axis=-1)
+    pad = np.zeros(turns.shape[:-1] + (1,), dtype=int)
+    return lon + 360.0 * np.concatenate([pad, turns], axis=-1)
+
+
+def _signed_area(lon, lat):
+    # Shoelace area of closed rings (last vertex == first) in lon/lat; > 0 for CCW.
+    return 0.5 * np.sum(lon[..., :-1] * lat[..., 1:] - lon[..., 1:] * lat[..., :-1], axis=-1)
+
+
+def _crossing(p, q, lon):
+    # Vertex where the great circle from p to q meets meridian ``lon`` (all in
+    # unwrapped degrees); altitude is interpolated linearly along the edge.
+    t = (lon - p[0]) / (q[0] - p[0])
+    lon1, lat1, lon2, lat2, lon_x = np.radians([p[0], p[1], q[0], q[1], lon])
+    span = np.sin(lon2 - lon1)
+    if abs(span) < 1e-12:
+        lat = p[1] + t * (q[1] - p[1])
+    else:
+        lat = np.degrees(np.arctan(
+            (np.tan(lat1) * np.sin(lon2 - lon_x) + np.tan(lat2) * np.sin(lon_x - lon1)) / span
+        ))
+    return (lon, lat, p[2] + t * (q[2] - p[2]))
+
+
+def _clip(ring, bound, keep_below):
+    # Sutherland–Hodgman against the meridian lon = bound, for an open vertex list.
+    out = []
+    for i, cur in enumerate(ring):
+        prev = ring[i - 1]
+        cur_in = cur[0] <= bound if keep_below else cur[0] >= bound
+        prev_in = prev[0] <= bound if keep_below else prev[0] >= bound
+        if cur_in:
+            if not prev_in:
+                out.append(_crossing(prev, cur, bound))
+            out.append(tuple(cur))
+        elif prev_in:
+            out.append(_crossing(prev, cur, bound))
+    return out
+
+
+def split_ring(ring):
+    """
+    Split a closed (lon, lat, alt) ring that crosses the antimeridian or winds
+    around a pole into closed rings that each stay within [-180°, 180°].
+
+    Longitudes are unwrapped along the ring, a ring that encircles a pole is
+    closed over that pole, and the result is clipped at every ±180° + k·360°
+    meridian, with each crossing placed on the great circle between its two
+    neighbouring vertices. Pieces are returned counter-clockwise.
+    """
+    pts = np.array(ring[:-1], dtype=float)
+    pts[:, 0] = _unwrap(pts[:, 0])
+    winding = pts[-1, 0] + _wrap_delta(ring[0][0] - pts[-1, 0]) - pts[0, 0]
+
+    if abs(winding) > 180:
+        # The ring goes once around a pole: close it over the pole it encircles.
+        pole = 90.0 if np.mean(pts[:, 1]) > 0 else -90.0
+        raw = np.array(ring[:-1], dtype=float)
+        jumps = np.flatnonzero(np.abs(np.diff(raw[:, 0], append=raw[0, 0])) > 180)
+        if len(jumps) == 1:
+            # Start just after the antimeridian so the seam is the closing edge, and
+            # the cap is one polygon spanning [-180°, 180°].
+            raw = np.roll(raw, -(jumps[0] + 1), axis=0)
+            bound = 180.0 if winding > 0 else -180.0
+            lon_x, lat_x, alt_x = _crossing(raw[-1], raw[0] + [winding, 0, 0], bound)
+            cap = np.vstack([
+                [-bound, lat_x, alt_x], raw, [bound, lat_x, alt_x], [bound, pole, alt_x], [-bound, pole, alt_x],
+            ])
+            if _signed_area(*np.vstack([cap, cap[:1]])[:, :2].T) < 0:
+                cap = cap[::-1]
+            return [np.vstack([cap, cap[:1]])]
+        first = pts[0]
+        pts = np.vstack([
+            pts,
+            [first[0] + winding, first[1], first[2]],
+            [first[0] + winding, pole, first[2]],
+            [first[0], pole, first[2]],
+        ])
+
+    # Counter-clockwise in the unwrapped plane; clipping preserves the winding.
+    closed = np.vstack([pts, pts[:1]])
+    if _signed_area(closed[:, 0], closed[:, 1]) < 0:
+        pts = pts[::-1]
+
+    pieces = []
+    lo, hi = pts[:, 0].min(), pts[:, 0].max()
+    for k in range(int(np.floor((lo + 180) / 360)), int(np.floor((hi + 180) / 360)) + 1):
+        shift = 360.0 * k
+        piece = _clip(_clip(pts, shift - 180, keep_below=False), shift + 180, keep_below=True)
+        if len(piece) >= 3:
+            piece = np.array(piece + piece[:1])
+            piece[:, 0] -= shift
+            if abs(_signed_area(piece[:, 0], piece[:, 1])) > 1e-12:
+                pieces.append(piece)
+    return pieces
+
+
+def rings_to_panels(rings, inc_min, inc_max, raan_min, raan_max, counts=None):
+    """
+    Turn ``panel_vertices`` rings into one MultiPolygon Z per tract, in input order.
+
+    Rings that stay within [-180°, 180°] become single-part panels in one
+    vectorized pass; rings that cross the antimeridian (or wind around a pole) go
+    through ``split_ring``. Every ring comes out counter-clockwise, so no orient
+    pass is needed afterwards. The bin arrays are only used to label
+    failed tracts, which get an empty ``MultiPolygon()``. ``counts`` (a
+    ``Counter``) tallies split rings and failures.
+    """
+    counts = Counter() if counts is None else counts
+    rings = np.array(rings, dtype=float)
+    n = len(rings)
+
+    crosses = (np.abs(np.diff(rings[:, :, 0], axis=1)) > 180).any(axis=1)
+    clockwise = _signed_area(rings[:, :, 0], rings[:, :, 1]) < 0
+    rings[clockwise & ~crosses] = rings[clockwise & ~crosses, ::-1]
+
+    panels = np.empty(n, dtype=object)
+    simple = np.flatnonzero(~crosses)
+    panels[simple] = shapely.multipolygons(shapely.polygons(rings[simple]), indices=np.arange(len(simple)))
+
+    for i in np.flatnonzero(crosses):
+        counts["split_antimeridian"] += 1
+        panels[i] = MultiPolygon([Polygon(piece) for piece in split_ring(rings[i])])
+
+    invalid = np.flatnonzero(~shapely.is_valid(panels) | shapely.is_empty(panels))
+    for i in invalid:
+        counts["split_failed" if crosses[i] else "invalid_ring"] += 1
+        log.warning(
+            "❌ Geometry creation failed for RAAN %s-%s, INC %s-%s: %s",
+            raan_min[i], raan_max[i], inc_min[i], inc_max[i], shapely.is_valid_reason(panels[i]),
+        )
+        panels[i] = MultiPolygon()
+    return list(panels)
+
+
+def build_shell_panels(radius_km, inc_min, inc_max, raan_min, raan_max, steps=DEFAULT_STEPS, transformer=None,
+                       counts=None):
+    """
+    Build the panels for every tract on one altitude shell.
+
+    Returns a list with one MultiPolygon Z per input tract, in input order.
+    Failed tracts get an empty ``MultiPolygon()``.
+    """
+    n = len(np.atleast_1d(inc_min))
+    if steps < 3:
+        log.warning("❌ Too few valid vertices for panels with %s steps", steps)
+        return [MultiPolygon() for _ in range(n)]
+
+    rings = panel_vertices(radius_km, inc_min, inc_max, raan_min, raan_max, steps, transformer)
+    return rings_to_panels(
+        rings, np.atleast_1d(inc_min), np.atleast_1d(inc_max), np.atleast_1d(raan_min), np.atleast_1d(raan_max),
+        counts,
+    )
+
+
+def generate_panel_geometry(radius_km, inc_min, inc_max, raan_min, raan_max, steps=DEFAULT_STEPS, transformer=None):
+    """Single-tract convenience wrapper around ``build_shell_panels``."""
+    return build_shell_panels(
+        radius_km, [inc_min], [inc_max], [raan_min], [raan_max], steps, transformer
+    )[0]
+
+
+def validate_panel(tract_id, panel, counts=None):
+    """
+    Check a generated panel before it is stored.
+
+    ``rings_to_panels`` already emits valid, counter-clockwise MultiPolygons, so
+    this only rejects empty or non-polygonal geometry and anything invalid.
+    Returns the panel, or ``None`` (after logging why) for panels the generators
+    skip. ``counts`` (a ``Counter``) tallies the reasons: ``empty`` and ``invalid``.
+    """
+    counts = Counter() if counts is None else counts
+    if not isinstance(panel, (Polygon, MultiPolygon)) or panel.is_empty:
+        counts["empty"] += 1
+        log.warning("⚠️ Skipping malformed or empty geometry for tract %s", tract_id)
+        return None
+
+    if not panel.is_valid:
+        counts["invalid"] += 1
+        log.warning("⚠️ Invalid panel for tract %s: %s", tract_id, shapely.is_valid_reason(panel))
+        # Full coordinate dumps only when debugging (-v); they swamp the log otherwise.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("  Panel: %s", panel.wkt)
+        return None
+
+    if isinstance(panel, Polygon):
+        panel = MultiPolygon([panel])
+    return panel
+
+
+def panel_to_wkt(tract_id, panel, counts=None):
+    """``validate_panel``, then 3D WKT; ``None`` for skipped panels."""
+    panel = validate_panel(tract_id, panel, counts)
+    if panel is None:
+        return None
+    return dumps(panel, output_dimension=3)
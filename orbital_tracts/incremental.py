@@ -0,0 +1,59 @@
+# === ♻️ Incremental Tract Regeneration ===
+# Each tract carries a content hash of the inputs its panel is built from. A run in
+# incremental mode compares the hashes of the freshly binned tracts with what is
+# stored, and only rewrites tracts and panels whose hash changed. The tables are
+# updated in place (upsert + targeted delete), so they stay online throughout.
+
+import hashlib
+
+from sqlalchemy import text
+
+from orbital_tracts.geometry import DEFAULT_STEPS, GEOMETRY_VERSION, shell_radius_km
+
+
+def tract_hash(alt_min, alt_max, inc_min, inc_max, az_min, az_max, theta_start_idx, theta_end_idx,
+               steps=DEFAULT_STEPS, geodetic="pyproj"):
+    """
+    Stable hex digest of everything that determines a tract's metadata and panel,
+    including the ``geodetic`` conversion mode (see geometry.get_transformer).
+    """
+    radius_km = shell_radius_km(alt_min, alt_max)
+    parts = (
+        GEOMETRY_VERSION, alt_min, alt_max, inc_min, inc_max, az_min, az_max,
+        theta_start_idx, theta_end_idx, steps, radius_km,
+    )
+    key = "|".join([repr(float(p)) for p in parts] + [geodetic])
+    return hashlib.sha1(key.encode("ascii")).hexdigest()[:16]
+
+
+def ensure_hash_columns(engine, geometry_table):
+    """Add the content_hash columns to tables created before incremental mode existed."""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE dev.tracts ADD COLUMN IF NOT EXISTS content_hash text"))
+        conn.execute(text(f"ALTER TABLE {geometry_table} ADD COLUMN IF NOT EXISTS content_hash text"))
+
+
+def existing_hashes(engine, zone):
+    """Return ``{tract_id: (content_hash, tract_key)}`` for the tracts currently stored for ``zone``."""
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("SELECT tract_id, content_hash, tract_key FROM dev.tracts WHERE orbit_zone = :zone"),
+            {"zone": zone},
+        )
+        return {tract_id: (content_hash, tract_key) for tract_id, content_hash, tract_key in result}
+
+
+def diff_tracts(existing, rows):
+    """
+    Split freshly binned tract rows against the stored hashes.
+
+    ``rows`` are tuples in ``loader.TRACT_COLUMNS`` order (tract_id first,
+    tract_key and content_hash last). Returns ``(changed_rows, removed_ids)``:
+    rows that are new or whose hash or key differs (a tract keeps its hash but
+    gets a new key when its zone code changes), and stored tract IDs that no
+    longer exist in the bins.
+    """
+    changed = [row for row in rows if existing.get(row[0]) != (row[-1], row[-2])]
+    current_ids = {row[0] for row in rows}
+    removed = sorted(set(existing) - current_ids)
+    return changed, removed
@@ -0,0 +1,127 @@
+# === 🔎 In-process Tract Lookup ===
+# The tract grid is a regular product of altitude × inclination × RAAN bins, so an
+# object's tract is three binary searches over bin edges, not a polygon containment
+# test. TractIndex does that bucketing for whole NumPy arrays at once, straight from
+# the bin definitions in orbital_tracts.zones, without touching PostGIS.
+
+import numpy as np
+
+from orbital_tracts.geometry import EARTH_RADIUS_KM
+from orbital_tracts.keys import zone_keys
+from orbital_tracts.zones import ZONES, format_tract_id
+
+
+class TractIndex:
+    """
+    Vectorized (alt, inc, RAAN) → tract bucketizer for one orbit zone.
+
+    Tracts are numbered ``(alt_bin * n_inc + inc_bin) * n_raan + raan_bin``, in the
+    same order the generator scripts create them (and their packed ``keys``
+    sort). ``-1`` marks an input outside the zone's bins.
+    """
+
+    def __init__(self, zone):
+        self.zone = ZONES[zone] if isinstance(zone, str) else zone
+        spec = self.zone
+
+        self.alt_lo, self.alt_hi = (np.array(b, dtype=float) for b in zip(*spec.alt_bins))
+        self.inc_lo, self.inc_hi = (np.array(b, dtype=float) for b in zip(*spec.inc_bins))
+        self.raan_lo, self.raan_hi = (np.array(b, dtype=float) for b in zip(*spec.raan_bins))
+        self.shape = (len(self.alt_lo), len(self.inc_lo), len(self.raan_lo))
+
+        # Per-tract lookup tables, indexed by flat tract number.
+        a, i, r = np.meshgrid(
+            np.arange(self.shape[0]), np.arange(self.shape[1]), np.arange(self.shape[2]), indexing="ij"
+        )
+        self._alt_idx, self._inc_idx, self._raan_idx = a.ravel(), i.ravel(), r.ravel()
+        self.theta_start_idx = (self.raan_lo[self._raan_idx] // spec.segment_span).astype(np.int32)
+        self.theta_end_idx = (self.raan_hi[self._raan_idx] // spec.segment_span).astype(np.int32)
+        self.ids = np.array([
+            format_tract_id(spec.name, spec.alt_bins[ai][0], spec.inc_bins[ii][0], *spec.raan_bins[ri])
+            for ai, ii, ri in zip(self._alt_idx, self._inc_idx, self._raan_idx)
+        ], dtype=object)
+        self.keys = zone_keys(spec)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _bucket(values, lo, hi, closed_top=False):
+        # Bins are half-open [lo, hi). A zero-width bin (e.g. the 35786 km GEO belt)
+        # matches its exact value only. With closed_top the last bin includes its max.
+        idx = np.searchsorted(lo, values, side="right") - 1
+        safe = np.clip(idx, 0, len(lo) - 1)
+        inside = (idx >= 0) & (
+            (values < hi[safe]) | ((lo[safe] == hi[safe]) & (values == lo[safe]))
+        )
+        if closed_top:
+            inside |= (idx == len(lo) - 1) & (values == hi[-1])
+        return np.where(inside, safe, -1)
+
+    def bin_indices(self, alt_km, inc_deg, raan_deg):
+        """Per-dimension bin indices ``(alt_bin, inc_bin, raan_bin)``, each ``-1`` when out of range."""
+        alt = np.asarray(alt_km, dtype=float)
+        inc = np.asarray(inc_deg, dtype=float)
+        raan = np.mod(np.asarray(raan_deg, dtype=float), 360.0)
+        # When two altitude bins share an edge (…, 35786) and (35786, 35786), a value
+        # equal to that edge resolves to the later, zero-width bin.
+        return (
+            self._bucket(alt, self.alt_lo, self.alt_hi),
+            self._bucket(inc, self.inc_lo, self.inc_hi, closed_top=True),
+            self._bucket(raan, self.raan_lo, self.raan_hi, closed_top=True),
+        )
+
+    def lookup(self, alt_km, inc_deg, raan_deg):
+        """
+        Flat tract numbers for arrays of altitude (km), inclination and RAAN (deg).
+
+        Returns ``(tract_idx, segment_idx)``. ``segment_idx`` is the object's arc
+        segment, on the same scale as ``theta_start_idx``.
+        """
+        ai, ii, ri = self.bin_indices(alt_km, inc_deg, raan_deg)
+        _, n_inc, n_raan = self.shape
+        valid = (ai >= 0) & (ii >= 0) & (ri >= 0)
+        flat = np.where(valid, (ai * n_inc + ii) * n_raan + ri, -1)
+        raan = np.mod(np.asarray(raan_deg, dtype=float), 360.0)
+        segment = (raan // self.zone.segment_span).astype(np.int32) % self.zone.n_segments
+        return flat, segment
+
+    def tract_ids(self, tract_idx):
+        """Map flat tract numbers to text tract IDs (``None`` for ``-1``)."""
+        tract_idx = np.asarray(tract_idx)
+        out = np.full(tract_idx.shape, None, dtype=object)
+        valid = tract_idx >= 0
+        out[valid] = self.ids[tract_idx[valid]]
+        return out
+
+    def tract_keys(self, tract_idx):
+        """Map flat tract numbers to packed tract keys (``-1`` for ``-1``)."""
+        tract_idx = np.asarray(tract_idx)
+        return np.where(tract_idx >= 0, self.keys[np.maximum(tract_idx, 0)], -1)
+
+    def lookup_state_vectors(self, r_km, v_km_s):
+        """
+        Tract numbers for ``(n, 3)`` arrays of inertial position (km) and velocity
+        (km/s). Returns ``(tract_idx, segment_idx)`` like :meth:`lookup`.
+        """
+        alt, inc, raan = orbital_elements(r_km, v_km_s)
+        return self.lookup(alt, inc, raan)
+
+
+def orbital_elements(r_km, v_km_s):
+    """
+    Altitude above the mean Earth radius (km), inclination and RAAN (deg) for
+    ``(n, 3)`` arrays of inertial position and velocity. Equatorial orbits, whose
+    node is undefined, get a RAAN of 0.
+    """
+    r = np.atleast_2d(np.asarray(r_km, dtype=float))
+    v = np.atleast_2d(np.asarray(v_km_s, dtype=float))
+    h = np.cross(r, v)
+    h_norm = np.linalg.norm(h, axis=1)
+    alt = np.linalg.norm(r, axis=1) - EARTH_RADIUS_KM
+    with np.errstate(invalid="ignore", divide="ignore"):
+        inc = np.degrees(np.arccos(np.clip(h[:, 2] / h_norm, -1.0, 1.0)))
+    # Node vector n = ẑ × h = (-h_y, h_x, 0)
+    raan = np.mod(np.degrees(np.arctan2(h[:, 0], -h[:, 1])), 360.0)
+    raan = np.where(np.hypot(h[:, 0], h[:, 1]) < 1e-12 * np.maximum(h_norm, 1.0), 0.0, raan)
+    return alt, inc, raan
@@ -0,0 +1,263 @@
+# === 🛰️ TLE / OMM Ingestion and Tract Occupancy ===
+# Reads element sets in bulk from local files, propagates them with SGP4's array API
+# over a regular time grid, bins every (object, epoch) position into LEO/MEO tracts
+# with TractIndex, and COPYs per-(tract, epoch) object counts into
+# dev.tract_occupancy. Zones with finer resolution levels are binned at the finest
+# level only; the coarser levels' counts are rolled up from it.
+
+import glob
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from orbital_tracts.index import TractIndex, orbital_elements
+from orbital_tracts.levels import finest, rollup_levels
+from orbital_tracts.loader import DEFAULT_BATCH_SIZE, copy_rows
+from orbital_tracts.zones import ZONES
+
+# Satellites propagated per SGP4 array call; bounds the (sats × epochs × 3) buffers.
+DEFAULT_SAT_CHUNK = 2000
+
+OCCUPANCY_COLUMNS = ("tract_id", "tract_key", "orbit_zone", "epoch", "object_count")
+
+OCCUPANCY_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS dev.tract_occupancy
+    (
+        tract_id text NOT NULL,
+        tract_key bigint,
+        orbit_zone text NOT NULL,
+        epoch timestamp with time zone NOT NULL,
+        object_count integer NOT NULL,
+        created_at timestamp with time zone DEFAULT now(),
+        CONSTRAINT tract_occupancy_pkey PRIMARY KEY (tract_id, epoch)
+    )
+    """,
+    # Tables created before packed keys existed.
+    "ALTER TABLE dev.tract_occupancy ADD COLUMN IF NOT EXISTS tract_key bigint",
+    """
+    CREATE INDEX IF NOT EXISTS idx_tract_occupancy_key
+        ON dev.tract_occupancy (tract_key, epoch)
+    """,
+)
+
+
+# === Element set readers ===
+
+def _read_tle(path):
+    # Two- or three-line element sets; a line before "1 ..." is taken as the name.
+    from sgp4.api import Satrec
+
+    sats = []
+    with open(path, encoding="utf-8") as f:
+        lines = [line.rstrip() for line in f if line.strip()]
+    name = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("1 ") and i + 1 < len(lines) and lines[i + 1].startswith("2 "):
+            sat = Satrec.twoline2rv(line, lines[i + 1])
+            sats.append((str(sat.satnum), name or str(sat.satnum), sat))
+            name = None
+            i += 2
+        else:
+            name = line[2:].strip() if line.startswith("0 ") else line.strip()
+            i += 1
+    return sats
+
+
+def _read_omm(path):
+    # CCSDS OMM as CSV, XML or JSON (the CelesTrak GP formats).
+    from sgp4 import omm
+    from sgp4.api import Satrec
+
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8") as f:
+        if ext == ".csv":
+            records = list(omm.parse_csv(f))
+        elif ext == ".xml":
+            records = list(omm.parse_xml(f))
+        else:
+            records = json.load(f)
+            if isinstance(records, dict):
+                records = [records]
+
+    sats = []
+    for fields in records:
+        sat = Satrec()
+        omm.initialize(sat, fields)
+        sats.append((str(fields["NORAD_CAT_ID"]), fields.get("OBJECT_NAME") or str(fields["NORAD_CAT_ID"]), sat))
+    return sats
+
+
+READERS = {
+    ".tle": _read_tle, ".txt": _read_tle, ".3le": _read_tle,
+    ".csv": _read_omm, ".xml": _read_omm, ".json": _read_omm,
+}
+
+
+def load_elements(paths):
+    """
+    Read every element set from files, directories or glob patterns.
+
+    Returns a list of ``(satellite_id, name, Satrec)``. Later files win when the
+    same catalog number appears twice.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if os.path.splitext(name)[1].lower() in READERS
+            ))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+
+    by_id = {}
+    for path in files:
+        reader = READERS.get(os.path.splitext(path)[1].lower())
+        if reader is None:
+            print(f"⚠️ Skipping {path}: unknown element set format")
+            continue
+        for sat_id, name, sat in reader(path):
+            by_id[sat_id] = (sat_id, name, sat)
+    return list(by_id.values())
+
+
+# === Propagation and binning ===
+
+def _step_seconds(step_minutes):
+    if not step_minutes > 0:
+        raise ValueError(f"Time grid step must be a positive number of minutes, got {step_minutes!r}")
+    return step_minutes * 60
+
+
+def grid_start(start, step_minutes):
+    """
+    First epoch of a time grid: ``start`` (ISO 8601, UTC unless it says
+    otherwise), or when it is empty the current UTC time floored to a multiple
+    of ``step_minutes`` since the Unix epoch. Raises ValueError for a step
+    that is not positive.
+    """
+    step = _step_seconds(step_minutes)
+    if start:
+        start = datetime.fromisoformat(start)
+        return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc).timestamp()
+    return datetime.fromtimestamp(now - now % step, timezone.utc)
+
+
+def time_grid(start, end, step_minutes):
+    """UTC datetimes from ``start`` to ``end`` inclusive, every ``step_minutes``."""
+    _step_seconds(step_minutes)
+    epochs = []
+    t = start
+    while t <= end:
+        epochs.append(t)
+        t += timedelta(minutes=step_minutes)
+    return epochs
+
+
+def _julian_dates(epochs):
+    from sgp4.api import jday
+
+    parts = [
+        jday(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
+        for t in epochs
+    ]
+    jd, fr = zip(*parts)
+    return np.array(jd), np.array(fr)
+
+
+def state_vectors(sats, epochs, sat_chunk=DEFAULT_SAT_CHUNK):
+    """
+    Propagate ``sats`` over ``epochs`` → ``(r, v)``: ``(n_sats, n_epochs, 3)``
+    TEME positions (km) and velocities (km/s). States SGP4 flags as errors are NaN.
+    """
+    from sgp4.api import SatrecArray
+
+    jd, fr = _julian_dates(epochs)
+    r = np.full((len(sats), len(epochs), 3), np.nan)
+    v = np.full((len(sats), len(epochs), 3), np.nan)
+    for start in range(0, len(sats), sat_chunk):
+        chunk = SatrecArray([sat for _, _, sat in sats[start:start + sat_chunk]])
+        err, r_chunk, v_chunk = chunk.sgp4(jd, fr)
+        ok = err == 0
+        r[start:start + len(err)][ok] = r_chunk[ok]
+        v[start:start + len(err)][ok] = v_chunk[ok]
+    return r, v
+
+
+def occupancy_counts(sats, epochs, zones=None, sat_chunk=DEFAULT_SAT_CHUNK, config=None):
+    """
+    Propagate ``sats`` over ``epochs`` and count objects per tract and epoch.
+
+    ``zones`` are names or ZoneSpecs (default: every level-0 zone of ``config``,
+    a ``load_zones`` mapping that defaults to ZONES). Returns ``{zone: (index,
+    counts)}`` for each zone and each of its finer levels, where ``counts`` is an
+    ``(n_epochs, n_tracts)`` int32 array indexed like ``index``. Positions SGP4
+    flags as errors (decayed, diverged) are dropped.
+    """
+    from sgp4.api import SatrecArray
+
+    config = ZONES if config is None else config
+    specs = [config[z] if isinstance(z, str) else z
+             for z in (zones or [spec for spec in config.values() if spec.level == 0])]
+    jd, fr = _julian_dates(epochs)
+    n_epochs = len(epochs)
+    indexes = {spec.name: TractIndex(finest(spec, config)) for spec in specs}
+    counts = {zone: np.zeros((n_epochs, len(idx)), dtype=np.int32) for zone, idx in indexes.items()}
+
+    for start in range(0, len(sats), sat_chunk):
+        chunk = SatrecArray([sat for _, _, sat in sats[start:start + sat_chunk]])
+        err, r, v = chunk.sgp4(jd, fr)
+        ok = (err == 0).ravel()
+        epoch_idx = np.broadcast_to(np.arange(n_epochs), err.shape).ravel()[ok]
+        alt, inc, raan = orbital_elements(r.reshape(-1, 3)[ok], v.reshape(-1, 3)[ok])
+
+        unassigned = np.ones(len(alt), dtype=bool)
+        for zone, idx in indexes.items():
+            tract_idx, _ = idx.lookup(alt[unassigned], inc[unassigned], raan[unassigned])
+            hit = tract_idx >= 0
+            key = epoch_idx[unassigned][hit] * len(idx) + tract_idx[hit]
+            flat = counts[zone].reshape(-1)
+            np.add(flat, np.bincount(key, minlength=flat.size), out=flat, casting="unsafe")
+            unassigned[np.flatnonzero(unassigned)[hit]] = False
+
+    result = {}
+    for zone in indexes:
+        fine = indexes[zone].zone
+        for name, level_counts in reversed(rollup_levels(counts[zone], fine, config, top=zone).items()):
+            result[name] = (indexes[zone] if name == fine.name else TractIndex(config[name]), level_counts)
+    return result
+
+
+def occupancy_rows(zone_counts, epochs):
+    """Yield ``OCCUPANCY_COLUMNS`` rows for every non-empty (tract, epoch)."""
+    for zone, (index, counts) in zone_counts.items():
+        epoch_idx, tract_idx = np.nonzero(counts)
+        for e, t in zip(epoch_idx, tract_idx):
+            yield index.ids[t], int(index.keys[t]), zone, epochs[e].isoformat(), int(counts[e, t])
+
+
+def write_occupancy(engine, rows, start, end, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Replace ``dev.tract_occupancy`` rows between ``start`` and ``end`` (inclusive)
+    with ``rows`` in one transaction, loading via COPY. Returns the row count.
+    """
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        for statement in OCCUPANCY_DDL:
+            cur.execute(statement)
+        cur.execute("DELETE FROM dev.tract_occupancy WHERE epoch BETWEEN %s AND %s", (start, end))
+        count = copy_rows(cur, "dev.tract_occupancy", OCCUPANCY_COLUMNS, rows, batch_size)
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,179 @@
+# === 🔑 Packed Integer Tract Keys ===
+# Every tract also has an integer key that packs its zone and bin lower bounds into
+# one positive bigint:
+#
+#   bits 59–62  resolution level (ZoneSpec.level: 0 for a configured zone, k for
+#               its k-th finer level, see orbital_tracts.levels)
+#   bits 51–58  zone code (ZoneSpec.zone_code, set per zone in zones.toml)
+#   bits 31–50  altitude bin minimum, in units of 0.1 km
+#   bits 16–30  inclination bin minimum, in centi-degrees
+#   bits  0–15  RAAN bin minimum, in centi-degrees
+#
+# dev.tracts, the geometry tables and the occupancy / density tables carry it as an
+# indexed tract_key column, so joins and GROUP BYs compare 8-byte integers rather
+# than text IDs like LEO-A1950-I175-RAAN355_360. Like the text IDs, keys depend only
+# on a tract's own bins, not on their positions: adding or removing bins elsewhere in
+# the zone leaves every other stored key valid. Within a zone, keys sort by bin
+# minimums (the generator's order for ascending bins). In memory, bin bounds come back
+# from a key by shifting and a sorted lookup instead of parsing strings.
+
+import numpy as np
+
+from orbital_tracts.zones import ZONES
+
+# Version of the layout above; stored keys from another version are re-derived.
+KEY_FORMAT = 2
+
+LEVEL_BITS = 4
+ZONE_BITS = 8
+ALT_BITS = 20
+INC_BITS = 15
+RAAN_BITS = 16
+MAX_LEVEL = (1 << LEVEL_BITS) - 1
+MAX_ZONE_CODE = (1 << ZONE_BITS) - 1
+
+# Quantum of each bin minimum (km, degrees, degrees)
+ALT_UNIT = 0.1
+INC_UNIT = 0.01
+RAAN_UNIT = 0.01
+
+_INC_SHIFT = RAAN_BITS
+_ALT_SHIFT = _INC_SHIFT + INC_BITS
+_ZONE_SHIFT = _ALT_SHIFT + ALT_BITS
+_LEVEL_SHIFT = _ZONE_SHIFT + ZONE_BITS
+
+# (name, unit, bits, ZoneSpec bins attribute) per dimension, in key order
+_DIMS = (
+    ("altitude", ALT_UNIT, ALT_BITS, "alt_bins"),
+    ("inclination", INC_UNIT, INC_BITS, "inc_bins"),
+    ("RAAN", RAAN_UNIT, RAAN_BITS, "raan_bins"),
+)
+
+
+def _quantize(values, name, unit, bits):
+    steps = np.round(np.asarray(values, dtype=float) / unit).astype(np.int64)
+    if steps.size and (steps.min() < 0 or steps.max() >= 1 << bits):
+        raise ValueError(f"{name} bin minimums must be in 0..{((1 << bits) - 1) * unit:g}")
+    return steps
+
+
+def encode_keys(zone_code, alt_min, inc_min, raan_min, level=0):
+    """
+    Pack zone codes, bin minimums (km, degrees, degrees) and resolution levels
+    (scalars or broadcastable arrays) into int64 tract keys.
+    """
+    zone_code, level = (np.asarray(v, dtype=np.int64) for v in (zone_code, level))
+    if zone_code.size and (zone_code.min() < 0 or zone_code.max() > MAX_ZONE_CODE):
+        raise ValueError(f"Zone codes must be in 0..{MAX_ZONE_CODE}")
+    if level.size and (level.min() < 0 or level.max() > MAX_LEVEL):
+        raise ValueError(f"Levels must be in 0..{MAX_LEVEL}")
+    alt, inc, raan = (
+        _quantize(values, name, unit, bits)
+        for values, (name, unit, bits, _) in zip((alt_min, inc_min, raan_min), _DIMS)
+    )
+    zone_code, level, alt, inc, raan = np.broadcast_arrays(zone_code, level, alt, inc, raan)
+    return (level << _LEVEL_SHIFT) | (zone_code << _ZONE_SHIFT) | (alt << _ALT_SHIFT) | (inc << _INC_SHIFT) | raan
+
+
+def _decode_steps(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    return (
+        (keys >> _ALT_SHIFT) & ((1 << ALT_BITS) - 1),
+        (keys >> _INC_SHIFT) & ((1 << INC_BITS) - 1),
+        keys & ((1 << RAAN_BITS) - 1),
+    )
+
+
+def decode_keys(keys):
+    """Unpack tract keys → ``(zone_code, alt_min, inc_min, raan_min)`` (int64 codes, float bin minimums)."""
+    zone_code = (np.asarray(keys, dtype=np.int64) >> _ZONE_SHIFT) & MAX_ZONE_CODE
+    return (zone_code, *(steps * unit for steps, (_, unit, _, _) in zip(_decode_steps(keys), _DIMS)))
+
+
+def key_levels(keys):
+    """Resolution level of each tract key."""
+    return (np.asarray(keys, dtype=np.int64) >> _LEVEL_SHIFT) & MAX_LEVEL
+
+
+def _bin_steps(spec):
+    # Quantized bin minimums of each dimension; distinct, or two tracts would share a key.
+    steps = []
+    for name, unit, bits, attr in _DIMS:
+        dim = _quantize([lo for lo, _ in getattr(spec, attr)], name, unit, bits)
+        if len(np.unique(dim)) != len(dim):
+            raise ValueError(f"{spec.name} {name} bin minimums must be distinct to {unit:g} to key its tracts")
+        steps.append(dim)
+    return steps
+
+
+def bin_keys(spec, alt_bin, inc_bin, raan_bin):
+    """Keys of ``spec`` tracts from their altitude, inclination and RAAN bin indices."""
+    alt, inc, raan = (
+        steps[np.asarray(idx, dtype=np.int64)] for steps, idx in zip(_bin_steps(spec), (alt_bin, inc_bin, raan_bin))
+    )
+    alt, inc, raan = np.broadcast_arrays(alt, inc, raan)
+    return (
+        (np.int64(spec.level) << _LEVEL_SHIFT) | (np.int64(spec.zone_code) << _ZONE_SHIFT)
+        | (alt << _ALT_SHIFT) | (inc << _INC_SHIFT) | raan
+    )
+
+
+def bin_indices(keys, spec):
+    """
+    Positions of the keys' bin minimums among ``spec``'s bins →
+    ``(alt_bin, inc_bin, raan_bin)`` int64 arrays, ``-1`` where a minimum is not
+    one of the zone's bins. Zone codes and levels are not checked.
+    """
+    out = []
+    for steps, table in zip(_decode_steps(keys), _bin_steps(spec)):
+        order = np.argsort(table, kind="stable")
+        pos = np.minimum(np.searchsorted(table, steps, sorter=order), len(table) - 1)
+        out.append(np.where(table[order[pos]] == steps, order[pos], -1))
+    return tuple(out)
+
+
+def zone_keys(spec):
+    """Keys of every tract of ``spec`` in generation (TractIndex flat) order."""
+    shape = (len(spec.alt_bins), len(spec.inc_bins), len(spec.raan_bins))
+    return bin_keys(spec, *np.unravel_index(np.arange(spec.tract_count), shape))
+
+
+def key_map(zones=None):
+    """``{tract_id: key}`` for every tract of ``zones`` (default: every configured zone)."""
+    mapping = {}
+    for spec in (ZONES.values() if zones is None else zones):
+        ids = (row[0] for row in spec.iter_bins())
+        mapping.update(zip(ids, zone_keys(spec).tolist()))
+    return mapping
+
+
+def key_bounds(keys, zones=None):
+    """
+    Bin bounds of tract keys, decoded without touching the text IDs.
+
+    Returns a dict of arrays shaped like ``keys``: ``orbit_zone`` (``None`` for an
+    unknown zone code) and ``alt_min`` … ``az_max`` (NaN where the zone or a bin
+    is unknown).
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    zone_code = decode_keys(keys)[0]
+    level = key_levels(keys)
+    out = {"orbit_zone": np.full(keys.shape, None, dtype=object)}
+    for name in ("alt_min", "alt_max", "inc_min", "inc_max", "az_min", "az_max"):
+        out[name] = np.full(keys.shape, np.nan)
+
+    for spec in (ZONES.values() if zones is None else zones):
+        alt_bin, inc_bin, raan_bin = bin_indices(keys, spec)
+        dims = (
+            (("alt_min", "alt_max"), np.array(spec.alt_bins, dtype=float), alt_bin),
+            (("inc_min", "inc_max"), np.array(spec.inc_bins, dtype=float), inc_bin),
+            (("az_min", "az_max"), np.array(spec.raan_bins, dtype=float), raan_bin),
+        )
+        in_zone = (zone_code == spec.zone_code) & (level == spec.level)
+        for _, _, idx in dims:
+            in_zone &= idx >= 0
+        for (lo, hi), table, idx in dims:
+            out[lo][in_zone] = table[idx[in_zone], 0]
+            out[hi][in_zone] = table[idx[in_zone], 1]
+        out["orbit_zone"][in_zone] = spec.name
+    return out
@@ -0,0 +1,157 @@
+# === 🪜 Multi-resolution Tract Levels ===
+# A zone in zones.toml can list finer resolution levels:
+#
+#   [zones.LEO]
+#   levels = [{ raan = 5 }]        # LEO_L1: 50 km × 5° × 1°
+#
+# Level k splits every bin of level k - 1 into equal parts (ZoneSpec.split), so
+# the grids nest exactly: a tract is the union of its children one level down.
+# Both directions are bin index arithmetic, from a packed key (whose bin minimums
+# locate its bins in the level's spec) or straight from a text ID; dev.tracts also stores each tract's parent_key,
+# so a dashboard can drill down from a coarse tract with one indexed join.
+#
+# Every level is a ZoneSpec of its own (<zone>_L<k>, with its own panel table), so
+# generation, export, the catalog, the service and adjacency treat it like any
+# other zone. Occupancy is binned once at the finest level and rolled up: a
+# level's flat tract axis reshapes into (alt, split, inc, split, raan, split)
+# blocks, so each coarser level is one reshape and sum of the level below.
+
+import re
+
+import numpy as np
+
+from orbital_tracts.keys import bin_indices, bin_keys, encode_keys
+from orbital_tracts.zones import ZONES, format_tract_id
+
+_TRACT_ID = re.compile(r"^(?P<zone>[^-]+)-A(?P<alt>[^-]+)-I(?P<inc>[^-]+)-RAAN(?P<raan>.+)$")
+
+
+def _zones(zones):
+    return ZONES if zones is None else zones
+
+
+def child_level(spec, zones=None):
+    """The next finer level of ``spec``, or ``None``."""
+    return next((z for z in _zones(zones).values() if z.parent == spec.name), None)
+
+
+def levels(zone, zones=None):
+    """``zone`` (a name or ZoneSpec) and its finer levels, coarsest first."""
+    zones = _zones(zones)
+    chain = [zones[zone] if isinstance(zone, str) else zone]
+    while (child := child_level(chain[-1], zones)) is not None:
+        chain.append(child)
+    return chain
+
+
+def finest(zone, zones=None):
+    """The finest level of ``zone``."""
+    return levels(zone, zones)[-1]
+
+
+# === Parents and children ===
+
+def _key_bins(keys, spec):
+    alt_bin, inc_bin, raan_bin = bin_indices(keys, spec)
+    if min(alt_bin.min(initial=0), inc_bin.min(initial=0), raan_bin.min(initial=0)) < 0:
+        raise ValueError(f"Tract keys do not match the {spec.name} bins")
+    return alt_bin, inc_bin, raan_bin
+
+
+def parent_keys(keys, spec):
+    """Keys of the ``spec.parent`` tracts that contain the ``spec`` tracts ``keys``."""
+    if spec.parent is None:
+        raise ValueError(f"{spec.name} has no coarser level")
+    alt_bin, inc_bin, raan_bin = _key_bins(keys, spec)
+    sa, si, sr = spec.split
+    # A parent bin starts where the first of its split children does.
+    return encode_keys(
+        spec.zone_code,
+        np.array(spec.alt_bins, dtype=float)[alt_bin // sa * sa, 0],
+        np.array(spec.inc_bins, dtype=float)[inc_bin // si * si, 0],
+        np.array(spec.raan_bins, dtype=float)[raan_bin // sr * sr, 0],
+        spec.level - 1,
+    )
+
+
+def child_keys(keys, child):
+    """
+    Keys of the ``child``-level tracts inside each ``child.parent`` tract of
+    ``keys``: an array shaped ``keys.shape + (n_children,)``, in TractIndex order.
+    """
+    # A parent key's bin minimums are those of its first child.
+    alt_bin, inc_bin, raan_bin = (x[..., None] for x in _key_bins(keys, child))
+    sa, si, sr = child.split
+    da, di, dr = (x.ravel() for x in np.meshgrid(np.arange(sa), np.arange(si), np.arange(sr), indexing="ij"))
+    return bin_keys(child, alt_bin + da, inc_bin + di, raan_bin + dr)
+
+
+def parse_tract_id(tract_id, zones=None):
+    """``(spec, alt_bin, inc_bin, raan_bin)`` of a text tract ID such as ``LEO-A550-I50-RAAN0_5``."""
+    match = _TRACT_ID.match(tract_id)
+    if match is None or match["zone"] not in _zones(zones):
+        raise ValueError(f"Not a tract ID of a configured zone: {tract_id!r}")
+    spec = _zones(zones)[match["zone"]]
+    try:
+        return (
+            spec,
+            [str(lo) for lo, _ in spec.alt_bins].index(match["alt"]),
+            [str(lo) for lo, _ in spec.inc_bins].index(match["inc"]),
+            [f"{lo}_{hi}" for lo, hi in spec.raan_bins].index(match["raan"]),
+        )
+    except ValueError:
+        raise ValueError(f"{tract_id!r} does not match the {spec.name} bins") from None
+
+
+def _tract_id(spec, alt_bin, inc_bin, raan_bin):
+    return format_tract_id(spec.name, spec.alt_bins[alt_bin][0], spec.inc_bins[inc_bin][0], *spec.raan_bins[raan_bin])
+
+
+def child_ids(tract_id, zones=None):
+    """Text IDs of the next-level tracts inside ``tract_id`` (empty at the finest level)."""
+    spec, alt_bin, inc_bin, raan_bin = parse_tract_id(tract_id, zones)
+    child = child_level(spec, zones)
+    if child is None:
+        return []
+    sa, si, sr = child.split
+    return [
+        _tract_id(child, alt_bin * sa + da, inc_bin * si + di, raan_bin * sr + dr)
+        for da in range(sa) for di in range(si) for dr in range(sr)
+    ]
+
+
+def parent_id(tract_id, zones=None):
+    """Text ID of the coarser tract containing ``tract_id``, or ``None`` at level 0."""
+    spec, alt_bin, inc_bin, raan_bin = parse_tract_id(tract_id, zones)
+    if spec.parent is None:
+        return None
+    sa, si, sr = spec.split
+    return _tract_id(_zones(zones)[spec.parent], alt_bin // sa, inc_bin // si, raan_bin // sr)
+
+
+# === Rollup ===
+
+def rollup(values, spec):
+    """
+    Sum per-tract ``values`` of ``spec`` (tracts on the last axis, in TractIndex
+    order, e.g. ``(n_epochs, n_tracts)`` counts) into its parent level's tracts.
+    """
+    values = np.asarray(values)
+    sa, si, sr = spec.split
+    n_alt, n_inc, n_raan = len(spec.alt_bins) // sa, len(spec.inc_bins) // si, len(spec.raan_bins) // sr
+    blocks = values.reshape(values.shape[:-1] + (n_alt, sa, n_inc, si, n_raan, sr))
+    return blocks.sum(axis=(-5, -3, -1), dtype=values.dtype).reshape(values.shape[:-1] + (-1,))
+
+
+def rollup_levels(values, spec, zones=None, top=None):
+    """
+    ``{level name: values}`` for ``spec`` and each coarser level up to ``top``
+    (default: level 0), every level summed from the one below it.
+    """
+    zones = _zones(zones)
+    out = {spec.name: values}
+    while spec.parent is not None and spec.name != top:
+        values = rollup(values, spec)
+        spec = zones[spec.parent]
+        out[spec.name] = values
+    return out
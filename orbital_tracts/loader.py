@@ -0,0 +1,290 @@
+# === 🚚 COPY-based Bulk Loader ===
+# Streams tract metadata and panel geometry into PostgreSQL with COPY FROM STDIN
+# rather than one ORM round trip per row. Geometry rows are sent as EWKT and loaded
+# into a staging table (partitioned by altitude shell like the live one). The
+# indexes are built once after the load, and the staging partitions are swapped
+# into the live table atomically, so readers never see a half-loaded table. The
+# live parent table itself is never dropped, so views on it keep working.
+
+import io
+
+from orbital_tracts.partitions import PARTITION_KEY, index_ddl, partition_ddl, partition_name, split_table
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Column order for rows passed to load_tracts().
+TRACT_COLUMNS = (
+    "tract_id", "alt_min", "alt_max", "inc_min", "inc_max", "az_min", "az_max",
+    "orbit_zone", "theta_start_idx", "theta_end_idx", "parent_key", "tract_key", "content_hash",
+)
+
+# Column order for rows written to dev.tract_geometries_*; rows are passed in as
+# (tract_id, tract_key, alt_min, alt_max, wkt, content_hash) and the WKT is tagged
+# with its SRID on the way in. alt_min picks the row's shell partition.
+GEOMETRY_COLUMNS = ("tract_id", "tract_key", "alt_min", "alt_max", "geom", "content_hash")
+
+# Conflict target of panel upserts: the primary key of a partitioned table must
+# include the partition key.
+GEOMETRY_KEY = ("tract_id", PARTITION_KEY)
+
+
+def _copy_value(value):
+    # COPY text format: tab separated, \N for NULL. Tract IDs and WKT never contain
+    # tabs, newlines or backslashes, so no further escaping is needed.
+    return r"\N" if value is None else str(value)
+
+
+def copy_rows(cursor, table, columns, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    COPY ``rows`` (tuples in ``columns`` order) into ``table``, ``batch_size`` rows
+    per COPY statement. ``rows`` may be a generator; only one batch is held in memory.
+    Returns the number of rows written.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buf = io.StringIO()
+    pending = 0
+    total = 0
+
+    def flush():
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+        buf.seek(0)
+        buf.truncate()
+
+    for row in rows:
+        buf.write("\t".join(_copy_value(v) for v in row))
+        buf.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            flush()
+            total += pending
+            pending = 0
+
+    if pending:
+        flush()
+        total += pending
+    return total
+
+
+def _ewkt_rows(rows, srid):
+    return (
+        (tract_id, tract_key, alt_min, alt_max, f"SRID={srid};{wkt}", content_hash)
+        for tract_id, tract_key, alt_min, alt_max, wkt, content_hash in rows
+    )
+
+
+def load_tracts(engine, rows, zone, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Replace every ``dev.tracts`` row for ``zone`` with ``rows`` in one transaction.
+
+    The rows are first COPY'd into a temporary staging table, so the delete and
+    insert swap is a single short statement pair.
+    """
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "CREATE TEMP TABLE tracts_staging (LIKE dev.tracts INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        count = copy_rows(cur, "tracts_staging", TRACT_COLUMNS, rows, batch_size)
+
+        columns = ", ".join(TRACT_COLUMNS)
+        cur.execute("DELETE FROM dev.tracts WHERE orbit_zone = %s", (zone,))
+        cur.execute(f"INSERT INTO dev.tracts ({columns}) SELECT {columns} FROM tracts_staging")
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _partitions(cur, schema, name):
+    # Names of the partitions currently attached to schema.name.
+    cur.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent JOIN pg_namespace n ON n.oid = p.relnamespace "
+        "WHERE n.nspname = %s AND p.relname = %s",
+        (schema, name),
+    )
+    return {row[0] for row in cur.fetchall()}
+
+
+def _rename_indexes(cur, schema, table, old_prefix, new_prefix):
+    # Give a swapped-in partition's indexes (auto-named after the staging
+    # partition) the names they would have had on the live one.
+    cur.execute("SELECT indexname FROM pg_indexes WHERE schemaname = %s AND tablename = %s", (schema, table))
+    for (index,) in cur.fetchall():
+        if index.startswith(old_prefix):
+            cur.execute(f"ALTER INDEX {schema}.{index} RENAME TO {new_prefix}{index[len(old_prefix):]}")
+
+
+def load_geometries(engine, table, index_name, rows, alt_mins, batch_size=DEFAULT_BATCH_SIZE, srid=4326):
+    """
+    Rebuild a ``dev.tract_geometries_*`` table from ``(tract_id, tract_key,
+    alt_min, alt_max, wkt, content_hash)`` rows, one partition per shell in
+    ``alt_mins``.
+
+    Rows are COPY'd into a partitioned ``<table>_staging`` with no indexes. The
+    primary key and the ``partitions.index_ddl`` indexes are then built in one
+    pass. In a single transaction, each staging partition is detached and
+    takes the place of the matching live partition (old partitions, including
+    those of shells no longer configured, are detached and dropped), so the live
+    parent and any view selecting from it stay in place. Views must select from
+    the parent, not from a partition. Returns the number of rows loaded.
+    """
+    schema, name = split_table(table)
+    staging = f"{name}_staging"
+    staging_index = f"{index_name}_staging"
+    alt_mins = list(dict.fromkeys(alt_mins))
+
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {schema}.{staging}")
+        cur.execute(
+            f"CREATE TABLE {schema}.{staging} "
+            f"(LIKE {schema}.{name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY LIST ({PARTITION_KEY})"
+        )
+        for statement in partition_ddl(f"{schema}.{staging}", alt_mins):
+            cur.execute(statement)
+        conn.commit()
+
+        ewkt_rows = _ewkt_rows(rows, srid)
+        count = copy_rows(cur, f"{schema}.{staging}", GEOMETRY_COLUMNS, ewkt_rows, batch_size)
+        conn.commit()
+
+        # Build the indexes once over the loaded data instead of maintaining them per row.
+        key = ", ".join(GEOMETRY_KEY)
+        cur.execute(f"ALTER TABLE {schema}.{staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY ({key})")
+        for statement in index_ddl(f"{schema}.{staging}", staging_index):
+            cur.execute(statement)
+        # A CHECK matching each partition's bound lets ATTACH PARTITION skip its validation scan.
+        for alt_min in alt_mins:
+            cur.execute(
+                f"ALTER TABLE {partition_name(f'{schema}.{staging}', alt_min)} ADD CONSTRAINT "
+                f"{staging}_bound CHECK ({PARTITION_KEY} IS NOT NULL AND {PARTITION_KEY} = {float(alt_min)!r})"
+            )
+        cur.execute(f"ANALYZE {schema}.{staging}")
+        conn.commit()
+
+        # Atomic swap of the partitions: old panels, partitions and indexes disappear in the same
+        # commit. The parent's indexes adopt the matching staging indexes instead of rebuilding them.
+        for old in _partitions(cur, schema, name):
+            cur.execute(f"ALTER TABLE {schema}.{name} DETACH PARTITION {schema}.{old}")
+            cur.execute(f"DROP TABLE {schema}.{old}")
+        for alt_min in alt_mins:
+            source = partition_name(f"{schema}.{staging}", alt_min)
+            final = partition_name(table, alt_min).rpartition(".")[2]
+            cur.execute(f"ALTER TABLE {schema}.{staging} DETACH PARTITION {source}")
+            cur.execute(f"ALTER TABLE {source} RENAME TO {final}")
+            _rename_indexes(cur, schema, final, source.rpartition(".")[2], final)
+            cur.execute(
+                f"ALTER TABLE {schema}.{name} ATTACH PARTITION {schema}.{final} "
+                f"FOR VALUES IN ({float(alt_min)!r})"
+            )
+            cur.execute(f"ALTER TABLE {schema}.{final} DROP CONSTRAINT {staging}_bound")
+        cur.execute(f"DROP TABLE {schema}.{staging}")
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+# === In-place updates for incremental runs ===
+# These never swap or truncate tables: rows are upserted from a temp staging table
+# and removed by ID, so readers see the tables throughout.
+
+def _upsert(conn, table, columns, key, rows, batch_size):
+    cur = conn.cursor()
+    cur.execute(f"CREATE TEMP TABLE upsert_staging (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    count = copy_rows(cur, "upsert_staging", columns, rows, batch_size)
+
+    column_list = ", ".join(columns)
+    key = (key,) if isinstance(key, str) else tuple(key)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in key)
+    cur.execute(
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM upsert_staging "
+        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}, created_at = now()"
+    )
+    return count
+
+
+def upsert_tracts(engine, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Insert or update ``dev.tracts`` rows (``TRACT_COLUMNS`` order) in one transaction."""
+    conn = engine.raw_connection()
+    try:
+        count = _upsert(conn, "dev.tracts", TRACT_COLUMNS, "tract_id", rows, batch_size)
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def upsert_geometries(engine, table, rows, batch_size=DEFAULT_BATCH_SIZE, srid=4326):
+    """
+    Insert or update ``(tract_id, tract_key, alt_min, alt_max, wkt,
+    content_hash)`` panel rows in ``table``. Every row's shell must already have
+    a partition.
+    """
+    conn = engine.raw_connection()
+    try:
+        count = _upsert(conn, table, GEOMETRY_COLUMNS, GEOMETRY_KEY, _ewkt_rows(rows, srid), batch_size)
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def delete_tracts(engine, tract_ids, geometry_table):
+    """Delete tracts by ID, together with their panels in ``geometry_table``."""
+    if not tract_ids:
+        return 0
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        ids = list(tract_ids)
+        cur.execute(f"DELETE FROM {geometry_table} WHERE tract_id = ANY(%s)", (ids,))
+        cur.execute("DELETE FROM dev.tracts WHERE tract_id = ANY(%s)", (ids,))
+        count = cur.rowcount
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def delete_geometries(engine, table, tract_ids=()):
+    """
+    Delete the panels for ``tract_ids``, plus any orphaned panel whose tract no
+    longer exists in ``dev.tracts``. Returns the number of rows removed.
+    """
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"DELETE FROM {table} g WHERE g.tract_id = ANY(%s) "
+            f"OR NOT EXISTS (SELECT 1 FROM dev.tracts t WHERE t.tract_id = g.tract_id)",
+            (list(tract_ids),),
+        )
+        count = cur.rowcount
+        conn.commit()
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,223 @@
+# === 📈 Progress, Metrics and Profiling ===
+# Instrumentation for the long generation and export loops:
+#
+#   Progress     rate / ETA lines on stderr, plus named counters (skipped,
+#                invalid, split-at-antimeridian panels, ...)
+#   open_sink    machine-readable snapshots for the scheduler: JSON lines, or a
+#                Prometheus textfile (node_exporter textfile collector) for *.prom
+#   profiled     optional cProfile / pyinstrument capture around a run
+#
+# Several Progress instances (e.g. one per zone thread) may share one sink.
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL = 5.0
+
+
+def _format_eta(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """
+    Counts processed items for one labelled run and reports every ``interval``
+    seconds (and on ``finish``) to ``stream`` and the optional ``sink``.
+    Thread-safe.
+    """
+
+    def __init__(self, label, total=None, interval=DEFAULT_INTERVAL, sink=None, stream=sys.stderr):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.sink = sink
+        self.stream = stream
+        self.done = 0
+        self.counters = Counter()
+        self.started = time.monotonic()
+        self.finished = False
+        self._last_report = self.started
+        self._lock = threading.Lock()
+
+    def update(self, n=1, **counts):
+        """Mark ``n`` more items done and add ``counts`` to the named counters."""
+        with self._lock:
+            self.done += n
+            self.counters.update(counts)
+            now = time.monotonic()
+            due = now - self._last_report >= self.interval
+            if due:
+                self._last_report = now
+        if due:
+            self._report()
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def snapshot(self):
+        """Current state as a flat, JSON-ready dict."""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            rate = self.done / elapsed if elapsed > 0 else 0.0
+            eta = None
+            if self.total is not None and rate > 0:
+                eta = max(self.total - self.done, 0) / rate
+            return {
+                "label": self.label,
+                "done": self.done,
+                "total": self.total,
+                "elapsed_seconds": round(elapsed, 3),
+                "rate_per_s": round(rate, 2),
+                "eta_seconds": None if eta is None else round(eta, 1),
+                "finished": self.finished,
+                "timestamp": time.time(),
+                "counters": dict(self.counters),
+            }
+
+    def _report(self):
+        snap = self.snapshot()
+        if self.stream is not None:
+            if snap["total"]:
+                position = f"{snap['done']:,}/{snap['total']:,} ({100 * snap['done'] / snap['total']:.1f}%)"
+            else:
+                position = f"{snap['done']:,}"
+            counters = " ".join(f"{k}={v:,}" for k, v in sorted(snap["counters"].items()))
+            marker = "✅" if snap["finished"] else "⏳"
+            line = (
+                f"{marker} [{self.label}] {position} {snap['rate_per_s']:,.0f}/s "
+                f"elapsed {_format_eta(snap['elapsed_seconds'])} ETA {_format_eta(snap['eta_seconds'])}"
+            )
+            print(line + (f" | {counters}" if counters else ""), file=self.stream, flush=True)
+        if self.sink is not None:
+            self.sink.emit(snap)
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+        self._report()
+
+
+# === Sinks ===
+
+class JsonLinesSink:
+    """Appends one JSON object per snapshot to ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, snapshot):
+        line = json.dumps(snapshot, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class PrometheusSink:
+    """
+    Keeps the latest snapshot per label and rewrites ``path`` atomically in the
+    Prometheus text exposition format on every emit.
+    """
+
+    PREFIX = "orbital_tracts"
+
+    def __init__(self, path, job="generate"):
+        self.path = path
+        self.job = job
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def _lines(self):
+        gauges = {
+            "items_done": ("Items processed so far", lambda s: s["done"]),
+            "items_total": ("Items expected in the run", lambda s: s["total"]),
+            "rate_per_second": ("Average items per second", lambda s: s["rate_per_s"]),
+            "elapsed_seconds": ("Seconds since the run started", lambda s: s["elapsed_seconds"]),
+            "eta_seconds": ("Estimated seconds remaining", lambda s: s["eta_seconds"]),
+            "finished": ("1 once the run completed", lambda s: int(s["finished"])),
+            "last_update_timestamp_seconds": ("Unix time of the last update", lambda s: s["timestamp"]),
+        }
+        lines = []
+        for name, (help_text, value) in gauges.items():
+            metric = f"{self.PREFIX}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            for label, snap in sorted(self._latest.items()):
+                if value(snap) is not None:
+                    lines.append(f'{metric}{{job="{self.job}",run="{label}"}} {value(snap)}')
+
+        metric = f"{self.PREFIX}_events_total"
+        lines += [f"# HELP {metric} Counted events (skipped, invalid, split panels, ...)", f"# TYPE {metric} counter"]
+        for label, snap in sorted(self._latest.items()):
+            for event, count in sorted(snap["counters"].items()):
+                lines.append(f'{metric}{{job="{self.job}",run="{label}",event="{event}"}} {count}')
+        return lines
+
+    def emit(self, snapshot):
+        with self._lock:
+            self._latest[snapshot["label"]] = snapshot
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("\n".join(self._lines()) + "\n")
+            os.replace(tmp, self.path)
+
+
+def open_sink(path, job="generate"):
+    """Metrics sink for ``path``: Prometheus textfile for ``*.prom``, JSON lines otherwise."""
+    if path is None:
+        return None
+    if path.endswith(".prom"):
+        return PrometheusSink(path, job)
+    return JsonLinesSink(path)
+
+
+# === Profiling ===
+
+@contextmanager
+def profiled(kind=None, output=None):
+    """
+    Profile the enclosed block with ``kind`` = ``"cprofile"`` or ``"pyinstrument"``
+    (``None`` does nothing). cProfile stats go to ``output`` (default
+    ``profile.prof``) and the top entries to stderr; pyinstrument writes an HTML
+    report (default ``profile.html``).
+    """
+    if kind is None:
+        yield
+        return
+
+    if kind == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path = output or "profile.prof"
+            profiler.dump_stats(path)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+            print(f"📝 cProfile stats written to {path}", file=sys.stderr)
+    elif kind == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            path = output or "profile.html"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            print(f"📝 pyinstrument report written to {path}", file=sys.stderr)
+    else:
+        raise ValueError(f"Unknown profiler {kind!r}; expected 'cprofile' or 'pyinstrument'")
@@ -0,0 +1,210 @@
+# === 🧱 Database Models ===
+# The dev.tracts ORM model shared by every zone, and one dev.tract_geometries_<zone>
+# table per zone in the config. Only schema creation goes through SQLAlchemy; the
+# bulk data paths use raw COPY (see orbital_tracts.loader).
+
+from datetime import datetime
+
+from geoalchemy2 import Geometry
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String, Table, text
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Tract(Base):
+    __tablename__ = 'tracts'
+    __table_args__ = {'schema': 'dev'}
+    tract_id = Column(String, primary_key=True)
+    alt_min = Column(Float)
+    alt_max = Column(Float)
+    inc_min = Column(Float)
+    inc_max = Column(Float)
+    az_min = Column(Float)
+    az_max = Column(Float)
+    orbit_zone = Column(String, default='LEO')
+    theta_start_idx = Column(Integer)
+    theta_end_idx = Column(Integer)
+    # Packed zone / bin key (orbital_tracts.keys); indexed in create_tables.
+    tract_key = Column(BigInteger)
+    # Key of the containing tract one resolution level up (orbital_tracts.levels); NULL at level 0.
+    parent_key = Column(BigInteger)
+    content_hash = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+def geometry_table(qualified_name):
+    """The panel table for one zone, registered on ``Base.metadata`` (idempotent)."""
+    schema, _, name = qualified_name.rpartition(".")
+    key = f"{schema}.{name}" if schema else name
+    if key in Base.metadata.tables:
+        return Base.metadata.tables[key]
+    return Table(
+        name, Base.metadata,
+        Column('tract_id', String, primary_key=True),
+        Column('tract_key', BigInteger),
+        # Partition key: one LIST partition per altitude shell (orbital_tracts.partitions).
+        Column('alt_min', Float, primary_key=True),
+        Column('alt_max', Float, nullable=False),
+        # The named GiST indexes are created in create_tables (and rebuilt by load_geometries).
+        Column('geom', Geometry(geometry_type='MULTIPOLYGONZ', srid=4326, spatial_index=False), nullable=False),
+        Column('content_hash', String),
+        Column('created_at', DateTime, default=datetime.utcnow),
+        schema=schema or None,
+        postgresql_partition_by='LIST (alt_min)',
+    )
+
+
+def ensure_multipolygon_column(conn, qualified_name):
+    """Migrate a panel table created with a PolygonZ ``geom`` column to MultiPolygonZ."""
+    schema, _, name = qualified_name.rpartition(".")
+    current = conn.execute(
+        text(
+            "SELECT type FROM geometry_columns "
+            "WHERE f_table_schema = :schema AND f_table_name = :name AND f_geometry_column = 'geom'"
+        ),
+        {"schema": schema or "public", "name": name},
+    ).scalar()
+    if current is not None and current.upper() != "MULTIPOLYGON":
+        conn.execute(text(
+            f"ALTER TABLE {qualified_name} "
+            "ALTER COLUMN geom TYPE geometry(MultiPolygonZ, 4326) USING ST_Multi(geom)"
+        ))
+
+
+# Tables outside create_tables that carry tract keys next to the tract ID; they are
+# re-keyed with dev.tracts. dev.tract_adjacency (keys only) is rewritten per metadata run.
+KEYED_TABLES = ("dev.tract_occupancy", "dev.tract_satellite_buckets", "dev.tract_density")
+
+
+def ensure_key_columns(conn, spec):
+    """
+    Add the tract_key (and level parent_key) columns and indexes to
+    ``dev.tracts`` and the zone's panel table, and bring stored keys up to date.
+
+    Rows stored before keys existed, under an older key layout or another zone
+    code are re-keyed together with the zone's panels, occupancy and density
+    rows, in ``conn``'s transaction, so joins on tract_key never mix the two.
+    """
+    from orbital_tracts.keys import key_map
+    from orbital_tracts.levels import parent_keys
+
+    conn.execute(text("ALTER TABLE dev.tracts ADD COLUMN IF NOT EXISTS tract_key bigint"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_tracts_tract_key ON dev.tracts (tract_key)"))
+    conn.execute(text("ALTER TABLE dev.tracts ADD COLUMN IF NOT EXISTS parent_key bigint"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_tracts_parent_key ON dev.tracts (parent_key)"))
+    conn.execute(text(f"ALTER TABLE {spec.geometry_table} ADD COLUMN IF NOT EXISTS tract_key bigint"))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {spec.geometry_index}_key ON {spec.geometry_table} (tract_key)"
+    ))
+
+    keys = key_map([spec])
+    parents = dict(zip(keys, parent_keys(list(keys.values()), spec).tolist())) if spec.parent else {}
+    stored = conn.execute(
+        text("SELECT tract_id, tract_key, parent_key FROM dev.tracts WHERE orbit_zone = :zone"),
+        {"zone": spec.name},
+    ).all()
+    # Retired tracts that are no longer in the bins keep their key.
+    stale = [
+        tract_id for tract_id, key, parent in stored
+        if tract_id in keys and (key, parent) != (keys[tract_id], parents.get(tract_id))
+    ]
+    if stale:
+        conn.execute(text(
+            "CREATE TEMP TABLE tract_rekey (tract_id text PRIMARY KEY, tract_key bigint, parent_key bigint)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO tract_rekey SELECT * FROM "
+                "unnest(CAST(:ids AS text[]), CAST(:keys AS bigint[]), CAST(:parents AS bigint[]))"
+            ),
+            {"ids": stale, "keys": [keys[t] for t in stale], "parents": [parents.get(t) for t in stale]},
+        )
+        conn.execute(text(
+            "UPDATE dev.tracts t SET tract_key = k.tract_key, parent_key = k.parent_key "
+            "FROM tract_rekey k WHERE t.tract_id = k.tract_id"
+        ))
+        for table in (spec.geometry_table, *KEYED_TABLES):
+            if conn.execute(text("SELECT to_regclass(:table)"), {"table": table}).scalar() is not None:
+                conn.execute(text(
+                    f"UPDATE {table} d SET tract_key = k.tract_key FROM tract_rekey k WHERE d.tract_id = k.tract_id"
+                ))
+        if conn.execute(text("SELECT to_regclass('dev.tract_adjacency')")).scalar() is not None:
+            conn.execute(text("DELETE FROM dev.tract_adjacency WHERE orbit_zone = :zone"), {"zone": spec.name})
+        conn.execute(text("DROP TABLE tract_rekey"))
+        print(f"🔑 [{spec.name}] Re-keyed {len(stale)} tracts and their panels, occupancy and density rows")
+    conn.execute(text(
+        f"UPDATE {spec.geometry_table} g SET tract_key = t.tract_key FROM dev.tracts t "
+        "WHERE t.tract_id = g.tract_id AND g.tract_key IS NULL"
+    ))
+
+
+def ensure_shell_partitions(conn, spec):
+    """
+    Make the zone's panel table partitioned by altitude shell, with a partition
+    for every shell in ``spec`` and the parent-level indexes.
+
+    A flat table from an earlier version is rebuilt as a partitioned copy: panels
+    get their shell from dev.tracts, and panels of shells no longer in the
+    config are dropped.
+    """
+    from orbital_tracts.partitions import index_ddl, partition_ddl, shells, split_table
+
+    schema, name = split_table(spec.geometry_table)
+    alt_mins = [alt_min for alt_min, _ in shells(spec)]
+    partitioned = conn.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname = :schema AND c.relname = :name)"
+        ),
+        {"schema": schema, "name": name},
+    ).scalar()
+
+    if not partitioned:
+        flat, staging = f"{schema}.{name}", f"{schema}.{name}_partitioned"
+        conn.execute(text(
+            f"ALTER TABLE {flat} ADD COLUMN IF NOT EXISTS alt_min double precision, "
+            "ADD COLUMN IF NOT EXISTS alt_max double precision"
+        ))
+        conn.execute(text(
+            f"UPDATE {flat} g SET alt_min = t.alt_min, alt_max = t.alt_max "
+            "FROM dev.tracts t WHERE t.tract_id = g.tract_id"
+        ))
+        conn.execute(text(
+            f"CREATE TABLE {staging} (LIKE {flat} INCLUDING DEFAULTS) PARTITION BY LIST (alt_min)"
+        ))
+        conn.execute(text(f"ALTER TABLE {staging} ALTER COLUMN alt_max SET NOT NULL"))
+        for statement in partition_ddl(spec.geometry_table, alt_mins, parent=staging):
+            conn.execute(text(statement))
+        conn.execute(
+            text(f"INSERT INTO {staging} SELECT * FROM {flat} WHERE alt_min = ANY(CAST(:shells AS float8[]))"),
+            {"shells": [float(a) for a in alt_mins]},
+        )
+        conn.execute(text(f"DROP TABLE {flat}"))
+        conn.execute(text(f"ALTER TABLE {staging} RENAME TO {name}"))
+        conn.execute(text(f"ALTER TABLE {flat} ADD CONSTRAINT {name}_pkey PRIMARY KEY (tract_id, alt_min)"))
+
+    for statement in partition_ddl(spec.geometry_table, alt_mins):
+        conn.execute(text(statement))
+    for statement in index_ddl(spec.geometry_table, spec.geometry_index):
+        conn.execute(text(statement))
+
+
+def create_tables(engine, zones):
+    """
+    Create dev.tracts and the shell-partitioned geometry table + indexes of every
+    zone in ``zones``, migrating tables created by earlier versions.
+    """
+    from orbital_tracts.incremental import ensure_hash_columns
+
+    tables = [Tract.__table__] + [geometry_table(spec.geometry_table) for spec in zones]
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        for spec in zones:
+            ensure_multipolygon_column(conn, spec.geometry_table)
+            ensure_key_columns(conn, spec)
+    for spec in zones:
+        ensure_hash_columns(engine, spec.geometry_table)
+    with engine.begin() as conn:
+        for spec in zones:
+            ensure_shell_partitions(conn, spec)
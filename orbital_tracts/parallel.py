@@ -0,0 +1,105 @@
+# === ⚙️ Parallel Panel Generation ===
+# Splits tracts into one chunk per altitude shell and builds the panels for each
+# chunk in a worker process. Every worker creates its own pyproj Transformer once
+# (see geometry.get_transformer) and starts with the parent's ArcCache, warmed with
+# the run's (inclination, RAAN) bin sets before the pool starts. Results come back in shell order, so inserts stay
+# deterministic whatever the worker count.
+
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from orbital_tracts.geometry import (
+    DEFAULT_STEPS, build_shell_panels, get_arc_cache, get_transformer, panel_to_wkt, set_arc_cache,
+    shell_radius_km,
+)
+
+
+def group_by_shell(tracts):
+    """
+    Group tract rows into altitude-shell chunks.
+
+    ``tracts`` is an iterable of ``(tract_id, alt_min, alt_max, inc_min, inc_max,
+    az_min, az_max)`` tuples. Shells keep the order they first appear in, and tracts
+    keep their order within each shell.
+    """
+    shells = {}
+    for tract_id, alt_min, alt_max, inc_min, inc_max, az_min, az_max in tracts:
+        shells.setdefault((alt_min, alt_max), []).append((tract_id, inc_min, inc_max, az_min, az_max))
+    return list(shells.items())
+
+
+def build_shell_chunk(chunk, steps=DEFAULT_STEPS, geodetic="pyproj"):
+    """
+    Build and validate every panel in one shell chunk.
+
+    Returns ``(results, counts)``: a list of ``(tract_id, wkt or None)`` and a dict
+    of geometry event counts (antimeridian splits, invalid panels, ...).
+    """
+    (alt_min, alt_max), rows = chunk
+    tract_ids, inc_min, inc_max, az_min, az_max = zip(*rows)
+    counts = Counter()
+    panels = build_shell_panels(
+        shell_radius_km(alt_min, alt_max), inc_min, inc_max, az_min, az_max, steps, get_transformer(geodetic),
+        counts,
+    )
+    results = [(tract_id, panel_to_wkt(tract_id, panel, counts)) for tract_id, panel in zip(tract_ids, panels)]
+    counts["skipped"] = sum(wkt is None for _, wkt in results)
+    return results, dict(counts)
+
+
+def _init_worker(cache, geodetic):
+    get_transformer(geodetic)
+    set_arc_cache(cache)
+
+
+def _warm_arc_cache(chunks, steps):
+    # Unit rings for every distinct bin set, computed once here instead of per worker.
+    cache = get_arc_cache()
+    for _, rows in chunks:
+        _, inc_min, inc_max, az_min, az_max = zip(*rows)
+        cache.unit_rings(inc_min, inc_max, az_min, az_max, steps)
+    return cache
+
+
+def _pool_context():
+    # The CLI may run several zones on threads, and forking a threaded process is
+    # unsafe, so workers come from a fork server where the platform has one. Callers
+    # must keep their entry point behind an ``if __name__ == "__main__"`` guard.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def generate_panels(tracts, workers=1, steps=DEFAULT_STEPS, geodetic="pyproj", progress=None):
+    """
+    Yield ``(tract_id, wkt or None)`` for every tract, one shell at a time.
+
+    With ``workers > 1`` the shells are built in a process pool. Output order is
+    the same as the serial path either way. ``geodetic`` picks the ECEF → WGS84
+    conversion (see geometry.get_transformer). ``progress`` (a metrics.Progress)
+    is advanced per shell with its geometry event counts.
+    """
+    chunks = group_by_shell(tracts)
+
+    def emit(results, counts):
+        if progress is not None:
+            progress.update(len(results), **counts)
+        return results
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from emit(*build_shell_chunk(chunk, steps, geodetic))
+        return
+
+    workers = min(workers, len(chunks)) or 1
+    cache = _warm_arc_cache(chunks, steps)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=_pool_context(), initializer=_init_worker, initargs=(cache, geodetic)
+    ) as pool:
+        # map() yields results in submission order, streaming each shell as soon as
+        # it and every shell before it are done.
+        for results, counts in pool.map(
+            build_shell_chunk, chunks, [steps] * len(chunks), [geodetic] * len(chunks)
+        ):
+            yield from emit(results, counts)
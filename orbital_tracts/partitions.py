@@ -0,0 +1,89 @@
+# === 🧩 Shell-partitioned Geometry Tables ===
+# Each zone's panel table (dev.tract_geometries_<zone>) is declaratively
+# partitioned by altitude shell: LIST (alt_min), one partition per altitude bin,
+# named <table>_a<alt_min>. Rows carry their shell's alt_min / alt_max. Every
+# partition gets, through indexes declared on the parent:
+#
+#   <geometry_index>      2D GiST on geom, for ST_Contains / && tests
+#   <geometry_index>_nd   n-D GiST (gist_geometry_ops_nd), for &&& box tests over
+#                         lon, lat and height
+#   <geometry_index>_key  btree on tract_key
+#
+# A query that fixes the shell first (g.alt_min = <shell>, see shell_filter) is
+# pruned to that one partition at plan time, so its spatial test only ever sees
+# one shell: 1/37th of the LEO panels.
+#
+# Only SQL text is built here. The DDL runs from models.create_tables (new and
+# migrated tables) and loader.load_geometries (staging tables).
+
+import numpy as np
+
+PARTITION_KEY = "alt_min"
+
+
+def split_table(table):
+    schema, _, name = table.rpartition(".")
+    return schema or "public", name
+
+
+def shells(spec):
+    """Distinct ``(alt_min, alt_max)`` shells of a zone, in bin order."""
+    return tuple(dict.fromkeys(spec.alt_bins))
+
+
+def partition_name(table, alt_min):
+    """Qualified name of the partition holding shell ``alt_min``, e.g. ``dev.tract_geometries_leo_a200``."""
+    schema, name = split_table(table)
+    suffix = f"{alt_min:g}".replace(".", "_").replace("-", "m")
+    return f"{schema}.{name}_a{suffix}"
+
+
+def partition_ddl(table, alt_mins, parent=None):
+    """
+    ``CREATE TABLE … PARTITION OF`` statements for each shell in ``alt_mins``.
+    Partitions are named after ``table`` but attached to ``parent`` (default:
+    ``table`` itself), so a staging parent can own partitions with final names.
+    """
+    parent = parent or table
+    return [
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, alt_min)} "
+        f"PARTITION OF {parent} FOR VALUES IN ({float(alt_min)!r})"
+        for alt_min in dict.fromkeys(alt_mins)
+    ]
+
+
+def index_ddl(table, index_name):
+    """The parent-level indexes every shell partition inherits (see the header)."""
+    return [
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gist (geom)",
+        f"CREATE INDEX IF NOT EXISTS {index_name}_nd ON {table} USING gist (geom gist_geometry_ops_nd)",
+        f"CREATE INDEX IF NOT EXISTS {index_name}_key ON {table} (tract_key)",
+    ]
+
+
+def shell_for_altitude(spec, altitude_km):
+    """
+    The ``(alt_min, alt_max)`` shell containing ``altitude_km``, or ``None``.
+    Shells are half-open like TractIndex's bins; a zero-width shell (the GEO belt)
+    holds its exact altitude only, and wins over the shell ending there.
+    """
+    lo = np.array([b[0] for b in spec.alt_bins], dtype=float)
+    hi = np.array([b[1] for b in spec.alt_bins], dtype=float)
+    i = int(np.searchsorted(lo, altitude_km, side="right")) - 1
+    if i < 0:
+        return None
+    if altitude_km < hi[i] or (lo[i] == hi[i] == altitude_km):
+        return spec.alt_bins[i]
+    return None
+
+
+def altitude_predicate(column, alt_min, alt_max):
+    """SQL matching ``column`` (km) to one shell, with TractIndex's bin rules."""
+    if alt_min == alt_max:
+        return f"{column} = {float(alt_min)!r}"
+    return f"{column} >= {float(alt_min)!r} AND {column} < {float(alt_max)!r}"
+
+
+def shell_filter(alias, alt_min):
+    """SQL restricting panel alias ``alias`` to one shell; lets the planner prune to its partition."""
+    return f"{alias}.{PARTITION_KEY} = {float(alt_min)!r}"
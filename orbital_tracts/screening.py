@@ -0,0 +1,261 @@
+# === 💥 Conjunction Screening ===
+# Finds object pairs closer than a threshold at each epoch of a propagated catalog
+# without comparing every pair. Positions are bucketed twice:
+#
+#   shell  the zones' altitude bins (every distinct bin edge of the config, open
+#          below the lowest and above the highest). |Δaltitude| ≤ |Δr|, so a pair
+#          within the threshold lies in one shell, or straddles an edge by less
+#          than the threshold.
+#   cell   a cube of a Cartesian grid at least one threshold wide, keyed together
+#          with the epoch. A pair within the threshold shares a cell or sits in
+#          neighbouring cells.
+#
+# Each shell is one task (run in a process pool with workers > 1). It owns the
+# points inside the shell and also sees the "halo" of points less than a threshold
+# above it, so a pair across an edge is found exactly once: by the lower shell.
+# Within a task, only pairs in the same or neighbouring cells of the same epoch
+# get a distance check, so the work grows with the number of points rather than
+# its square.
+#
+# Inclination and RAAN bins are deliberately not used as buckets: they place an
+# orbit's plane, not the object on it. Two objects on crossing orbits can be
+# metres apart in far-apart inclination / RAAN bins, and those are exactly the
+# close approaches screening exists to find. Tracts come back in the results:
+# each side of a conjunction is labelled with the tract it occupies.
+#
+# Distances are checked at the sampled epochs only. A pair that passes between
+# two samples is caught only if the threshold covers its relative motion over a
+# step, so pad the threshold or shorten the step for a strict filter.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from orbital_tracts.geometry import EARTH_RADIUS_KM
+from orbital_tracts.index import TractIndex
+from orbital_tracts.parallel import _pool_context
+from orbital_tracts.zones import ZONES
+
+DEFAULT_THRESHOLD_KM = 5.0
+
+CONJUNCTION_COLUMNS = (
+    "epoch", "satellite_a", "name_a", "satellite_b", "name_b", "distance_km", "relative_speed_km_s",
+    "tract_id_a", "tract_id_b",
+)
+
+# Cell offsets that visit every pair of neighbouring cells once: the 13 of the 26
+# neighbours that come after (0, 0, 0) in lexicographic order.
+_FORWARD = tuple(
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+)
+
+# Cell keys pack (epoch, x, y, z) into one int64; grow cells until they fit.
+_MAX_KEY = 1 << 62
+
+
+def shell_edges(zones=None):
+    """Sorted distinct altitude bin edges (km) of ``zones`` (default: every configured zone)."""
+    specs = ZONES.values() if zones is None else zones
+    return np.array(sorted({edge for spec in specs for b in spec.alt_bins for edge in b}), dtype=float)
+
+
+def _cell_keys(xyz, epoch, cell_km):
+    # Packed (epoch, cell) keys and the per-axis key strides. Cell coordinates
+    # start at 1 with a spare cell above, so a ±1 step never leaves the axis.
+    n_epochs = int(epoch.max()) + 1
+    while True:
+        cells = np.floor(xyz / cell_km).astype(np.int64)
+        cells -= cells.min(axis=0) - 1
+        span = cells.max(axis=0) + 2
+        if n_epochs * int(span[0]) * int(span[1]) * int(span[2]) < _MAX_KEY:
+            break
+        cell_km *= 2
+    keys = ((epoch.astype(np.int64) * span[0] + cells[:, 0]) * span[1] + cells[:, 1]) * span[2] + cells[:, 2]
+    return keys, span
+
+
+def _cross(start_a, count_a, start_b, count_b, same=False):
+    # Every (i, j) with i in run a and j in run b, for each pair of runs; with
+    # ``same`` the runs are identical and only i < j is kept.
+    m = count_a * count_b
+    group = np.repeat(np.arange(len(m)), m)
+    local = np.arange(int(m.sum())) - np.repeat(np.cumsum(m) - m, m)
+    i = start_a[group] + local // count_b[group]
+    j = start_b[group] + local % count_b[group]
+    if same:
+        keep = i < j
+        i, j = i[keep], j[keep]
+    return i, j
+
+
+def candidate_pairs(xyz, epoch, cell_km):
+    """
+    Index pairs ``(i, j)`` of points at the same epoch in the same or
+    neighbouring cells of a ``cell_km`` grid: every pair closer than ``cell_km``
+    and, typically, few others.
+    """
+    if not len(xyz):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    keys, span = _cell_keys(xyz, epoch, cell_km)
+    order = np.argsort(keys, kind="stable")
+    cells, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    pairs = [_cross(starts, counts, starts, counts, same=True)]
+    for dx, dy, dz in _FORWARD:
+        target = cells + (dx * span[1] + dy) * span[2] + dz
+        pos = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+        hit = np.flatnonzero(cells[pos] == target)
+        pairs.append(_cross(starts[hit], counts[hit], starts[pos[hit]], counts[pos[hit]]))
+    i = np.concatenate([p[0] for p in pairs])
+    j = np.concatenate([p[1] for p in pairs])
+    return order[i], order[j]
+
+
+def screen_shell(epoch, sat, xyz, owned, threshold_km):
+    """
+    Close approaches among one shell's points: ``epoch``, ``sat`` and ``xyz``
+    describe each point, ``owned`` marks those inside the shell (the rest are
+    its halo). Returns ``(epoch, sat_a, sat_b, distance_km, candidates)``, with
+    ``sat_a < sat_b``; pairs of two halo points are left to the shell above.
+    """
+    i, j = candidate_pairs(xyz, epoch, threshold_km)
+    candidates = len(i)
+    distance = np.linalg.norm(xyz[i] - xyz[j], axis=1)
+    keep = (distance <= threshold_km) & (owned[i] | owned[j])
+    i, j, distance = i[keep], j[keep], distance[keep]
+    sat_a, sat_b = np.minimum(sat[i], sat[j]), np.maximum(sat[i], sat[j])
+    return epoch[i], sat_a, sat_b, distance, candidates
+
+
+class Screening:
+    """
+    Close approaches found by :func:`screen`: parallel arrays ``epoch_idx``,
+    ``sat_a``, ``sat_b`` (indices into the screened catalog, ``sat_a < sat_b``)
+    and ``distance_km``, sorted by epoch and then distance. ``candidates``
+    counts the pairs whose distance was computed, ``all_pairs`` the same-epoch
+    pairs a brute-force screen would have checked.
+    """
+
+    def __init__(self, epoch_idx, sat_a, sat_b, distance_km, n_points, candidates, all_pairs, threshold_km):
+        order = np.lexsort((distance_km, epoch_idx))
+        self.epoch_idx = epoch_idx[order]
+        self.sat_a = sat_a[order]
+        self.sat_b = sat_b[order]
+        self.distance_km = distance_km[order]
+        self.n_points = n_points
+        self.candidates = candidates
+        self.all_pairs = all_pairs
+        self.threshold_km = threshold_km
+
+    def __len__(self):
+        return len(self.distance_km)
+
+    def relative_speed(self, v_km_s):
+        """Relative speed (km/s) of each pair from ``(n_sats, n_epochs, 3)`` velocities."""
+        v = np.asarray(v_km_s, dtype=float)
+        return np.linalg.norm(v[self.sat_a, self.epoch_idx] - v[self.sat_b, self.epoch_idx], axis=1)
+
+    def tract_ids(self, r_km, v_km_s, zones=None):
+        """
+        Tract IDs occupied by each side of each pair, from the screened states
+        (``None`` outside every zone). The first zone that holds a state wins, as
+        in ingest.occupancy_counts.
+        """
+        indexes = [TractIndex(spec) for spec in (ZONES.values() if zones is None else zones)]
+        r, v = np.asarray(r_km, dtype=float), np.asarray(v_km_s, dtype=float)
+        sides = []
+        for sat in (self.sat_a, self.sat_b):
+            ids = np.full(len(sat), None, dtype=object)
+            pending = np.ones(len(sat), dtype=bool)
+            for index in indexes:
+                rows = np.flatnonzero(pending)
+                tract_idx, _ = index.lookup_state_vectors(r[sat[rows], self.epoch_idx[rows]],
+                                                          v[sat[rows], self.epoch_idx[rows]])
+                hit = tract_idx >= 0
+                rows = rows[hit]
+                ids[rows] = index.ids[tract_idx[hit]]
+                pending[rows] = False
+            sides.append(ids)
+        return tuple(sides)
+
+    def rows(self, sats, epochs, r_km, v_km_s, zones=None):
+        """Yield ``CONJUNCTION_COLUMNS`` rows; ``sats`` are ingest.load_elements tuples."""
+        speed = self.relative_speed(v_km_s)
+        tract_a, tract_b = self.tract_ids(r_km, v_km_s, zones)
+        for k, (e, a, b) in enumerate(zip(self.epoch_idx.tolist(), self.sat_a.tolist(), self.sat_b.tolist())):
+            yield (
+                epochs[e].isoformat(), sats[a][0], sats[a][1], sats[b][0], sats[b][1],
+                round(float(self.distance_km[k]), 3), round(float(speed[k]), 3), tract_a[k], tract_b[k],
+            )
+
+    def summary(self):
+        """Counts as a JSON-ready dict."""
+        return {
+            "points": self.n_points,
+            "conjunctions": len(self),
+            "candidate_pairs": self.candidates,
+            "all_pairs": self.all_pairs,
+            "threshold_km": self.threshold_km,
+        }
+
+    def report(self):
+        s = self.summary()
+        return (
+            f"💥 {s['conjunctions']:,} close approaches within {s['threshold_km']:g} km among "
+            f"{s['points']:,} positions; {s['candidate_pairs']:,} distance checks instead of {s['all_pairs']:,}"
+        )
+
+
+def _shell_tasks(r, threshold_km, zones):
+    # One (epoch, sat, xyz, owned) task per occupied shell, largest first.
+    n_sats, n_epochs, _ = r.shape
+    flat = r.reshape(-1, 3)
+    point = np.flatnonzero(np.isfinite(flat).all(axis=1))
+    xyz = flat[point]
+    alt = np.linalg.norm(xyz, axis=1) - EARTH_RADIUS_KM
+    edges = shell_edges(zones)
+    shell = np.searchsorted(edges, alt, side="right")
+
+    order = np.argsort(alt, kind="stable")
+    alt_sorted = alt[order]
+    bounds = np.concatenate([[-np.inf], edges, [np.inf]])
+    tasks = []
+    for s in np.unique(shell):
+        lo, hi = bounds[s], bounds[s + 1]
+        members = order[np.searchsorted(alt_sorted, lo):np.searchsorted(alt_sorted, hi + threshold_km)]
+        tasks.append((
+            (point[members] % n_epochs).astype(np.int32), (point[members] // n_epochs).astype(np.int32),
+            xyz[members], alt[members] < hi, threshold_km,
+        ))
+    tasks.sort(key=lambda task: -len(task[0]))
+    per_epoch = np.bincount(point % n_epochs, minlength=n_epochs).astype(np.int64)
+    return tasks, len(point), int((per_epoch * (per_epoch - 1) // 2).sum())
+
+
+def screen(r_km, threshold_km=DEFAULT_THRESHOLD_KM, zones=None, workers=1):
+    """
+    Screen ``(n_sats, n_epochs, 3)`` inertial positions (km; NaN where
+    propagation failed) for pairs within ``threshold_km`` at the same epoch.
+    ``zones`` supply the altitude shells (default: every configured zone); with
+    ``workers > 1`` shells are screened in a process pool. Returns a Screening.
+    """
+    if threshold_km <= 0:
+        raise ValueError("threshold_km must be positive")
+    tasks, n_points, all_pairs = _shell_tasks(np.asarray(r_km, dtype=float), threshold_km, zones)
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = [screen_shell(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=_pool_context()) as pool:
+            results = list(pool.map(screen_shell, *zip(*tasks)))
+
+    if not results:
+        empty = np.empty(0, dtype=np.int32)
+        return Screening(empty, empty, empty, np.empty(0), n_points, 0, all_pairs, threshold_km)
+    epoch, sat_a, sat_b, distance, candidates = zip(*results)
+    return Screening(
+        np.concatenate(epoch), np.concatenate(sat_a), np.concatenate(sat_b), np.concatenate(distance),
+        n_points, sum(candidates), all_pairs, threshold_km,
+    )
@@ -0,0 +1,518 @@
+# === 🛰️ Tract Query Service ===
+# A small asyncio HTTP/1.1 server that answers tract queries from memory. Tract
+# metadata and panel geometry are loaded once at startup (from PostGIS, a catalog
+# file, or rebuilt from the zone config) into per-zone NumPy arrays aligned with
+# TractIndex's flat tract numbering, so point lookups are binary searches and
+# bbox / shell queries are vectorized masks; the database is not touched again.
+#
+#   GET  /health
+#   GET  /lookup?alt=550,560&inc=53,97.6&raan=10,200[&zone=LEO]
+#   POST /lookup   {"points": [[alt, inc, raan], ...]}  or  {"r": [[x, y, z], ...], "v": [...]}
+#   GET  /tracts/<tract_id>[?format=geojson|czml]
+#   POST /tracts   {"ids": [...], "format": "geojson" | "czml"}
+#   GET  /query?zone=LEO&bbox=minlon,minlat,maxlon,maxlat&alt_min=500&alt_max=600[&geometry=1&limit=N]
+#
+# Every response carries an ETag derived from the body; a client sending it back
+# in If-None-Match gets 304 Not Modified. Rendered responses are kept in an LRU
+# cache keyed by the request, so repeated UI queries skip both the query and the
+# JSON encoding.
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import shapely
+
+from orbital_tracts.catalog import TractCatalogFile, build_panels, read_panels
+from orbital_tracts.export import DEFAULT_FETCH_SIZE, panel_packets
+from orbital_tracts.index import TractIndex, orbital_elements
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_SIZE = 1024
+
+# Requests larger than this are refused rather than buffered.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_SEPARATORS = (",", ":")
+
+_REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# === In-memory catalog ===
+
+def _overlaps(lo, hi, range_min, range_max):
+    # [lo, hi) bins overlapping [range_min, range_max]; a zero-width bin (the GEO
+    # belt) overlaps when its value lies inside the range.
+    range_min = -np.inf if range_min is None else range_min
+    range_max = np.inf if range_max is None else range_max
+    touching = (lo == range_max) & (range_min < range_max)
+    return ((lo <= range_max) & (hi > range_min) & ~touching) | (
+        (lo == hi) & (lo >= range_min) & (lo <= range_max)
+    )
+
+
+class ZoneCatalog:
+    """
+    One zone's tracts, indexed by TractIndex flat tract number: panel geometry
+    (``None`` where no panel is stored), bounding boxes and per-tract bins.
+    """
+
+    def __init__(self, spec, geoms, content_hashes=None):
+        self.index = TractIndex(spec)
+        self.spec = self.index.zone
+        n = len(self.index)
+        n_alt, n_inc, n_raan = self.index.shape
+
+        self.geoms = np.asarray(geoms, dtype=object)
+        if len(self.geoms) != n:
+            raise ValueError(f"{spec.name}: expected {n} panels, got {len(self.geoms)}")
+        present = np.array([g is not None and not g.is_empty for g in self.geoms])
+        self.bounds = np.full((n, 4), np.nan)
+        if present.any():
+            self.bounds[present] = shapely.bounds(self.geoms[present])
+        self.present = present
+        self.content_hashes = content_hashes
+
+        # Tracts are numbered altitude-major, then inclination, then RAAN.
+        self.alt_min = np.repeat(self.index.alt_lo, n_inc * n_raan)
+        self.alt_max = np.repeat(self.index.alt_hi, n_inc * n_raan)
+        self.inc_min = np.tile(np.repeat(self.index.inc_lo, n_raan), n_alt)
+        self.inc_max = np.tile(np.repeat(self.index.inc_hi, n_raan), n_alt)
+        self.raan_min = np.tile(self.index.raan_lo, n_alt * n_inc)
+        self.raan_max = np.tile(self.index.raan_hi, n_alt * n_inc)
+
+    def __len__(self):
+        return len(self.index)
+
+    def properties(self, i):
+        return {
+            "orbit_zone": self.spec.name,
+            "alt_min": float(self.alt_min[i]), "alt_max": float(self.alt_max[i]),
+            "inc_min": float(self.inc_min[i]), "inc_max": float(self.inc_max[i]),
+            "az_min": float(self.raan_min[i]), "az_max": float(self.raan_max[i]),
+            "theta_start_idx": int(self.index.theta_start_idx[i]),
+            "theta_end_idx": int(self.index.theta_end_idx[i]),
+            "tract_key": int(self.index.keys[i]),
+        }
+
+    def query(self, bbox=None, alt_min=None, alt_max=None, inc_min=None, inc_max=None):
+        """
+        Flat tract numbers with a stored panel that intersect ``bbox``
+        (``(min_lon, min_lat, max_lon, max_lat)``) and whose bins overlap the
+        given altitude / inclination ranges. Bins are half-open like TractIndex's,
+        so a shell that only touches a range boundary is not included.
+        """
+        mask = self.present.copy()
+        if alt_min is not None or alt_max is not None:
+            mask &= _overlaps(self.alt_min, self.alt_max, alt_min, alt_max)
+        if inc_min is not None or inc_max is not None:
+            mask &= _overlaps(self.inc_min, self.inc_max, inc_min, inc_max)
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            b = self.bounds
+            mask &= (b[:, 0] <= max_lon) & (b[:, 2] >= min_lon) & (b[:, 1] <= max_lat) & (b[:, 3] >= min_lat)
+            candidates = np.flatnonzero(mask)
+            hits = shapely.intersects(self.geoms[candidates], shapely.box(*bbox))
+            return candidates[hits]
+        return np.flatnonzero(mask)
+
+
+class TractCatalog:
+    """Every loaded zone, plus a tract_id → (zone, flat number) map."""
+
+    def __init__(self, zones):
+        self.zones = {zone.spec.name: zone for zone in zones}
+        self._by_id = {}
+        digest = hashlib.sha1()
+        for name, zone in self.zones.items():
+            for i, tract_id in enumerate(zone.index.ids):
+                self._by_id[tract_id] = (zone, i)
+            digest.update(name.encode())
+            if zone.content_hashes is not None:
+                digest.update("".join(h or "" for h in zone.content_hashes).encode())
+            else:
+                digest.update(shapely.to_wkb(zone.geoms[zone.present]).tobytes())
+        # Identifies the loaded data; part of every ETag so a reload with changed
+        # panels never revalidates a stale client copy.
+        self.version = digest.hexdigest()[:16]
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def zone(self, name):
+        try:
+            return self.zones[name]
+        except KeyError:
+            raise HTTPError(404, f"Unknown zone {name!r}; loaded zones: {', '.join(self.zones)}") from None
+
+    def find(self, tract_id):
+        try:
+            return self._by_id[tract_id]
+        except KeyError:
+            raise HTTPError(404, f"Unknown tract {tract_id!r}") from None
+
+    def lookup(self, alt_km, inc_deg, raan_deg, zone=None):
+        """
+        Tract IDs for arrays of altitude (km), inclination and RAAN (deg), trying
+        each zone in load order unless ``zone`` is given. Returns
+        ``(tract_ids, segment_idx)`` lists, ``None`` where nothing matches.
+        """
+        alt = np.asarray(alt_km, dtype=float)
+        inc = np.asarray(inc_deg, dtype=float)
+        raan = np.asarray(raan_deg, dtype=float)
+        tract_ids = np.full(alt.shape, None, dtype=object)
+        segments = np.full(alt.shape, None, dtype=object)
+        unassigned = np.ones(alt.shape, dtype=bool)
+        for catalog in [self.zone(zone)] if zone else self.zones.values():
+            tract_idx, segment = catalog.index.lookup(alt[unassigned], inc[unassigned], raan[unassigned])
+            hit = tract_idx >= 0
+            rows = np.flatnonzero(unassigned)[hit]
+            tract_ids[rows] = catalog.index.ids[tract_idx[hit]]
+            segments[rows] = segment[hit].tolist()
+            unassigned[rows] = False
+        return tract_ids.tolist(), segments.tolist()
+
+    def feature(self, tract_id):
+        zone, i = self.find(tract_id)
+        geom = zone.geoms[i]
+        return {
+            "type": "Feature",
+            "id": tract_id,
+            "geometry": json.loads(shapely.to_geojson(geom)) if zone.present[i] else None,
+            "properties": zone.properties(i),
+        }
+
+    def packets(self, tract_id):
+        zone, i = self.find(tract_id)
+        if not zone.present[i]:
+            return []
+        # Styled like the zone's file export (ZoneSpec.export).
+        style = zone.spec.export
+        return list(panel_packets(tract_id, zone.geoms[i], list(style.color), list(style.outline_color)))
+
+
+def load_catalog(engine, specs, batch_size=DEFAULT_FETCH_SIZE):
+    """Read the panels of ``specs`` and their dev.tracts content hashes into a TractCatalog."""
+    zones = []
+    conn = engine.raw_connection()
+    try:
+        for spec in specs:
+            geoms, hashes = read_panels(conn, spec, batch_size)
+            zones.append(ZoneCatalog(spec, geoms, hashes))
+            log.info("📥 Loaded %d/%d %s panels", zones[-1].present.sum(), len(zones[-1]), spec.name)
+        conn.commit()
+    finally:
+        conn.close()
+    return TractCatalog(zones)
+
+
+def build_catalog(specs, geodetic="pyproj"):
+    """Build a TractCatalog by regenerating every panel from the zone config (no database)."""
+    zones = [ZoneCatalog(spec, build_panels(spec, geodetic)) for spec in specs]
+    for zone in zones:
+        log.info("🧮 Built %d %s panels", len(zone), zone.spec.name)
+    return TractCatalog(zones)
+
+
+def open_catalog(path, zones=None):
+    """Build a TractCatalog from a catalog file (see orbital_tracts.catalog)."""
+    catalog_file = TractCatalogFile(path)
+    loaded = [ZoneCatalog(*catalog_file.zone_panels(name)) for name in (zones or catalog_file.zones)]
+    for zone in loaded:
+        log.info("🗃️ Loaded %d/%d %s panels from %s", zone.present.sum(), len(zone), zone.spec.name, path)
+    return TractCatalog(loaded)
+
+
+# === Request handling ===
+
+class ResponseCache:
+    """LRU of rendered responses: request key → ``(etag, body)``."""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _floats(params, name, required=True):
+    values = params.get(name)
+    if not values:
+        if required:
+            raise HTTPError(400, f"Missing parameter {name!r}")
+        return None
+    try:
+        return [float(v) for value in values for v in value.split(",")]
+    except ValueError:
+        raise HTTPError(400, f"Parameter {name!r} must be comma-separated numbers") from None
+
+
+def _float(params, name):
+    values = _floats(params, name, required=False)
+    return None if values is None else values[0]
+
+
+def _count(params, name):
+    values = params.get(name)
+    if not values:
+        return None
+    try:
+        value = int(values[0])
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise HTTPError(400, f"Parameter {name!r} must be a non-negative integer")
+    return value
+
+
+def _json_body(body):
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Request body is not valid JSON") from None
+    if not isinstance(request, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return request
+
+
+def _vectors(request, name):
+    try:
+        vectors = np.asarray(request[name], dtype=float)
+    except (TypeError, ValueError):
+        vectors = None
+    if vectors is None or vectors.ndim != 2 or vectors.shape[1] != 3:
+        raise HTTPError(400, f"{name!r} must be an array of [x, y, z] vectors")
+    return vectors
+
+
+class TractService:
+    """Routes requests against a TractCatalog and renders cached, ETag'd JSON responses."""
+
+    def __init__(self, catalog, cache_size=DEFAULT_CACHE_SIZE):
+        self.catalog = catalog
+        self.cache = ResponseCache(cache_size)
+
+    # --- endpoints ---
+
+    def _health(self, params, body):
+        return {
+            "version": self.catalog.version,
+            "zones": {name: {"tracts": len(z), "panels": int(z.present.sum())}
+                      for name, z in self.catalog.zones.items()},
+            "cache": {"hits": self.cache.hits, "misses": self.cache.misses},
+        }
+
+    def _lookup(self, params, body):
+        if body is None:
+            alt, inc, raan = (_floats(params, name) for name in ("alt", "inc", "raan"))
+            if not len(alt) == len(inc) == len(raan):
+                raise HTTPError(400, "alt, inc and raan must have the same length")
+            zone = params.get("zone", [None])[0]
+        else:
+            request = _json_body(body)
+            zone = request.get("zone")
+            if zone is not None and not isinstance(zone, str):
+                raise HTTPError(400, "'zone' must be a zone name")
+            if "points" in request:
+                try:
+                    points = np.asarray(request["points"], dtype=float).reshape(-1, 3)
+                except (TypeError, ValueError):
+                    raise HTTPError(400, "'points' must be an array of [alt, inc, raan] triples") from None
+                alt, inc, raan = points.T
+            elif "r" in request and "v" in request:
+                r, v = _vectors(request, "r"), _vectors(request, "v")
+                if len(r) != len(v):
+                    raise HTTPError(400, "'r' and 'v' must have the same length")
+                alt, inc, raan = orbital_elements(r, v)
+            else:
+                raise HTTPError(400, "Body needs 'points' ([[alt, inc, raan], ...]) or 'r' and 'v' arrays")
+        tract_ids, segments = self.catalog.lookup(alt, inc, raan, zone)
+        return {"tracts": tract_ids, "segments": segments}
+
+    def _tracts(self, params, body, tract_id=None):
+        if tract_id is not None:
+            ids, fmt = [tract_id], params.get("format", ["geojson"])[0]
+        else:
+            request = _json_body(body)
+            ids, fmt = request.get("ids"), request.get("format", "geojson")
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                raise HTTPError(400, "Body needs an 'ids' list of strings")
+        if fmt == "geojson":
+            features = [self.catalog.feature(i) for i in ids]
+            return features[0] if tract_id is not None else {"type": "FeatureCollection", "features": features}
+        if fmt == "czml":
+            return [packet for i in ids for packet in self.catalog.packets(i)]
+        raise HTTPError(400, f"Unknown format {fmt!r}; expected 'geojson' or 'czml'")
+
+    def _query(self, params, body):
+        bbox = _floats(params, "bbox", required=False)
+        if bbox is not None and len(bbox) != 4:
+            raise HTTPError(400, "bbox must be min_lon,min_lat,max_lon,max_lat")
+        names = params.get("zone") or list(self.catalog.zones)
+        limit = _count(params, "limit")
+        with_geometry = params.get("geometry", ["0"])[0] in ("1", "true")
+
+        tract_ids = []
+        for name in names:
+            zone = self.catalog.zone(name)
+            hits = zone.query(
+                bbox, _float(params, "alt_min"), _float(params, "alt_max"),
+                _float(params, "inc_min"), _float(params, "inc_max"),
+            )
+            tract_ids.extend(zone.index.ids[hits].tolist())
+        total = len(tract_ids)
+        if limit is not None:
+            tract_ids = tract_ids[:limit]
+        if with_geometry:
+            return {"type": "FeatureCollection", "total": total,
+                    "features": [self.catalog.feature(i) for i in tract_ids]}
+        return {"total": total, "tracts": tract_ids}
+
+    def route(self, method, path, params, body):
+        """Dispatch one request → payload (JSON-serializable). Raises HTTPError."""
+        if path == "/health" and method == "GET":
+            return self._health(params, body)
+        if path == "/lookup" and method in ("GET", "POST"):
+            return self._lookup(params, body if method == "POST" else None)
+        if path == "/tracts" and method == "POST":
+            return self._tracts(params, body)
+        if path.startswith("/tracts/") and method == "GET":
+            return self._tracts(params, None, tract_id=unquote(path[len("/tracts/"):]))
+        if path == "/query" and method == "GET":
+            return self._query(params, body)
+        if path in ("/health", "/lookup", "/tracts", "/query") or path.startswith("/tracts/"):
+            raise HTTPError(405, f"{method} not allowed on {path}")
+        raise HTTPError(404, f"No endpoint {path}")
+
+    def respond(self, method, target, body=None, if_none_match=None):
+        """
+        Handle one request → ``(status, headers, body_bytes)``, serving repeated
+        requests from the response cache.
+        """
+        started = time.perf_counter()
+        url = urlsplit(target)
+        key = (method, url.path, url.query, hashlib.sha1(body).digest() if body else None)
+        entry = self.cache.get(key) if url.path != "/health" else None
+        if entry is None:
+            try:
+                payload = self.route(method, url.path, parse_qs(url.query), body)
+            except HTTPError as exc:
+                status, payload = exc.status, {"error": str(exc)}
+            except Exception:
+                # A bug must still answer the client rather than drop the connection.
+                log.exception("❌ Unhandled error for %s %s", method, target)
+                status, payload = 500, {"error": "Internal server error"}
+            else:
+                status = 200
+            data = json.dumps(payload, separators=_SEPARATORS).encode()
+            etag = f'"{self.catalog.version}-{hashlib.sha1(data).hexdigest()[:16]}"'
+            entry = (status, etag, data)
+            if status == 200 and url.path != "/health":
+                self.cache.put(key, entry)
+        status, etag, data = entry
+
+        headers = {
+            "Content-Type": "application/json",
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Server-Timing": f"app;dur={1000 * (time.perf_counter() - started):.3f}",
+        }
+        if status == 200 and if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return 304, headers, b""
+        return status, headers, data
+
+    # --- HTTP/1.1 transport ---
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it (keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._write(writer, 400, {}, b'{"error":"Malformed request line"}', False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._write(writer, 400, {}, b'{"error":"Invalid Content-Length"}', False)
+                    break
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, 413, {}, b'{"error":"Request body too large"}', False)
+                    break
+                body = await reader.readexactly(length) if length else None
+
+                status, response_headers, data = self.respond(method, target, body, headers.get("if-none-match"))
+                await self._write(writer, status, response_headers, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer, status, headers, data, keep_alive):
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        headers = {**headers, "Content-Length": str(len(data)), "Connection": "keep-alive" if keep_alive else "close"}
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(catalog, host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE):
+    """Serve ``catalog`` over HTTP until cancelled."""
+    service = TractService(catalog, cache_size)
+    server = await asyncio.start_server(service.handle, host, port)
+    log.info("🌐 Serving %d tracts on http://%s:%d (catalog %s)", len(catalog), host, port, catalog.version)
+    async with server:
+        await server.serve_forever()
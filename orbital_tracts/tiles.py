@@ -0,0 +1,121 @@
+# === 🧱 Tiled / Level-of-Detail CZML Export ===
+# Splits a zone's panels into one CZML file per altitude shell and RAAN sector, so a
+# viewer only loads the shells in view. Each tile also gets coarser level-of-detail
+# variants, rebuilt from the tract metadata with fewer arc steps. A manifest.json
+# indexes the tiles and levels.
+#
+# Layout:  <out_dir>/manifest.json
+#          <out_dir>/lod<level>/A<alt_min>/RAAN<lo>_<hi>.czml[.gz]
+# Level 0 is the coarsest; the last level is the full-resolution geometry from the
+# database.
+
+import itertools
+import json
+import os
+
+import shapely
+
+from orbital_tracts.export import DEFAULT_FETCH_SIZE, CzmlWriter, panel_packets, stream_rows
+from orbital_tracts.geometry import DEFAULT_STEPS, build_shell_panels, shell_radius_km
+
+MANIFEST_VERSION = 1
+
+
+def tile_query(geometry_table, where=None):
+    """Panels plus the metadata needed to tile and rebuild them, ordered shell → RAAN."""
+    sql = (
+        "SELECT g.tract_id, ST_AsBinary(g.geom), t.alt_min, t.alt_max, "
+        "t.inc_min, t.inc_max, t.az_min, t.az_max "
+        f"FROM {geometry_table} g JOIN dev.tracts t ON t.tract_key = g.tract_key"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    return sql + " ORDER BY t.alt_min, t.az_min, t.inc_min"
+
+
+def _tile_key(row, sector_deg):
+    alt_min, alt_max, az_min = row[2], row[3], row[6]
+    sector = int(az_min // sector_deg)
+    return alt_min, alt_max, sector
+
+
+def _fmt(value):
+    return f"{value:g}"
+
+
+def _write_tile(path, document, packets, compress):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with CzmlWriter(path, document, compress=compress) as czml:
+        for packet in packets:
+            czml.write(packet)
+    return czml.count
+
+
+def export_tiles(conn, geometry_table, out_dir, name, color, outline_color,
+                 sector_deg=45, lod_steps=(4, 8), where=None, precision=None,
+                 height_precision=None, compress=False, batch_size=DEFAULT_FETCH_SIZE, progress=None,
+                 encoder=None, steps=DEFAULT_STEPS):
+    """
+    Write the tile hierarchy for one geometry table and return the manifest dict.
+
+    ``lod_steps`` are the ``steps`` values for the coarse levels, coarsest first.
+    The full-resolution level (the stored panels, built with the zone's
+    ``steps``) is always appended last.
+    ``progress`` (a metrics.Progress) is advanced by each tile's tract count, and
+    an ``encoder`` (simplify.PositionEncoder) simplifies / encodes positions.
+    """
+    levels = [{"level": i, "steps": steps, "source": "regenerated"} for i, steps in enumerate(lod_steps)]
+    levels.append({"level": len(lod_steps), "steps": steps, "source": "database"})
+    ext = ".czml.gz" if compress else ".czml"
+
+    tiles = []
+    rows = stream_rows(conn, tile_query(geometry_table, where), batch_size=batch_size)
+    for (alt_min, alt_max, sector), group in itertools.groupby(rows, key=lambda r: _tile_key(r, sector_deg)):
+        group = list(group)
+        raan_lo, raan_hi = sector * sector_deg, (sector + 1) * sector_deg
+        tile_name = f"A{_fmt(alt_min)}/RAAN{_fmt(raan_lo)}_{_fmt(raan_hi)}{ext}"
+        tile = {
+            "alt_min": alt_min, "alt_max": alt_max,
+            "raan_min": raan_lo, "raan_max": raan_hi,
+            "count": len(group), "lods": {},
+        }
+
+        for level in levels:
+            rel_path = f"lod{level['level']}/{tile_name}"
+            document = {
+                "id": "document",
+                "name": f"{name} A{_fmt(alt_min)}-{_fmt(alt_max)} RAAN{_fmt(raan_lo)}_{_fmt(raan_hi)} LOD{level['level']}",
+                "version": "1.0",
+            }
+            if level["source"] == "database":
+                geoms = shapely.from_wkb([bytes(r[1]) for r in group])
+            else:
+                geoms = build_shell_panels(
+                    shell_radius_km(alt_min, alt_max),
+                    [r[4] for r in group], [r[5] for r in group],
+                    [r[6] for r in group], [r[7] for r in group],
+                    steps=level["steps"],
+                )
+            packets = (
+                packet
+                for r, geom in zip(group, geoms) if geom is not None
+                for packet in panel_packets(r[0], geom, color, outline_color, precision, height_precision, encoder)
+            )
+            _write_tile(os.path.join(out_dir, rel_path), document, packets, compress)
+            tile["lods"][str(level["level"])] = rel_path
+
+        tiles.append(tile)
+        if progress is not None:
+            progress.update(len(group), tiles=1)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "name": name,
+        "sector_deg": sector_deg,
+        "levels": levels,
+        "tiles": tiles,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
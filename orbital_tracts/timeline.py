@@ -0,0 +1,184 @@
+# === 🎞️ Time-dynamic Occupancy CZML ===
+# Animates tract congestion in Cesium. Per-epoch object counts (dev.tract_occupancy,
+# or the dev.tract_density buckets built from dev.tle_snapshots) are mapped onto a
+# heatmap ramp and written as time-tagged ``material.solidColor.color`` intervals,
+# in extra packets that share the ids of the static panel packets; Cesium merges
+# them into the panels already loaded.
+#
+# Counts are quantized to a few ramp levels and run-length encoded per tract, so
+# an interval is only written where a tract's colour actually changes. Interval
+# packets are emitted in time-sorted chunks of epochs: a chunk only holds tracts
+# with a change starting inside it, and a viewer streaming the file can start
+# playback before the later chunks arrive.
+
+from datetime import timedelta, timezone
+
+import numpy as np
+
+from orbital_tracts.export import DEFAULT_FETCH_SIZE, stream_rows
+
+DEFAULT_LEVELS = 8
+DEFAULT_CHUNK_EPOCHS = 24
+
+# (position, RGB) stops of the heatmap ramp: blue → cyan → green → yellow → red.
+HEAT_RAMP = (
+    (0.0, (0, 0, 255)),
+    (0.25, (0, 255, 255)),
+    (0.5, (0, 255, 0)),
+    (0.75, (255, 255, 0)),
+    (1.0, (255, 0, 0)),
+)
+
+# Where each source keeps its per-(tract, epoch) counts.
+SOURCES = {
+    "occupancy": ("dev.tract_occupancy", "epoch", "object_count"),
+    "density": ("dev.tract_density", "epoch_bucket", "distinct_sats"),
+}
+
+
+def heat_levels(counts, max_count=None, levels=DEFAULT_LEVELS):
+    """
+    Quantize object counts to ramp levels ``0..levels`` on a log scale; ``0`` is
+    kept for empty tracts and ``levels`` for ``max_count`` (default: the largest
+    count) and above.
+    """
+    counts = np.asarray(counts, dtype=float)
+    top = np.log1p(max_count if max_count is not None else counts.max(initial=0))
+    if top <= 0:
+        return np.zeros(counts.shape, dtype=np.int16)
+    scaled = np.ceil(np.log1p(np.maximum(counts, 0)) / top * levels)
+    return np.clip(scaled, 0, levels).astype(np.int16)
+
+
+def ramp_colors(levels=DEFAULT_LEVELS, alpha=(80, 220)):
+    """RGBA for ramp levels ``1..levels`` (index 0 unused), alpha rising with the level."""
+    positions = np.linspace(0, 1, levels)
+    stops = np.array([p for p, _ in HEAT_RAMP])
+    rgb = np.stack([np.interp(positions, stops, [c[k] for _, c in HEAT_RAMP]) for k in range(3)], axis=1)
+    a = np.interp(positions, [0, 1], alpha)
+    colors = np.column_stack([rgb, a]).round().astype(int).tolist()
+    return [None] + colors
+
+
+def _iso(t):
+    return t.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class OccupancyTimeline:
+    """
+    Ramp levels of a set of tracts over sorted epochs: ``levels`` is an
+    ``(n_epochs, n_tracts)`` array aligned with ``epochs`` and ``tract_ids``.
+    """
+
+    def __init__(self, epochs, tract_ids, counts, levels=DEFAULT_LEVELS, max_count=None):
+        self.epochs = list(epochs)
+        self.tract_ids = list(tract_ids)
+        self.levels = heat_levels(counts, max_count, levels)
+        self.colors = ramp_colors(levels)
+        self._column = {tract_id: i for i, tract_id in enumerate(self.tract_ids)}
+
+        # Each epoch's colour holds until the next epoch; the last one for one more step.
+        step = self.epochs[-1] - self.epochs[-2] if len(self.epochs) > 1 else timedelta(minutes=1)
+        self.ends = self.epochs[1:] + [self.epochs[-1] + step]
+
+    def __contains__(self, tract_id):
+        return tract_id in self._column
+
+    def __len__(self):
+        return len(self.tract_ids)
+
+    @property
+    def start(self):
+        return self.epochs[0]
+
+    @property
+    def stop(self):
+        return self.ends[-1]
+
+    def clock(self, multiplier=60):
+        """A CZML document ``clock`` spanning the timeline, looping at the end."""
+        return {
+            "interval": f"{_iso(self.start)}/{_iso(self.stop)}",
+            "currentTime": _iso(self.start),
+            "multiplier": multiplier,
+            "range": "LOOP_STOP",
+            "step": "SYSTEM_CLOCK_MULTIPLIER",
+        }
+
+    def _runs(self):
+        # change[e, t]: tract t's level differs from epoch e - 1 (always true at e = 0).
+        # next_change[e, t]: the first change after e, or n_epochs.
+        n = len(self.epochs)
+        change = np.ones(self.levels.shape, dtype=bool)
+        change[1:] = self.levels[1:] != self.levels[:-1]
+        marks = np.where(change, np.arange(n)[:, None], n)
+        first_at_or_after = np.minimum.accumulate(marks[::-1], axis=0)[::-1]
+        next_change = np.vstack([first_at_or_after[1:], np.full((1, marks.shape[1]), n)])
+        # Tracts that are empty throughout keep their static colour.
+        active = (self.levels > 0).any(axis=0)
+        return change & active, next_change
+
+    def packets(self, packet_ids, base_color, chunk_epochs=DEFAULT_CHUNK_EPOCHS):
+        """
+        Yield CZML colour packets in time order, ``chunk_epochs`` epochs per chunk.
+
+        ``packet_ids`` maps a tract ID to the ids of its panel packets (split
+        panels have several); tracts missing from it are skipped. Empty epochs are
+        drawn in ``base_color``.
+        """
+        change, next_change = self._runs()
+        ids = [packet_ids.get(tract_id) for tract_id in self.tract_ids]
+        for lo in range(0, len(self.epochs), chunk_epochs):
+            # (tract, epoch) of every run starting in this chunk, grouped by tract.
+            tracts, offsets = np.nonzero(change[lo:lo + chunk_epochs].T)
+            groups = np.split(lo + offsets, np.flatnonzero(np.diff(tracts)) + 1)
+            for t, epochs in zip(np.unique(tracts), groups):
+                if ids[t] is None:
+                    continue
+                intervals = [
+                    {
+                        "interval": f"{_iso(self.epochs[e])}/{_iso(self.ends[next_change[e, t] - 1])}",
+                        "rgba": self.colors[self.levels[e, t]] or base_color,
+                    }
+                    for e in epochs
+                ]
+                for packet_id in ids[t]:
+                    yield {"id": packet_id, "polygon": {"material": {"solidColor": {"color": intervals}}}}
+
+
+def load_timeline(conn, zone, source="occupancy", start=None, end=None, levels=DEFAULT_LEVELS,
+                  batch_size=DEFAULT_FETCH_SIZE):
+    """
+    Read per-epoch counts of ``zone`` from ``source`` (a ``SOURCES`` key),
+    optionally limited to ``start``..``end``, into an OccupancyTimeline. Returns
+    ``None`` when there are no rows.
+    """
+    table, time_column, count_column = SOURCES[source]
+    query = f"SELECT tract_id, {time_column}, {count_column} FROM {table} WHERE orbit_zone = %(zone)s"
+    if start is not None:
+        query += f" AND {time_column} >= %(start)s"
+    if end is not None:
+        query += f" AND {time_column} <= %(end)s"
+
+    # Small lookup query first: the epoch axis.
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT DISTINCT {time_column} FROM ({query}) q ORDER BY 1",
+            {"zone": zone, "start": start, "end": end},
+        )
+        epochs = [row[0] for row in cur.fetchall()]
+    if not epochs:
+        return None
+    epoch_idx = {t: i for i, t in enumerate(epochs)}
+
+    with conn.cursor() as cur:
+        query = cur.mogrify(query, {"zone": zone, "start": start, "end": end}).decode()
+    tract_col = {}
+    rows, cols, values = [], [], []
+    for tract_id, epoch, count in stream_rows(conn, query, batch_size=batch_size, cursor_name="tract_timeline"):
+        rows.append(epoch_idx[epoch])
+        cols.append(tract_col.setdefault(tract_id, len(tract_col)))
+        values.append(count)
+    counts = np.zeros((len(epochs), len(tract_col)), dtype=np.int32)
+    counts[rows, cols] = values
+    return OccupancyTimeline(epochs, list(tract_col), counts, levels=levels)
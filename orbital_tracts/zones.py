@@ -0,0 +1,189 @@
+# === 🗂️ Orbit Zone Bin Definitions ===
+# The altitude / inclination / RAAN bins behind every tract, read from a TOML config
+# (zones.toml next to this module by default). The generator CLI and in-memory tools
+# (e.g. TractIndex) share these definitions, so a tract ID computed anywhere matches
+# the rows in dev.tracts.
+#
+# A zone may also list finer resolution levels (``levels`` in the TOML). Each level
+# splits every bin of the level above into equal parts and becomes a ZoneSpec of
+# its own, named <zone>_L<k>; see orbital_tracts.levels.
+#
+# The optional ``export`` table of a zone styles its visual export (colours, tile
+# sector width, output names); see ExportStyle.
+
+import os
+import tomllib
+from dataclasses import dataclass, replace
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "zones.toml")
+
+
+@dataclass(frozen=True)
+class ExportStyle:
+    """
+    How ``python -m orbital_tracts export`` draws and names a zone. Colours are
+    RGBA tuples; ``valid_only`` skips invalid or empty stored panels.
+    """
+
+    title: str = ""
+    czml_output: str = ""
+    feature_output: str = ""
+    color: tuple = (0, 150, 255, 30)
+    outline_color: tuple = (255, 255, 255, 80)
+    sector_deg: float = 45
+    valid_only: bool = False
+
+
+def export_style(name, values=None, base=None):
+    """
+    ExportStyle for zone ``name`` from a TOML / JSON ``values`` mapping. Title
+    and output names default from ``name``, everything else from ``base``
+    (e.g. a coarser level's style).
+    """
+    values = dict(values or {})
+    for key in ("color", "outline_color"):
+        if key in values:
+            values[key] = tuple(values[key])
+    defaults = {
+        "title": f"{name} Tract Shells",
+        "czml_output": f"{name.lower()}_tracts",
+        "feature_output": f"{name.lower()}_tracts",
+    }
+    return replace(base or ExportStyle(), **{**defaults, **values})
+
+
+@dataclass(frozen=True)
+class ZoneSpec:
+    """Bin layout for one orbit zone. Bins are ``(min, max)`` tuples in km or degrees."""
+
+    name: str
+    alt_bins: tuple
+    inc_bins: tuple
+    raan_bins: tuple
+    n_segments: int
+    geometry_table: str
+    geometry_index: str
+    steps: int = 16
+    # Top bits of every packed tract key of the zone (orbital_tracts.keys).
+    zone_code: int = 0
+    # Resolution level: 0 for a configured zone, k for its k-th finer level.
+    # ``parent`` names the next coarser level, and ``split`` says how many of this
+    # level's (alt, inc, RAAN) bins make up one bin of it.
+    level: int = 0
+    parent: str | None = None
+    split: tuple = (1, 1, 1)
+    export: ExportStyle = ExportStyle()
+
+    @property
+    def segment_span(self):
+        """Degrees per arc segment used for theta_start_idx / theta_end_idx."""
+        return 360 / self.n_segments
+
+    @property
+    def tract_count(self):
+        return len(self.alt_bins) * len(self.inc_bins) * len(self.raan_bins)
+
+    def iter_bins(self):
+        """
+        Yield ``(tract_id, alt_min, alt_max, inc_min, inc_max, az_min, az_max,
+        theta_start_idx, theta_end_idx)`` for every tract, in generation order.
+        """
+        for alt_min, alt_max in self.alt_bins:
+            for inc_min, inc_max in self.inc_bins:
+                for az_min, az_max in self.raan_bins:
+                    yield (
+                        format_tract_id(self.name, alt_min, inc_min, az_min, az_max),
+                        alt_min, alt_max, inc_min, inc_max, az_min, az_max,
+                        int(az_min // self.segment_span), int(az_max // self.segment_span),
+                    )
+
+
+def format_tract_id(zone, alt_min, inc_min, az_min, az_max):
+    """The text tract key used throughout dev.tracts, e.g. ``LEO-A1950-I175-RAAN355_360``."""
+    return f"{zone}-A{alt_min}-I{inc_min}-RAAN{az_min}_{az_max}"
+
+
+def _parse_bins(value):
+    # { start, stop, step } range or explicit [min, max] pairs.
+    if isinstance(value, dict):
+        step = value["step"]
+        return tuple((v, v + step) for v in range(value["start"], value["stop"], step))
+    return tuple((lo, hi) for lo, hi in value)
+
+
+def _edge(value):
+    # Keep integral bin edges ints, so split bins format like configured ones (A200, not A200.0).
+    return int(value) if float(value).is_integer() else value
+
+
+def split_bins(bins, parts):
+    """Split every ``(min, max)`` bin into ``parts`` equal bins, in order."""
+    if parts == 1:
+        return tuple(bins)
+    if parts < 1 or any(lo == hi for lo, hi in bins):
+        raise ValueError(f"Cannot split {bins} into {parts} parts (zero-width bins cannot be split)")
+    return tuple(
+        (_edge(lo + (hi - lo) * k / parts), _edge(lo + (hi - lo) * (k + 1) / parts))
+        for lo, hi in bins for k in range(parts)
+    )
+
+
+def refine_zone(spec, alt=1, inc=1, raan=1, n_segments=None, steps=None, geometry_table=None,
+                geometry_index=None):
+    """
+    The next finer level of ``spec``: every altitude, inclination and RAAN bin
+    split into ``alt``, ``inc`` and ``raan`` equal parts.
+    """
+    level = spec.level + 1
+    base = spec.name[:-len(f"_L{spec.level}")] if spec.level else spec.name
+    name = f"{base}_L{level}"
+    return ZoneSpec(
+        name=name,
+        alt_bins=split_bins(spec.alt_bins, alt),
+        inc_bins=split_bins(spec.inc_bins, inc),
+        raan_bins=split_bins(spec.raan_bins, raan),
+        n_segments=n_segments or spec.n_segments,
+        geometry_table=geometry_table or f"dev.tract_geometries_{name.lower()}",
+        geometry_index=geometry_index or f"idx_geom_tracts_{name.lower()}",
+        steps=steps or spec.steps,
+        zone_code=spec.zone_code,
+        level=level,
+        parent=spec.name,
+        split=(alt, inc, raan),
+        export=export_style(name, base=spec.export),
+    )
+
+
+def load_zones(path=None):
+    """Read zone definitions from a TOML config → ``{name: ZoneSpec}`` in file order."""
+    with open(path or DEFAULT_CONFIG, "rb") as f:
+        config = tomllib.load(f)
+
+    zones = {}
+    for position, (name, zone) in enumerate(config["zones"].items(), start=1):
+        zones[name] = ZoneSpec(
+            name=name,
+            alt_bins=_parse_bins(zone["alt_bins"]),
+            inc_bins=_parse_bins(zone["inc_bins"]),
+            raan_bins=_parse_bins(zone["raan_bins"]),
+            n_segments=zone["n_segments"],
+            geometry_table=zone.get("geometry_table", f"dev.tract_geometries_{name.lower()}"),
+            geometry_index=zone.get("geometry_index", f"idx_geom_tracts_{name.lower()}"),
+            steps=zone.get("steps", 16),
+            zone_code=zone.get("zone_code", position),
+            export=export_style(name, zone.get("export")),
+        )
+        spec = zones[name]
+        for level in zone.get("levels", ()):
+            spec = refine_zone(spec, **level)
+            zones[spec.name] = spec
+
+    codes = [spec.zone_code for spec in zones.values() if spec.level == 0]
+    if len(set(codes)) != len(codes) or not all(0 < code < 256 for code in codes):
+        raise ValueError(f"Zone codes must be distinct and in 1..255, got {codes}")
+    return zones
+
+
+ZONES = load_zones()
+LEO = ZONES["LEO"]
+MEO = ZONES["MEO"]